@@ -104,11 +104,23 @@ config.read([os.path.join("/etc", "audiotools.cfg"),
 BUFFER_SIZE = 0x100000
 FRAMELIST_SIZE = 0x100000 // 4
 
+# resampler qualities, from slowest to fastest
+RESAMPLER_QUALITIES = ("best", "medium", "fastest", "linear")
+DEFAULT_RESAMPLER_QUALITY = "best"
+
+# ReplayGain analysis resamples with a cheaper quality
+# whose gains stay within 0.1 dB of those from the best quality
+REPLAY_GAIN_RESAMPLER_QUALITY = "fastest"
+
 
 class __system_binaries__(object):
     def __init__(self, config):
         self.config = config
 
+        # command -> bool of whether it's executable
+        # since the result is unlikely to change while running
+        self.__executable__ = {}
+
     def __getitem__(self, command):
         try:
             from configparser import NoSectionError, NoOptionError
@@ -123,6 +135,14 @@ class __system_binaries__(object):
             return command
 
     def can_execute(self, command):
+        try:
+            return self.__executable__[command]
+        except KeyError:
+            executable = self.__can_execute__(command)
+            self.__executable__[command] = executable
+            return executable
+
+    def __can_execute__(self, command):
         if os.sep in command:
             return os.access(command, os.X_OK)
         else:
@@ -163,7 +183,12 @@ DEFAULT_VERBOSITY = config.get_default("Defaults", "verbosity", "normal")
 if DEFAULT_VERBOSITY not in VERBOSITY_LEVELS:
     DEFAULT_VERBOSITY = "normal"
 
-DEFAULT_TYPE = config.get_default("System", "default_type", "wav")
+# the configured default type which is replaced by "wav"
+# if unavailable the first time DEFAULT_TYPE is used
+__DEFAULT_TYPE__ = config.get_default("System", "default_type", "wav")
+
+FILE_CACHE_PATH = config.get_default("Cache", "path", "")
+FILE_CACHE_SIZE = config.getint_default("Cache", "size", 1000000)
 
 
 # field name -> (field string, text description) mapping
@@ -257,26 +282,17 @@ FORMAT_FIELD_ORDER = (u"track_name",
 
 
 def __default_quality__(audio_type):
-    quality = DEFAULT_QUALITY.get(audio_type, "")
+    quality = __lazy__("DEFAULT_QUALITY").get(audio_type, "")
+    type_map = __lazy__("TYPE_MAP")
     try:
-        if quality not in TYPE_MAP[audio_type].COMPRESSION_MODES:
-            return TYPE_MAP[audio_type].DEFAULT_COMPRESSION
+        if quality not in type_map[audio_type].COMPRESSION_MODES:
+            return type_map[audio_type].DEFAULT_COMPRESSION
         else:
             return quality
     except KeyError:
         return ""
 
 
-if config.has_option("System", "maximum_jobs"):
-    MAX_JOBS = config.getint_default("System", "maximum_jobs", 1)
-else:
-    try:
-        import multiprocessing
-        MAX_JOBS = multiprocessing.cpucount()
-    except (ImportError, AttributeError):
-        MAX_JOBS = 1
-
-
 class Messenger(object):
     """this class is for displaying formatted output in a consistent way"""
 
@@ -1581,6 +1597,62 @@ class DecodingError(IOError):
         IOError.__init__(self, error_message)
 
 
+# (offset, magic bytes) -> list of (probe, header_size, id3v2) tuples
+# in the order they were registered
+__file_type_probes__ = {}
+
+# the distinct (offset, magic length) pairs of all registered probes
+__file_type_keys__ = []
+
+# the number of header bytes file_type() reads
+# which is enough for any registered probe
+# and the 10 byte ID3v2 tag header
+__file_type_header_size__ = 10
+
+
+def register_file_type(magic, probe, offset=0, header_size=None,
+                       id3v2=False):
+    """registers a probe for file_type()
+
+    magic is a bytes object which must appear at the given
+    offset of a file's header for the probe to be consulted
+
+    probe is either an AudioFile-compatible class,
+    which is returned whenever the magic bytes match,
+    or a callable taking (header, file) arguments
+    which returns an AudioFile-compatible class or None
+    where header is a bytes object of at least header_size bytes
+    and file is the seekable file stream positioned at its header
+
+    probe may also be a "module.attribute" string
+    naming either of those, in which case the module
+    isn't imported until the magic bytes first match
+
+    header_size is the minimum number of header bytes
+    the probe requires, which defaults to offset + len(magic)
+    files shorter than that never reach the probe
+
+    id3v2 indicates whether the format may be wrapped in an ID3v2 tag
+    in which case the probe is also consulted on the data after the tag
+
+    probes sharing the same magic bytes are consulted
+    in the order they are registered"""
+
+    global __file_type_header_size__
+
+    if header_size is None:
+        header_size = offset + len(magic)
+    else:
+        header_size = max(header_size, offset + len(magic))
+
+    key = (offset, len(magic))
+    if key not in __file_type_keys__:
+        __file_type_keys__.append(key)
+    __file_type_probes__.setdefault((offset, magic), []).append(
+        (probe, header_size, id3v2))
+    __file_type_header_size__ = max(__file_type_header_size__, header_size)
+
+
 def file_type(file):
     """given a seekable file stream
     returns an AudioFile-compatible class that stream is a type of
@@ -1588,137 +1660,45 @@ def file_type(file):
 
     the AudioFile class is not guaranteed to be available"""
 
+    return __file_type__(file, False)
+
+
+def __file_type__(file, id3v2):
     start = file.tell()
-    header = file.read(37)
+    header = file.read(__file_type_header_size__)
     file.seek(start, 0)
 
-    if ((header[4:8] == b"ftyp") and (header[8:12] in (b"mp41",
-                                                       b"mp42",
-                                                       b"M4A ",
-                                                       b"M4B "))):
-
-        # possibly ALAC or M4A
+    if ((len(header) >= 10) and
+        (header[0:3] == b"ID3") and
+        (header[3:4] in {b"\x02", b"\x03", b"\x04"})):
+        # file contains ID3v2 tag
+        # so consult only those probes for formats
+        # which might be wrapped in ID3v2 tags
 
-        from audiotools.bitstream import BitstreamReader
-        from audiotools.m4a import get_m4a_atom
+        from audiotools._mpeg import skip_id3v2
 
-        reader = BitstreamReader(file, False)
+        # skip the tag and any others stacked after it
+        # unless its size is invalid, in which case nothing is skipped
+        # and the header is probed as-is
+        if skip_id3v2(file) > 0:
+            return __file_type__(file, True)
 
-        # so get contents of moov->trak->mdia->minf->stbl->stsd atom
-        try:
-            stsd = get_m4a_atom(reader,
-                                b"moov", b"trak", b"mdia",
-                                b"minf", b"stbl", b"stsd")[1]
-            (stsd_version,
-             descriptions,
-             atom_size,
-             atom_type) = stsd.parse("8u 24p 32u 32u 4b")
-
-            if atom_type == b"alac":
-                # if first description is "alac" atom, it's an ALAC
-                return ALACAudio
-            elif atom_type == b"mp4a":
-                # if first description is "mp4a" atom, it's M4A
-                return M4AAudio
+    for (offset, length) in __file_type_keys__:
+        for (probe, header_size, wrappable) in __file_type_probes__.get(
+                (offset, header[offset:offset + length]), []):
+            if (len(header) < header_size) or (id3v2 and not wrappable):
+                continue
+            if isinstance(probe, str):
+                probe = __import_name__(probe)
+            if isinstance(probe, type):
+                return probe
             else:
-                # otherwise, it's unknown
-                return None
-        except KeyError:
-            # no stsd atom, so unknown
-            return None
-        except IOError:
-            # error reading atom, so unknown
-            return None
-    elif (header[0:4] == b"FORM") and (header[8:12] == b"AIFF"):
-        return AiffAudio
-    elif header[0:4] == b".snd":
-        return AuAudio
-    elif header[0:4] == b"fLaC":
-        return FlacAudio
-    elif (len(header) >= 4) and (header[0:1] == b"\xFF"):
-        # possibly MP3 or MP2
-
-        from audiotools.bitstream import parse
-
-        # header is at least 32 bits, so no IOError is possible
-        (frame_sync,
-         mpeg_id,
-         layer_description,
-         protection,
-         bitrate,
-         sample_rate,
-         pad,
-         private,
-         channels,
-         mode_extension,
-         copy,
-         original,
-         emphasis) = parse("11u 2u 2u 1u 4u 2u 1u " +
-                           "1u 2u 2u 1u 1u 2u", False, header)
-        if (((frame_sync == 0x7FF) and
-             (mpeg_id == 3) and
-             (layer_description == 1) and
-             (bitrate != 0xF) and
-             (sample_rate != 3) and
-             (emphasis != 2))):
-            # MP3s are MPEG-1, Layer-III
-            return MP3Audio
-        elif ((frame_sync == 0x7FF) and
-              (mpeg_id == 3) and
-              (layer_description == 2) and
-              (bitrate != 0xF) and
-              (sample_rate != 3) and
-              (emphasis != 2)):
-            # MP2s are MPEG-1, Layer-II
-            return MP2Audio
-        else:
-            # nothing else starts with an initial byte of 0xFF
-            # so the file is unknown
-            return None
-    elif header[0:4] == b"OggS":
-        # possibly Ogg FLAC, Ogg Vorbis or Ogg Opus
-        #if header[0x1C:0x21] == b"\x7FFLAC":
-        #    return OggFlacAudio
-        if header[0x1C:0x23] == b"\x01vorbis":
-            return VorbisAudio
-        elif header[0x1C:0x26] == b"OpusHead\x01":
-            return OpusAudio
-        else:
-            return None
-    elif header[0:5] == b"ajkg\x02":
-        return ShortenAudio
-    elif header[0:4] == b"wvpk":
-        return WavPackAudio
-    elif (header[0:4] == b"RIFF") and (header[8:12] == b"WAVE"):
-        return WaveAudio
-    elif ((len(header) >= 10) and
-          (header[0:3] == b"ID3") and
-          (header[3:4] in {b"\x02", b"\x03", b"\x04"})):
-        # file contains ID3v2 tag
-        # so it may be MP3, MP2, FLAC or TTA
-
-        from audiotools.bitstream import parse
-
-        # determine sync-safe tag size and skip entire tag
-        tag_size = 0
-        for b in parse("1p 7u" * 4, False, header[6:10]):
-            tag_size = (tag_size << 7) | b
-        file.seek(start + 10 + tag_size, 0)
-
-        t = file_type(file)
-        # only return type which might be wrapped in ID3v2 tags
-        if (((t is None) or
-             (t is MP3Audio) or
-             (t is MP2Audio) or
-             (t is FlacAudio) or
-             (t is TrueAudio))):
-            return t
-        else:
-            return None
-    elif header[0:4] == b"TTA1":
-        return TrueAudio
-    else:
-        return None
+                file.seek(start, 0)
+                t = probe(header, file)
+                if t is not None:
+                    return t
+
+    return None
 
 
 # save a reference to Python's regular open function
@@ -1801,6 +1781,12 @@ class Filename(tuple):
                                            None,
                                            None])
 
+    def __getnewargs__(self):
+        # unpickled Filenames are rebuilt from their path
+        # since __new__ takes a path rather than a tuple
+
+        return (self[0],)
+
     @classmethod
     def from_unicode(cls, unicode_string):
         """given a unicode string for a given path,
@@ -1890,9 +1876,121 @@ def sorted_tracks(audiofiles):
     return sorted(audiofiles, key=lambda f: f.__sort_key__())
 
 
+def file_cache():
+    """returns the AudioFileCache configured in audiotools.cfg's
+    [Cache] section, or None if no cache is configured
+    or it cannot be opened"""
+
+    global __file_cache__
+
+    if __file_cache__ is False:
+        if len(FILE_CACHE_PATH) > 0:
+            try:
+                from audiotools.filecache import AudioFileCache
+                import atexit
+
+                __file_cache__ = AudioFileCache(
+                    os.path.expanduser(FILE_CACHE_PATH),
+                    FILE_CACHE_SIZE)
+                # write metadata read after open_files() has returned
+                atexit.register(__file_cache__.flush)
+            except (ImportError, IOError, ValueError):
+                __file_cache__ = None
+        else:
+            __file_cache__ = None
+    return __file_cache__
+
+__file_cache__ = False
+
+
+def __probe_file__(job):
+    """given a (filename string, AudioFileCache or None, sort) tuple
+    returns an (AudioFile class, AudioFile object, sort key, error) tuple
+
+    AudioFile class is None if the file isn't a supported type
+    AudioFile object is None if the class isn't available
+    sort key is the AudioFile's sort key, if sort is True
+    error is an IOError or InvalidFile raised when opening the file
+
+    this performs all the file I/O needed by open_files
+    and may be called from any thread"""
+
+    (filename, cache, sort) = job
+    try:
+        try:
+            if cache is None:
+                raise KeyError(filename)
+            (audio_class, audiofile) = cache.get(filename)
+        except KeyError:
+            with __open__(filename, "rb") as f:
+                audio_class = file_type(f)
+
+            if (audio_class is not None) and audio_class.available(BIN):
+                audiofile = audio_class(filename)
+            else:
+                audiofile = None
+
+            if cache is not None:
+                cache.set(filename, audio_class, audiofile)
+
+        if ((audiofile is None) and
+            (audio_class is not None) and
+            audio_class.available(BIN)):
+            # binaries have become available since caching
+            audiofile = audio_class(filename)
+
+        if sort and (audiofile is not None):
+            return (audio_class, audiofile, audiofile.__sort_key__(), None)
+        else:
+            return (audio_class, audiofile, None, None)
+    except (IOError, InvalidFile) as err:
+        return (None, None, None, err)
+
+
+def __probed_files__(filenames, probes, sorted, messenger,
+                     unsupported_formats):
+    """given a list of Filename objects and their results
+    from __probe_file__, in the same order,
+    returns a list of opened AudioFile objects
+    and sends any warnings or errors to messenger, if given"""
+
+    from audiotools.text import ERR_OPEN_IOERROR
+
+    to_return = []
+
+    for (filename,
+         (audio_class, audiofile, sort_key, error)) in zip(filenames, probes):
+        if isinstance(error, IOError):
+            if messenger is not None:
+                messenger.warning(ERR_OPEN_IOERROR % (filename,))
+        elif error is not None:
+            if messenger is not None:
+                messenger.error(str(error))
+        elif audiofile is not None:
+            # is a supported audio type with needed binaries
+            to_return.append((sort_key, audiofile))
+        elif ((audio_class is not None) and
+              (messenger is not None) and
+              (audio_class.NAME not in unsupported_formats)):
+            # is a supported audio type without needed binaries
+            # or libraries
+            audio_class.missing_components(messenger)
+
+            # but only display format binaries message once
+            unsupported_formats.add(audio_class.NAME)
+
+    if sorted:
+        # equivalent to sorted_tracks()
+        # but using sort keys already fetched by __probe_file__
+        to_return.sort(key=lambda pair: pair[0])
+
+    return [audiofile for (sort_key, audiofile) in to_return]
+
+
 def open_files(filename_list, sorted=True, messenger=None,
                no_duplicates=False, warn_duplicates=False,
-               opened_files=None, unsupported_formats=None):
+               opened_files=None, unsupported_formats=None,
+               cache=None, workers=1):
     """returns a list of AudioFile objects
     from a list of filename strings or Filename objects
 
@@ -1914,17 +2012,27 @@ def open_files(filename_list, sorted=True, messenger=None,
     "unsupported_formats" is a set object containing the .NAME strings
     of AudioFile objects which have already been displayed
     as unsupported in order to avoid displaying duplicate messages
+
+    "cache" is an AudioFileCache object used to open unchanged files
+    without reading them, defaulting to the configured file_cache()
+    or False to open every file without a cache
+
+    "workers" is the number of threads used to open files concurrently
+    which may help on high-latency filesystems
     """
 
-    from audiotools.text import (ERR_DUPLICATE_FILE,
-                                 ERR_OPEN_IOERROR)
+    from audiotools.text import ERR_DUPLICATE_FILE
 
     if opened_files is None:
         opened_files = set()
     if unsupported_formats is None:
         unsupported_formats = set()
+    if cache is None:
+        cache = file_cache()
+    elif cache is False:
+        cache = None
 
-    to_return = []
+    filenames = []
 
     for filename in map(Filename, filename_list):
         if filename not in opened_files:
@@ -1934,53 +2042,100 @@ def open_files(filename_list, sorted=True, messenger=None,
                 raise DuplicateFile(filename)
             elif warn_duplicates and (messenger is not None):
                 messenger.warning(ERR_DUPLICATE_FILE % (filename,))
+        filenames.append(filename)
+
+    jobs = [(str(filename), cache, sorted) for filename in filenames]
 
+    if (workers > 1) and (len(jobs) > 1):
+        from multiprocessing.pool import ThreadPool
+
+        pool = ThreadPool(min(workers, len(jobs)))
         try:
-            with __open__(str(filename), "rb") as f:
-                audio_class = file_type(f)
+            probes = pool.map(__probe_file__, jobs)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        probes = list(map(__probe_file__, jobs))
 
-            if audio_class is not None:
-                if audio_class.available(BIN):
-                    # is a supported audio type with needed binaries
-                    to_return.append(audio_class(str(filename)))
-                elif ((messenger is not None) and
-                      (audio_class.NAME not in unsupported_formats)):
-                    # is a supported audio type without needed binaries
-                    # or libraries
-                    audio_class.missing_components(messenger)
-
-                    # but only display format binaries message once
-                    unsupported_formats.add(audio_class.NAME)
-            else:
-                # not a support audio type
-                pass
-        except IOError as err:
-            if messenger is not None:
-                messenger.warning(ERR_OPEN_IOERROR % (filename,))
-        except InvalidFile as err:
-            if messenger is not None:
-                messenger.error(str(err))
+    if cache is not None:
+        cache.flush()
 
-    return (sorted_tracks(to_return) if sorted else to_return)
+    return __probed_files__(filenames, probes, sorted, messenger,
+                            unsupported_formats)
 
 
-def open_directory(directory, sorted=True, messenger=None):
+def open_directory(directory, sorted=True, messenger=None, cache=None,
+                   workers=1):
     """yields an AudioFile via a recursive search of directory
 
     files are sorted by album number/track number by default,
     on a per-directory basis
     any unsupported files are filtered out
     error messages are sent to messenger, if given
+    cache is an optional AudioFileCache, or False, as in open_files
+
+    workers is the number of threads used to open files concurrently,
+    in which case files in upcoming directories are opened
+    while those of the current directory are yielded
     """
 
-    for (basedir, subdirs, filenames) in os.walk(directory):
-        if sorted:
-            subdirs.sort()
-        for audiofile in open_files([os.path.join(basedir, filename)
-                                     for filename in filenames],
-                                    sorted=sorted,
-                                    messenger=messenger):
-            yield audiofile
+    from collections import deque
+
+    if cache is None:
+        cache = file_cache()
+    elif cache is False:
+        cache = None
+
+    unsupported_formats = set()
+
+    if workers > 1:
+        from multiprocessing.pool import ThreadPool
+
+        pool = ThreadPool(workers)
+    else:
+        pool = None
+
+    # (filenames, probes) pairs of directories
+    # whose files are being opened by the thread pool
+    pending = deque()
+
+    def finish(filenames, probes):
+        if pool is not None:
+            probes = probes.get()
+        if cache is not None:
+            cache.flush()
+        return __probed_files__(filenames, probes, sorted, messenger,
+                                unsupported_formats)
+
+    try:
+        for (basedir, subdirs, filenames) in os.walk(directory):
+            if sorted:
+                subdirs.sort()
+            filenames = [Filename(os.path.join(basedir, filename))
+                         for filename in filenames]
+            jobs = [(str(filename), cache, sorted) for filename in filenames]
+
+            if pool is not None:
+                # keep only a few directories in flight at once
+                # so the amount of outstanding I/O stays bounded
+                pending.append((filenames,
+                                pool.map_async(__probe_file__, jobs)))
+                if len(pending) > workers:
+                    for audiofile in finish(*pending.popleft()):
+                        yield audiofile
+            else:
+                for audiofile in finish(filenames,
+                                        map(__probe_file__, jobs)):
+                    yield audiofile
+
+        while len(pending) > 0:
+            for audiofile in finish(*pending.popleft()):
+                yield audiofile
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
 
 
 def group_tracks(tracks):
@@ -2053,7 +2208,7 @@ def filename_to_type(path):
     if len(ext) > 0:
         ext = ext[1:]   # remove the "."
         SUFFIX_MAP = {}
-        for audio_type in TYPE_MAP.values():
+        for audio_type in __lazy__("TYPE_MAP").values():
             SUFFIX_MAP.setdefault(audio_type.SUFFIX, []).append(audio_type)
         if ext in SUFFIX_MAP.keys():
             if len(SUFFIX_MAP[ext]) == 1:
@@ -2453,13 +2608,24 @@ class PCMReaderError(PCMReader):
         pass
 
 
-def to_pcm_progress(audiofile, progress):
+def to_pcm_progress(audiofile, progress, threaded=False):
+    """returns audiofile's PCMReader wrapped to call progress(current, total)
+
+    if threaded is True, audiofile is decoded in a background thread
+    up to FRAMELIST_SIZE PCM frames ahead of what has been read
+    so that decoding may overlap with encoding"""
+
+    if threaded:
+        pcmreader = ThreadedPCMReader(audiofile.to_pcm(), FRAMELIST_SIZE)
+    else:
+        pcmreader = audiofile.to_pcm()
+
     if callable(progress):
-        return PCMReaderProgress(audiofile.to_pcm(),
+        return PCMReaderProgress(pcmreader,
                                  audiofile.total_frames(),
                                  progress)
     else:
-        return audiofile.to_pcm()
+        return pcmreader
 
 
 class PCMReaderProgress(PCMReader):
@@ -2540,19 +2706,26 @@ class ReorderedPCMReader(PCMReader):
 
 
 class ThreadedPCMReader(PCMReader):
-    """a PCMReader which decodes all output in the background
+    """a PCMReader which decodes its output in the background
 
-    It will queue *all* output from its contained PCMReader
+    It will queue output from its contained PCMReader
     as fast as possible in a separate thread.
-    This may be a problem if PCMReader's total output is very large
+    If buffer_frames is None, *all* output is queued,
+    which may be a problem if PCMReader's total output is very large
     or has no upper bound.
+    Otherwise, the background thread blocks once roughly
+    buffer_frames PCM frames are waiting to be read.
     """
 
-    def __init__(self, pcmreader):
+    def __init__(self, pcmreader, buffer_frames=None):
+        """pcmreader is a PCMReader compatible object
+        buffer_frames is the approximate maximum number of PCM frames
+        to decode ahead of what has been read, or None for no limit"""
+
         try:
-            from queue import Queue
+            from queue import (Queue, Full)
         except ImportError:
-            from Queue import Queue
+            from Queue import (Queue, Full)
         from threading import (Thread, Event)
 
         PCMReader.__init__(self,
@@ -2561,21 +2734,46 @@ class ThreadedPCMReader(PCMReader):
                            channel_mask=pcmreader.channel_mask,
                            bits_per_sample=pcmreader.bits_per_sample)
 
+        if buffer_frames is None:
+            block_size = 4096
+            max_blocks = 0
+        elif buffer_frames < 1:
+            raise ValueError("buffer_frames must be > 0")
+        else:
+            block_size = min(buffer_frames, 4096)
+            # at least 2 slots so that data and the end of stream
+            # don't contend for a single slot
+            max_blocks = max(buffer_frames // block_size, 2)
+
+        def put(queue, stop_event, item):
+            """places item in queue unless stop_event is set first
+            returns True if the item was queued"""
+
+            while not stop_event.is_set():
+                try:
+                    queue.put(item, True, 0.1)
+                    return True
+                except Full:
+                    pass
+            return False
+
         def transfer_data(pcmreader, queue, stop_event):
             """transfers everything from pcmreader to queue
             until stop_event is set or the data is exhausted"""
 
             try:
-                framelist = pcmreader.read(4096)
-                while ((len(framelist) > 0) and
-                       (not stop_event.is_set())):
-                    queue.put((False, framelist))
-                    framelist = pcmreader.read(4096)
+                framelist = pcmreader.read(block_size)
+                while len(framelist) > 0:
+                    if not put(queue, stop_event, (False, framelist)):
+                        return
+                    framelist = pcmreader.read(block_size)
+                # queue final empty FrameList to signal end of stream
+                put(queue, stop_event, (False, framelist))
             except (IOError, ValueError) as err:
-                queue.put((True, err))
+                put(queue, stop_event, (True, err))
 
         self.__pcmreader__ = pcmreader
-        self.__queue__ = Queue()
+        self.__queue__ = Queue(max_blocks)
         self.__stop_event__ = Event()
         self.__thread__ = Thread(target=transfer_data,
                                  args=(pcmreader,
@@ -2602,11 +2800,24 @@ class ThreadedPCMReader(PCMReader):
             return value
         else:
             # some exception raised during transfer_data
+            self.__finished__ = True
             raise value
 
     def close(self):
+        try:
+            from queue import Empty
+        except ImportError:
+            from Queue import Empty
+
         # tell decoder to finish if it is still operating
         self.__stop_event__.set()
+        # discard any queued output so a decoder
+        # blocked on a full queue is able to finish
+        try:
+            while True:
+                self.__queue__.get_nowait()
+        except Empty:
+            pass
         # collect finished thread
         self.__thread__.join()
         # close our contained PCMReader
@@ -2615,12 +2826,119 @@ class ThreadedPCMReader(PCMReader):
         self.__closed__ = True
 
 
+def __regular_file__(method, name):
+    """given a bound method and its expected name ("read" or "write"),
+    returns the binary file object it belongs to
+    if that file is a regular file on disk, or None if not
+
+    only plain file objects qualify, since other objects with
+    a regular file's descriptor, such as gzip.GzipFile,
+    may read or write data other than the file's own bytes"""
+
+    import io
+    from stat import S_ISREG
+
+    # tempfile wraps its file objects' methods
+    method = getattr(method, "__wrapped__", method)
+    if getattr(method, "__name__", None) != name:
+        return None
+    file_obj = getattr(method, "__self__", None)
+    if type(file_obj) not in (io.FileIO,
+                              io.BufferedReader,
+                              io.BufferedWriter,
+                              io.BufferedRandom,
+                              TemporaryFile):
+        return None
+    try:
+        if S_ISREG(os.fstat(file_obj.fileno()).st_mode):
+            return file_obj
+        else:
+            return None
+    except (AttributeError, ValueError, OSError, IOError):
+        return None
+
+
+def __copy_file_data__(from_function, to_function, max_bytes=None):
+    """given the read method of an input file, the write method
+    of an output file and optional maximum number of bytes,
+    copies data between the files in the kernel
+    with os.copy_file_range (which may share blocks on filesystems
+    supporting reflinks) or os.sendfile where available
+    without passing it through Python strings
+
+    both files are left positioned just past the copied data
+    and the number of bytes copied is returned,
+    which is 0 if the functions aren't file methods
+    or no kernel-assisted copy is available
+    so that the caller can fall back to copying strings"""
+
+    import errno
+
+    # errors indicating a copy method doesn't work
+    # for this pair of files, so the next should be tried instead
+    UNSUPPORTED = {errno.ENOSYS, errno.EXDEV, errno.EINVAL,
+                   errno.EBADF, errno.EOPNOTSUPP, errno.ENOTSUP}
+
+    methods = [m for m in ["copy_file_range", "sendfile"] if hasattr(os, m)]
+    if len(methods) == 0:
+        return 0
+    input_file = __regular_file__(from_function, "read")
+    output_file = __regular_file__(to_function, "write")
+    if (input_file is None) or (output_file is None):
+        return 0
+
+    # output file's buffer must be on disk before appending to it
+    output_file.flush()
+    input_fd = input_file.fileno()
+    output_fd = output_file.fileno()
+    input_offset = input_file.tell()
+    output_offset = output_file.tell()
+    remaining = max(os.fstat(input_fd).st_size - input_offset, 0)
+    if max_bytes is not None:
+        remaining = min(remaining, max_bytes)
+
+    copied = 0
+    try:
+        while (remaining > 0) and (len(methods) > 0):
+            # the kernel limits the size of single copies anyway
+            count = min(remaining, 0x40000000)
+            try:
+                if methods[0] == "copy_file_range":
+                    bytes_copied = os.copy_file_range(
+                        input_fd, output_fd, count,
+                        input_offset + copied, output_offset + copied)
+                else:
+                    os.lseek(output_fd, output_offset + copied, 0)
+                    bytes_copied = os.sendfile(
+                        output_fd, input_fd, input_offset + copied, count)
+            except OSError as err:
+                if err.errno in UNSUPPORTED:
+                    methods.pop(0)
+                    continue
+                else:
+                    raise
+            if bytes_copied == 0:
+                # input file has been truncated
+                break
+            copied += bytes_copied
+            remaining -= bytes_copied
+    finally:
+        input_file.seek(input_offset + copied, 0)
+        output_file.seek(output_offset + copied, 0)
+
+    return copied
+
+
 def transfer_data(from_function, to_function):
     """sends BUFFER_SIZE strings from from_function to to_function
 
-    this continues until an empty string is returned from from_function"""
+    this continues until an empty string is returned from from_function
+
+    if from_function and to_function are the read and write methods
+    of regular files, their data is copied by the kernel where possible"""
 
     try:
+        __copy_file_data__(from_function, to_function)
         s = from_function(BUFFER_SIZE)
         while len(s) > 0:
             to_function(s)
@@ -2920,7 +3238,8 @@ def PCMConverter(pcmreader,
                  sample_rate,
                  channels,
                  channel_mask,
-                 bits_per_sample):
+                 bits_per_sample,
+                 resampler_quality=DEFAULT_RESAMPLER_QUALITY):
     """a PCMReader wrapper for converting attributes
 
     for example, this can be used to alter sample_rate, bits_per_sample,
@@ -2928,6 +3247,9 @@ def PCMConverter(pcmreader,
     attributes.  It resamples, downsamples, etc. to achieve the proper
     output
 
+    resampler_quality is one of the RESAMPLER_QUALITIES strings
+    used if the sample rate is changed
+
     may raise ValueError if any of the attributes are unsupported
     or invalid
     """
@@ -2982,7 +3304,7 @@ def PCMConverter(pcmreader,
     if pcmreader.sample_rate != sample_rate:
         # convert sample rate through resampling
         from .pcmconverter import Resampler
-        pcmreader = Resampler(pcmreader, sample_rate)
+        pcmreader = Resampler(pcmreader, sample_rate, resampler_quality)
 
     if pcmreader.bits_per_sample != bits_per_sample:
         # use bitshifts/dithering to adjust bits-per-sample
@@ -3039,6 +3361,7 @@ class ReplayGainCalculatorReader(PCMReader):
         self.__pcmreader__ = pcmreader
         self.__title_gain__ = None
         self.__title_peak__ = None
+        self.__title_histogram__ = None
 
     def read(self, pcm_frames):
         framelist = self.__pcmreader__.read(pcm_frames)
@@ -3053,6 +3376,7 @@ class ReplayGainCalculatorReader(PCMReader):
             self.__title_gain__ = 0.0
 
         self.__title_peak__ = self.__replaygain__.title_peak()
+        self.__title_histogram__ = self.__replaygain__.title_histogram()
         self.__replaygain__.next_title()
 
     def title_gain(self):
@@ -3067,6 +3391,13 @@ class ReplayGainCalculatorReader(PCMReader):
         else:
             raise ValueError("cannot get title_peak before closing pcmreader")
 
+    def title_histogram(self):
+        if self.__title_histogram__ is not None:
+            return self.__title_histogram__
+        else:
+            raise ValueError(
+                "cannot get title_histogram before closing pcmreader")
+
 
 def resampled_frame_count(initial_frame_count,
                           initial_sample_rate,
@@ -3086,10 +3417,13 @@ def resampled_frame_count(initial_frame_count,
                                             rounding=ROUND_DOWN))
 
 
-def calculate_replay_gain(tracks, progress=None):
+def calculate_replay_gain(tracks, progress=None, workers=1):
     """yields (track, track_gain, track_peak, album_gain, album_peak)
     for each AudioFile in the list of tracks
 
+    workers is the maximum number of processes
+    to analyze tracks with at once
+
     raises ValueError if a problem occurs during calculation"""
 
     if len(tracks) == 0:
@@ -3112,6 +3446,15 @@ def calculate_replay_gain(tracks, progress=None):
     current_frames = 0
     total_frames = sum(track_frames)
 
+    if (workers > 1) and (len(tracks) > 1):
+        for result in __calculate_replay_gain_parallel__(tracks,
+                                                        target_rate,
+                                                        total_frames,
+                                                        progress,
+                                                        workers):
+            yield result
+        return
+
     rg = ReplayGainCalculator(target_rate)
 
     for (track, track_frames) in zip(tracks, track_frames):
@@ -3124,7 +3467,8 @@ def calculate_replay_gain(tracks, progress=None):
                              target_rate,
                              pcm.channels,
                              pcm.channel_mask,
-                             pcm.bits_per_sample),
+                             pcm.bits_per_sample,
+                             REPLAY_GAIN_RESAMPLER_QUALITY),
                 total_frames,
                 progress,
                 current_frames)) as pcmreader:
@@ -3137,17 +3481,114 @@ def calculate_replay_gain(tracks, progress=None):
         yield (track, track_gain, track_peak, album_gain, album_peak)
 
 
-def add_replay_gain(tracks, progress=None):
+def __calculate_replay_gain_parallel__(tracks,
+                                       target_rate,
+                                       total_frames,
+                                       progress,
+                                       workers):
+    """yields (track, track_gain, track_peak, album_gain, album_peak)
+    for each AudioFile in the list of tracks
+    by analyzing tracks in a pool of processes
+
+    since each title's analysis starts from a clean slate,
+    each worker returns its title's loudness histogram and peak
+    which are merged into album values identical to
+    those of analyzing every track in one process"""
+
+    from multiprocessing import Pool, Array
+    from audiotools.replaygain import ReplayGain as ReplayGainAnalyzer
+
+    # PCM frames processed so far by each track's worker
+    processed = Array("L", len(tracks), lock=False)
+
+    pool = Pool(processes=min(workers, len(tracks)),
+                initializer=__init_replay_gain_worker__,
+                initargs=(processed,))
+    try:
+        results = pool.map_async(__title_replay_gain__,
+                                 [(i, track, target_rate) for (i, track)
+                                  in enumerate(tracks)],
+                                 chunksize=1)
+        while not results.ready():
+            results.wait(0.25)
+            if progress is not None:
+                progress(min(sum(processed), total_frames), total_frames)
+        titles = results.get()
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+    album = ReplayGainAnalyzer(target_rate)
+    for (title_gain, title_peak, histogram) in titles:
+        album.add_title(histogram, title_peak)
+    try:
+        album_gain = album.album_gain()
+    except ValueError:
+        album_gain = 0.0
+    album_peak = album.album_peak()
+
+    for (track, (title_gain, title_peak, histogram)) in zip(tracks, titles):
+        yield (track, title_gain, title_peak, album_gain, album_peak)
+
+
+def __init_replay_gain_worker__(processed):
+    """stores the shared array of processed PCM frames
+    in a ReplayGain worker process"""
+
+    global __replay_gain_processed__
+    __replay_gain_processed__ = processed
+
+
+def __title_replay_gain__(job):
+    """given a (track index, AudioFile, target sample rate) tuple
+    returns a (title_gain, title_peak, histogram) tuple
+    where histogram is the title's mergeable loudness histogram"""
+
+    from audiotools.replaygain import ReplayGain as ReplayGainAnalyzer
+
+    (index, track, target_rate) = job
+
+    def update(current, total):
+        __replay_gain_processed__[index] = current
+
+    rg = ReplayGainAnalyzer(target_rate)
+    pcm = track.to_pcm()
+    with PCMReaderProgress(
+            PCMConverter(pcm,
+                         target_rate,
+                         pcm.channels,
+                         pcm.channel_mask,
+                         pcm.bits_per_sample,
+                         REPLAY_GAIN_RESAMPLER_QUALITY),
+            resampled_frame_count(track.total_frames(),
+                                  track.sample_rate(),
+                                  target_rate),
+            update) as pcmreader:
+        transfer_data(pcmreader.read, rg.update)
+
+    try:
+        title_gain = rg.title_gain()
+    except ValueError:
+        title_gain = 0.0
+
+    return (title_gain, rg.title_peak(), rg.title_histogram())
+
+
+def add_replay_gain(tracks, progress=None, workers=1):
     """given an iterable set of AudioFile objects
     and optional progress function
     calculates the ReplayGain for them and adds it
-    via their set_replay_gain method"""
+    via their set_replay_gain method
+
+    workers is the maximum number of processes
+    to analyze tracks with at once"""
 
     for (track,
          track_gain,
          track_peak,
          album_gain,
-         album_peak) in calculate_replay_gain(tracks, progress):
+         album_peak) in calculate_replay_gain(tracks, progress, workers):
         track.set_replay_gain(ReplayGain(track_gain=track_gain,
                                          track_peak=track_peak,
                                          album_gain=album_gain,
@@ -4032,17 +4473,19 @@ class AudioFile(object):
         raise NotImplementedError()
 
     def convert(self, target_path, target_class,
-                compression=None, progress=None):
+                compression=None, progress=None, threaded=False):
         """encodes a new AudioFile from existing AudioFile
 
         take a filename string, target class and optional compression string
         encodes a new AudioFile in the target class and returns
         the resulting object
+        if threaded is True, decoding is performed in a background thread
+        alongside encoding
         may raise EncodingError if some problem occurs during encoding"""
 
         return target_class.from_pcm(
             target_path,
-            to_pcm_progress(self, progress),
+            to_pcm_progress(self, progress, threaded),
             compression,
             total_pcm_frames=(self.total_frames() if self.lossless()
                               else None))
@@ -4267,6 +4710,16 @@ class AudioFile(object):
         else:
             return True
 
+    def md5sum(self):
+        """returns the MD5 sum of the file's decoded PCM data
+        as stored in the file itself as a 16 byte string,
+        or None if the file doesn't store one
+
+        because the stored sum isn't checked against the file's data,
+        it's only as trustworthy as the file's last successful verify()"""
+
+        return None
+
     @classmethod
     def available(cls, system_binaries):
         """returns True if all necessary compenents are available
@@ -4411,12 +4864,14 @@ class WaveContainer(AudioFile):
         raise NotImplementedError()
 
     def convert(self, target_path, target_class, compression=None,
-                progress=None):
+                progress=None, threaded=False):
         """encodes a new AudioFile from existing AudioFile
 
         take a filename string, target class and optional compression string
         encodes a new AudioFile in the target class and returns
         the resulting object
+        if threaded is True, decoding is performed in a background thread
+        alongside encoding
         may raise EncodingError if some problem occurs during encoding"""
 
         if ((self.has_foreign_wave_chunks() and
@@ -4430,14 +4885,14 @@ class WaveContainer(AudioFile):
 
             return target_class.from_wave(target_path,
                                           header,
-                                          to_pcm_progress(self, progress),
+                                          to_pcm_progress(self, progress, threaded),
                                           footer,
                                           compression)
         else:
             # perform standard PCM conversion instead
             return target_class.from_pcm(
                 target_path,
-                to_pcm_progress(self, progress),
+                to_pcm_progress(self, progress, threaded),
                 compression,
                 total_pcm_frames=(self.total_frames() if self.lossless()
                                   else None))
@@ -4483,12 +4938,14 @@ class AiffContainer(AudioFile):
         raise NotImplementedError()
 
     def convert(self, target_path, target_class, compression=None,
-                progress=None):
+                progress=None, threaded=False):
         """encodes a new AudioFile from existing AudioFile
 
         take a filename string, target class and optional compression string
         encodes a new AudioFile in the target class and returns
         the resulting object
+        if threaded is True, decoding is performed in a background thread
+        alongside encoding
         may raise EncodingError if some problem occurs during encoding"""
 
         if ((self.has_foreign_aiff_chunks() and
@@ -4503,14 +4960,14 @@ class AiffContainer(AudioFile):
 
             return target_class.from_aiff(target_path,
                                           header,
-                                          to_pcm_progress(self, progress),
+                                          to_pcm_progress(self, progress, threaded),
                                           footer,
                                           compression)
         else:
             # perform standard PCM conversion instead
             return target_class.from_pcm(
                 target_path,
-                to_pcm_progress(self, progress),
+                to_pcm_progress(self, progress, threaded),
                 compression,
                 total_pcm_frames=(self.total_frames() if self.lossless()
                                   else None))
@@ -4882,7 +5339,8 @@ def iter_last(iterator):
             return
 
 
-def PCMReaderWindow(pcmreader, initial_offset, pcm_frames, forward_close=True):
+def PCMReaderWindow(pcmreader, initial_offset, pcm_frames, forward_close=True,
+                    use_seek=False):
     """pcmreader is the parent stream
 
     initial offset is the offset of the stream's beginning,
@@ -4891,7 +5349,12 @@ def PCMReaderWindow(pcmreader, initial_offset, pcm_frames, forward_close=True):
     pcm_frames is the total length of the stream
 
     if forward_close is True, calls to .close() are forwarded
-    to the parent stream, otherwise the parent is left as-is"""
+    to the parent stream, otherwise the parent is left as-is
+
+    if use_seek is True and the parent stream has a .seek() method,
+    a positive initial offset is reached by seeking
+    rather than by decoding and discarding PCM frames
+    in which case the parent stream must be at its beginning"""
 
     if initial_offset == 0:
         return PCMReaderHead(
@@ -4902,7 +5365,8 @@ def PCMReaderWindow(pcmreader, initial_offset, pcm_frames, forward_close=True):
         return PCMReaderHead(
             pcmreader=PCMReaderDeHead(pcmreader=pcmreader,
                                       pcm_frames=initial_offset,
-                                      forward_close=forward_close),
+                                      forward_close=forward_close,
+                                      use_seek=use_seek),
             pcm_frames=pcm_frames,
             forward_close=forward_close)
 
@@ -4984,7 +5448,8 @@ class PCMReaderHead(PCMReader):
 class PCMReaderDeHead(PCMReader):
     """a wrapper around PCMReader for truncating a stream's beginning"""
 
-    def __init__(self, pcmreader, pcm_frames, forward_close=True):
+    def __init__(self, pcmreader, pcm_frames, forward_close=True,
+                 use_seek=False):
         """pcmreader is a PCMReader object
         pcm_frames is the total number of PCM frames to remove
 
@@ -4996,6 +5461,10 @@ class PCMReaderDeHead(PCMReader):
 
         if forward_close is True, calls to .close() are forwarded
         to the parent stream, otherwise the parent is left as-is
+
+        if use_seek is True and pcmreader has a .seek() method,
+        frames are removed by seeking pcmreader from its beginning
+        and discarding only what remains after the seek
         """
 
         PCMReader.__init__(self,
@@ -5007,6 +5476,9 @@ class PCMReaderDeHead(PCMReader):
         self.pcmreader = pcmreader
         self.pcm_frames = pcm_frames
         self.forward_close = forward_close
+        self.use_seek = (use_seek and
+                         hasattr(pcmreader, "seek") and
+                         callable(pcmreader.seek))
 
     def __repr__(self):
         return "PCMReaderDeHead(%s, %s)" % (repr(self.pcmreader),
@@ -5017,6 +5489,14 @@ class PCMReaderDeHead(PCMReader):
             # no truncation or padding, so return framelists as-is
             return self.pcmreader.read(pcm_frames)
         elif self.pcm_frames > 0:
+            if self.use_seek:
+                # seek as close to the offset as the stream allows
+                # so that only the remainder needs discarding
+                self.use_seek = False
+                self.pcm_frames -= self.pcmreader.seek(self.pcm_frames)
+                if self.pcm_frames == 0:
+                    return self.pcmreader.read(pcm_frames)
+
             # remove PCM frames from beginning of stream
             # until all truncation is accounted for
             while self.pcm_frames > 0:
@@ -5319,7 +5799,6 @@ class ExecProgressQueue(object):
         from collections import deque
 
         self.messenger = messenger
-        self.__displayed_rows__ = {}
         self.__queued_jobs__ = deque()
         self.__raised_exception__ = None
 
@@ -5341,14 +5820,23 @@ class ExecProgressQueue(object):
         or a function which takes the result of the queued function
         and returns a unicode string for display
         once the queued function is complete
+
+        job_cost is an optional keyword-only number proportional
+        to how long the function will take to run,
+        such as a track's total PCM frames,
+        which is used to start the most costly jobs first
+        and is not passed to the function
         """
 
+        cost = kwargs.pop("job_cost", None)
+
         self.__queued_jobs__.append((len(self.__queued_jobs__),
                                      progress_text,
                                      completion_output,
                                      function,
                                      args,
-                                     kwargs))
+                                     kwargs,
+                                     cost))
 
     def run(self, max_processes=1):
         """runs all the queued jobs"""
@@ -5371,7 +5859,8 @@ class ExecProgressQueue(object):
               completion_output,
               function,
               args,
-              kwargs)) in enumerate(self.__queued_jobs__, 1):
+              kwargs,
+              cost)) in enumerate(self.__queued_jobs__, 1):
             # add job to progress display, if any text to display
             if progress_text is not None:
                 progress_display = SingleProgressDisplay(self.messenger,
@@ -5403,56 +5892,39 @@ class ExecProgressQueue(object):
         self.__queued_jobs__.clear()
         return results
 
-    def __run_parallel__(self, max_processes=1):
-        """runs all the queued jobs in parallel"""
+    def __dispatch_order__(self):
+        """returns a list of queued jobs in the order
+        they're sent to workers when run in parallel
 
-        from select import select
+        jobs are run longest first, so that the longest jobs
+        aren't left running by themselves after all others are done
+        and jobs without a cost are run last in the order queued"""
 
-        def execute_next_job(progress_display):
-            """pulls the next job from the queue and returns a
-            (Process, Array, Connection, progress_text, completed_text) tuple
-            where Process is the subprocess
-            Array is shared memory of the current progress
-            Connection is the listening end of a pipe
-            progress_text is unicode to display during progress
-            and completed_text is unicode to display when finished"""
-
-            # pull parameters from job queue
-            (job_index,
-             progress_text,
-             completion_output,
-             function,
-             args,
-             kwargs) = self.__queued_jobs__.popleft()
-
-            # spawn new __ProgressQueueJob__ object
-            job = __ProgressQueueJob__.spawn(
-                job_index=job_index,
-                function=function,
-                args=args,
-                kwargs=kwargs,
-                progress_text=progress_text,
-                completion_output=completion_output)
+        return sorted(self.__queued_jobs__,
+                      key=lambda job: job[6] if (job[6] is not None) else 0,
+                      reverse=True)
 
-            # add job to progress display, if any text to display
-            if progress_text is not None:
-                self.__displayed_rows__[job.job_fd()] = \
-                    progress_display.add_row(progress_text)
+    def __run_parallel__(self, max_processes=1):
+        """runs all the queued jobs in parallel
 
-            return job
+        a pool of up to "max_processes" worker processes is started
+        and each idle worker is sent the next job to run
+        rather than spawning a new process per job"""
 
-        progress_display = ProgressDisplay(self.messenger)
+        from select import select
+        from collections import deque
+        from multiprocessing import Process, Array, Pipe
+
+        jobs = self.__dispatch_order__()
+        self.__queued_jobs__.clear()
 
         # variables for X/Y output display
         # Note that the order a job is inserted into the queue
         # (as captured by its job_index value)
         # may differ from the order in which it is completed.
-        total_jobs = len(self.__queued_jobs__)
+        total_jobs = len(jobs)
         completed_job_number = 1
 
-        # a dict of job file descriptors -> __ProgressQueueJob__ objects
-        job_pool = {}
-
         # return values from the executed functions
         results = [None] * total_jobs
 
@@ -5460,32 +5932,107 @@ class ExecProgressQueue(object):
             # nothing to do
             return results
 
-        # populate job pool up to "max_processes" number of jobs
-        for i in range(min(max_processes, len(self.__queued_jobs__))):
-            job = execute_next_job(progress_display)
-            job_pool[job.job_fd()] = job
+        # numbers of the jobs in "jobs" yet to be sent to a worker
+        unsent_jobs = deque(range(total_jobs))
+
+        # shared memory of [job number + 1, current, total] per worker
+        # where a job number of 0 indicates the worker is idle
+        progress = Array("L", 3 * min(max_processes, total_jobs),
+                         lock=False)
+
+        # a dict of job pipe file descriptors ->
+        # [Process, Connection, number of job being run or None]
+        worker_pool = {}
+
+        def send_job(worker):
+            """sends the next unsent job to the given worker
+            or tells it to exit if there are none"""
+
+            if len(unsent_jobs) > 0:
+                job_number = unsent_jobs.popleft()
+                (job_index,
+                 progress_text,
+                 completion_output,
+                 function,
+                 args,
+                 kwargs,
+                 cost) = jobs[job_number]
+                worker[2] = job_number
+                worker[1].send((job_number, function, args, kwargs))
+            else:
+                worker[2] = None
+                worker[1].send(None)
+
+        # job numbers whose results have been received
+        finished_jobs = set()
+
+        progress_display = ProgressDisplay(self.messenger)
 
-        # while the pool still contains running jobs
+        # a dict of job numbers -> ProgressRow objects
+        displayed_rows = {}
+
+        # while the pool still contains running workers
         try:
-            while len(job_pool) > 0:
+            for offset in range(0, len(progress), 3):
+                (parent_conn, child_conn) = Pipe(True)
+                process = Process(target=__progress_queue_worker__,
+                                  args=(child_conn,
+                                        __progress__(progress, offset)))
+                process.start()
+                child_conn.close()
+                worker = [process, parent_conn, None]
+                worker_pool[parent_conn.fileno()] = worker
+                send_job(worker)
+
+            while len(worker_pool) > 0:
                 # wait for zero or more jobs to finish (may timeout)
                 (rlist,
                  wlist,
-                 elist) = select(job_pool.keys(), [], [], 0.25)
+                 elist) = select(list(worker_pool.keys()), [], [], 0.25)
 
                 # clear out old display
                 progress_display.clear_rows()
 
-                for finished_job in [job_pool[fd] for fd in rlist]:
-                    job_fd = finished_job.job_fd()
-
-                    (exception, result) = finished_job.result()
+                for worker_fd in rlist:
+                    worker = worker_pool[worker_fd]
+                    (process, job_pipe, running_job) = worker
+                    try:
+                        (job_number, exception, result) = job_pipe.recv()
+                    except EOFError:
+                        # worker has exited, so remove it from pool
+                        job_pipe.close()
+                        process.join()
+                        del(worker_pool[worker_fd])
+
+                        if running_job is not None:
+                            # but it exited before finishing its job
+                            # so stop sending jobs to other workers
+                            # and raise an error to the caller
+                            # once working jobs are finished
+                            from audiotools.text import ERR_WORKER_EXITED
+
+                            finished_jobs.add(running_job)
+                            if self.__raised_exception__ is None:
+                                self.__raised_exception__ = RuntimeError(
+                                    ERR_WORKER_EXITED % (process.exitcode,))
+                            unsent_jobs.clear()
+                            if running_job in displayed_rows:
+                                displayed_rows.pop(running_job).finish()
+                        continue
+
+                    finished_jobs.add(job_number)
+                    (job_index,
+                     progress_text,
+                     completion_output,
+                     function,
+                     args,
+                     kwargs,
+                     cost) = jobs[job_number]
 
                     if not exception:
                         # job completed successfully
 
                         # display any output message attached to job
-                        completion_output = finished_job.completion_output
                         if callable(completion_output):
                             output = completion_output(result)
                         else:
@@ -5498,43 +6045,46 @@ class ExecProgressQueue(object):
                                                 total_jobs))
 
                         # attach result to output in the order it was received
-                        results[finished_job.job_index] = result
+                        results[job_index] = result
                     else:
                         # job raised an exception
 
-                        # remove all other jobs from queue
+                        # keep workers from starting any other jobs
                         # then raise exception to caller
                         # once working jobs are finished
                         self.__raised_exception__ = result
-                        while len(self.__queued_jobs__) > 0:
-                            self.__queued_jobs__.popleft()
-
-                    # remove job from pool
-                    del(job_pool[job_fd])
+                        unsent_jobs.clear()
 
                     # remove job from progress display, if present
-                    if job_fd in self.__displayed_rows__:
-                        self.__displayed_rows__[job_fd].finish()
-
-                    # add new jobs from the job queue, if any
-                    if len(self.__queued_jobs__) > 0:
-                        job = execute_next_job(progress_display)
-                        job_pool[job.job_fd()] = job
+                    if job_number in displayed_rows:
+                        displayed_rows.pop(job_number).finish()
 
                     # updated completed job number for X/Y display
                     completed_job_number += 1
 
+                    # give the now-idle worker something else to do
+                    send_job(worker)
+
                 # update progress rows with progress taken from shared memory
-                for job in job_pool.values():
-                    if job.job_fd() in self.__displayed_rows__:
-                        self.__displayed_rows__[job.job_fd()].update(
-                            job.current(), job.total())
+                for offset in range(0, len(progress), 3):
+                    job_number = progress[offset] - 1
+                    if (((job_number < 0) or
+                         (job_number in finished_jobs) or
+                         (jobs[job_number][1] is None))):
+                        continue
+                    elif job_number not in displayed_rows:
+                        displayed_rows[job_number] = \
+                            progress_display.add_row(jobs[job_number][1])
+                    displayed_rows[job_number].update(progress[offset + 1],
+                                                      progress[offset + 2])
 
                 # display new set of progress rows
                 progress_display.display_rows()
         except:
             # an exception occurred (perhaps KeyboardInterrupt)
-            # so kill any running child jobs
+            # so kill any running workers
+            for (process, job_pipe, running_job) in worker_pool.values():
+                process.terminate()
             # clear any progress rows
             progress_display.clear_rows()
             # and pass exception to caller
@@ -5549,118 +6099,64 @@ class ExecProgressQueue(object):
             return results
 
 
-class __ProgressQueueJob__(object):
-    """this class is a the parent process end of a running child job"""
-
-    def __init__(self, job_index, process, progress, result_pipe,
-                 progress_text, completion_output):
-        """job_index is the order this job was inserted into the queue
-
-        process is the Process object of the running child
-
-        progress is an Array object of [current, total] progress status
-
-        result_pipe is a Connection object which will be read for data
-
-        progress_text is unicode to display while the job is in progress
-
-        completion_output is either unicode or a callable function
-        to be displayed when the job finishes
-        """
-
-        self.job_index = job_index
-        self.process = process
-        self.progress = progress
-        self.result_pipe = result_pipe
-        self.progress_text = progress_text
-        self.completion_output = completion_output
-
-    def job_fd(self):
-        """returns file descriptor of parent-side result pipe"""
-
-        return self.result_pipe.fileno()
-
-    def current(self):
-        return self.progress[0]
-
-    def total(self):
-        return self.progress[1]
-
-    @classmethod
-    def spawn(cls, job_index,
-              function, args, kwargs, progress_text, completion_output):
-        """spawns a subprocess and returns the parent-side
-        __ProgressQueueJob__ object
-
-        job_index is the order this jhob was inserted into the queue
-
-        function is the function to execute
-
-        args is a tuple of positional arguments
+def __progress_queue_worker__(job_pipe, progress):
+    """runs in a worker process, executing the jobs it's sent
+    until it's sent None
 
-        kwargs is a dict of keyword arguments
+    job_pipe is a duplex Connection object which receives
+    (job number, function, args, kwargs) tuples to run
+    and sends back (job number, exception, result) tuples
+    where exception is True if result is an exception
+    or False if it's the result of the called function
 
-        progress_text is unicode to display while the job is in progress
+    progress is a __progress__ object of this worker's shared memory
+    """
 
-        completion_output is either unicode or a callable function
-        to be displayed when the job finishes
-        """
+    try:
+        job = job_pipe.recv()
+        while job is not None:
+            (job_number, function, args, kwargs) = job
 
-        def execute_job(function, args, kwargs, progress, result_pipe):
+            progress.start(job_number)
             try:
-                result_pipe.send((False, function(*args,
-                                                  progress=progress,
-                                                  **kwargs)))
+                result = (job_number,
+                          False,
+                          function(*args,
+                                   progress=progress.update,
+                                   **kwargs))
             except Exception as exception:
-                result_pipe.send((True, exception))
-
-            result_pipe.close()
-
-        from multiprocessing import Process, Array, Pipe
+                result = (job_number, True, exception)
+            job_pipe.send(result)
 
-        # construct shared memory array to store progress
-        progress = Array("L", [0, 0])
-
-        # construct one-way pipe to collect result
-        (parent_conn, child_conn) = Pipe(False)
-
-        # build child job to execute function
-        process = Process(target=execute_job,
-                          args=(function,
-                                args,
-                                kwargs,
-                                __progress__(progress).update,
-                                child_conn))
+            job = job_pipe.recv()
+    except EOFError:
+        # the queue has stopped
+        pass
+    finally:
+        progress.start(None)
+        job_pipe.close()
 
-        # start child job
-        process.start()
 
-        # return populated __ProgressQueueJob__ object
-        return cls(job_index=job_index,
-                   process=process,
-                   progress=progress,
-                   result_pipe=parent_conn,
-                   progress_text=progress_text,
-                   completion_output=completion_output)
+class __progress__(object):
+    def __init__(self, memory, offset=0):
+        """memory is an Array of [job number + 1, current, total] slots
+        and offset is the index of this worker's slot"""
 
-    def result(self):
-        """returns (exception, result) from parent-side pipe
-        where exception is True if result is an exception
-        or False if it's the result of the called child function"""
+        self.memory = memory
+        self.offset = offset
 
-        (exception, result) = self.result_pipe.recv()
-        self.result_pipe.close()
-        self.process.join()
-        return (exception, result)
+    def start(self, job_number):
+        """marks the given job number as running,
+        or the worker as idle if None"""
 
-
-class __progress__(object):
-    def __init__(self, memory):
-        self.memory = memory
+        self.memory[self.offset + 1] = 0
+        self.memory[self.offset + 2] = 0
+        self.memory[self.offset] = (job_number + 1 if
+                                    (job_number is not None) else 0)
 
     def update(self, current, total):
-        self.memory[0] = current
-        self.memory[1] = total
+        self.memory[self.offset + 1] = current
+        self.memory[self.offset + 2] = total
 
 
 class TemporaryFile(object):
@@ -5693,6 +6189,11 @@ class TemporaryFile(object):
 
         self.__temp_file__.flush()
 
+    def fileno(self):
+        """returns the temporary file's descriptor"""
+
+        return self.__temp_file__.fileno()
+
     def tell(self):
         """returns current file position"""
 
@@ -5723,54 +6224,140 @@ class TemporaryFile(object):
             raise err
 
 
-from audiotools.au import AuAudio
-from audiotools.wav import WaveAudio
-from audiotools.aiff import AiffAudio
-from audiotools.flac import FlacAudio
-from audiotools.wavpack import WavPackAudio
-from audiotools.shn import ShortenAudio
-from audiotools.mp3 import MP3Audio
-from audiotools.mp3 import MP2Audio
-from audiotools.vorbis import VorbisAudio
-from audiotools.m4a import M4AAudio
-from audiotools.m4a import ALACAudio
-from audiotools.opus import OpusAudio
-from audiotools.tta import TrueAudio
-
-from audiotools.ape import ApeTag
-from audiotools.flac import FlacMetaData
-from audiotools.id3 import ID3CommentPair
-from audiotools.id3v1 import ID3v1Comment
-from audiotools.id3 import ID3v22Comment
-from audiotools.id3 import ID3v23Comment
-from audiotools.id3 import ID3v24Comment
-from audiotools.m4a_atoms import M4A_META_Atom
-from audiotools.vorbiscomment import VorbisComment
-
-AVAILABLE_TYPES = (FlacAudio,
-                   MP3Audio,
-                   MP2Audio,
-                   WaveAudio,
-                   VorbisAudio,
-                   AiffAudio,
-                   AuAudio,
-                   M4AAudio,
-                   ALACAudio,
-                   WavPackAudio,
-                   ShortenAudio,
-                   OpusAudio,
-                   TrueAudio)
-
-TYPE_MAP = {track_type.NAME: track_type
-            for track_type in AVAILABLE_TYPES
-            if track_type.available(BIN)}
-
-DEFAULT_QUALITY = {track_type.NAME:
-                   config.get_default("Quality",
-                                      track_type.NAME,
-                                      track_type.DEFAULT_COMPRESSION)
-                   for track_type in AVAILABLE_TYPES
-                   if (len(track_type.COMPRESSION_MODES) > 1)}
-
-if DEFAULT_TYPE not in TYPE_MAP.keys():
-    DEFAULT_TYPE = "wav"
+# format and metadata classes are imported only when first used
+# so that scripts pay only for the modules they actually need
+# class name -> module name
+__LAZY_CLASSES__ = {"AuAudio": "audiotools.au",
+                    "WaveAudio": "audiotools.wav",
+                    "AiffAudio": "audiotools.aiff",
+                    "FlacAudio": "audiotools.flac",
+                    "WavPackAudio": "audiotools.wavpack",
+                    "ShortenAudio": "audiotools.shn",
+                    "MP3Audio": "audiotools.mp3",
+                    "MP2Audio": "audiotools.mp3",
+                    "VorbisAudio": "audiotools.vorbis",
+                    "M4AAudio": "audiotools.m4a",
+                    "ALACAudio": "audiotools.m4a",
+                    "OpusAudio": "audiotools.opus",
+                    "TrueAudio": "audiotools.tta",
+                    "ApeTag": "audiotools.ape",
+                    "FlacMetaData": "audiotools.flac",
+                    "ID3CommentPair": "audiotools.id3",
+                    "ID3v1Comment": "audiotools.id3v1",
+                    "ID3v22Comment": "audiotools.id3",
+                    "ID3v23Comment": "audiotools.id3",
+                    "ID3v24Comment": "audiotools.id3",
+                    "M4A_META_Atom": "audiotools.m4a_atoms",
+                    "VorbisComment": "audiotools.vorbiscomment"}
+
+# (format name, class name) tuples in AVAILABLE_TYPES order
+__LAZY_TYPES__ = [("flac", "FlacAudio"),
+                  ("mp3", "MP3Audio"),
+                  ("mp2", "MP2Audio"),
+                  ("wav", "WaveAudio"),
+                  ("ogg", "VorbisAudio"),
+                  ("aiff", "AiffAudio"),
+                  ("au", "AuAudio"),
+                  ("m4a", "M4AAudio"),
+                  ("alac", "ALACAudio"),
+                  ("wv", "WavPackAudio"),
+                  ("shn", "ShortenAudio"),
+                  ("opus", "OpusAudio"),
+                  ("tta", "TrueAudio")]
+
+# the builtin formats' file_type() probes
+# whose modules are imported only if their magic bytes match
+register_file_type(b".snd", "audiotools.au.AuAudio")
+register_file_type(b"RIFF", "audiotools.wav.__file_type__", header_size=12)
+register_file_type(b"FORM", "audiotools.aiff.__file_type__", header_size=12)
+register_file_type(b"fLaC", "audiotools.flac.FlacAudio", id3v2=True)
+register_file_type(b"wvpk", "audiotools.wavpack.WavPackAudio")
+register_file_type(b"ajkg\x02", "audiotools.shn.ShortenAudio")
+register_file_type(b"\xFF", "audiotools.mp3.__file_type__",
+                   header_size=4, id3v2=True)
+register_file_type(b"OggS", "audiotools.vorbis.__file_type__",
+                   header_size=0x23)
+register_file_type(b"ftyp", "audiotools.m4a.__file_type__",
+                   offset=4, header_size=12)
+register_file_type(b"OggS", "audiotools.opus.__file_type__",
+                   header_size=0x26)
+register_file_type(b"TTA1", "audiotools.tta.TrueAudio", id3v2=True)
+
+
+def __import_name__(name):
+    """given a "module.attribute" string,
+    imports the module and returns its attribute"""
+
+    from importlib import import_module
+
+    (module, attribute) = name.rsplit(".", 1)
+    return getattr(import_module(module), attribute)
+
+
+def __lazy__(name):
+    """returns the value of the lazily-computed module attribute
+    with the given name, computing it on first use
+
+    raises AttributeError if the attribute is unknown"""
+
+    try:
+        return globals()[name]
+    except KeyError:
+        pass
+
+    if name in __LAZY_CLASSES__:
+        value = __import_name__(__LAZY_CLASSES__[name] + "." + name)
+    elif name == "AVAILABLE_TYPES":
+        value = tuple(__lazy__(class_name)
+                      for (type_name, class_name) in __LAZY_TYPES__)
+    elif name == "TYPE_MAP":
+        value = {track_type.NAME: track_type
+                 for track_type in __lazy__("AVAILABLE_TYPES")
+                 if track_type.available(BIN)}
+    elif name == "DEFAULT_QUALITY":
+        value = {track_type.NAME:
+                 config.get_default("Quality",
+                                    track_type.NAME,
+                                    track_type.DEFAULT_COMPRESSION)
+                 for track_type in __lazy__("AVAILABLE_TYPES")
+                 if (len(track_type.COMPRESSION_MODES) > 1)}
+    elif name == "MAX_JOBS":
+        if config.has_option("System", "maximum_jobs"):
+            value = config.getint_default("System", "maximum_jobs", 1)
+        else:
+            try:
+                import multiprocessing
+                value = multiprocessing.cpucount()
+            except (ImportError, AttributeError):
+                value = 1
+    elif name == "DEFAULT_TYPE":
+        # check only the configured type's availability
+        # rather than building the whole TYPE_MAP
+        value = "wav"
+        for (type_name, class_name) in __LAZY_TYPES__:
+            if type_name == __DEFAULT_TYPE__:
+                if __lazy__(class_name).available(BIN):
+                    value = type_name
+                break
+    else:
+        raise AttributeError(
+            "module 'audiotools' has no attribute '%s'" % (name,))
+
+    globals()[name] = value
+    return value
+
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        return __lazy__(name)
+else:
+    # older Pythons don't support module-level __getattr__
+    # so everything must be loaded up front
+    for __lazy_name__ in (list(__LAZY_CLASSES__.keys()) +
+                           ["AVAILABLE_TYPES",
+                            "TYPE_MAP",
+                            "MAX_JOBS",
+                            "DEFAULT_QUALITY",
+                            "DEFAULT_TYPE"]):
+        __lazy__(__lazy_name__)
+    del(__lazy_name__)
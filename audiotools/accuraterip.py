@@ -21,23 +21,33 @@ from audiotools._accuraterip import Checksum
 
 
 class __Checksum__(object):
-    """Python implementation of checksum calculator"""
+    """Python implementation of checksum calculator
+
+    like the C implementation, V1 checksums for every offset
+    in the range are calculated incrementally from a sliding window
+    so the whole calculation is O(frames + range)
+    rather than O(frames * range)"""
 
     def __init__(self, total_pcm_frames,
                  sample_rate=44100,
                  is_first=False,
                  is_last=False,
-                 pcm_frame_range=1):
+                 pcm_frame_range=1,
+                 accurateripv2_offset=0):
+        from collections import deque
+
         if total_pcm_frames <= 0:
             raise ValueError("total PCM frames must be > 0")
         if sample_rate <= 0:
             raise ValueError("sample rate must be > 0")
         if pcm_frame_range <= 0:
             raise ValueError("PCM frame range must be > 0")
+        if accurateripv2_offset < 0:
+            raise ValueError("accurateripv2_offset must be >= 0")
 
         self.__total_pcm_frames__ = total_pcm_frames
         self.__pcm_frame_range__ = pcm_frame_range
-        self.__values__ = []
+        self.__processed_frames__ = 0
 
         if is_first:
             self.__start_offset__ = ((sample_rate // 75) * 5)
@@ -45,20 +55,26 @@ class __Checksum__(object):
             self.__start_offset__ = 1
 
         if is_last:
-            self.__end_offset__ = (total_pcm_frames -
-                                   ((sample_rate // 75) * 5))
+            self.__end_offset__ = max(total_pcm_frames -
+                                      ((sample_rate // 75) * 5), 0)
         else:
             self.__end_offset__ = total_pcm_frames
 
-    def update(self, framelist):
-        from itertools import izip
-        from audiotools.pcm import FrameList
+        # V1 checksums, one per offset in the range
+        self.__checksums_v1__ = [0] * pcm_frame_range
+        # the sum of values in the checksum window
+        self.__values_sum__ = 0
+        # the leading and trailing values entering and leaving the window
+        self.__initial_values__ = deque()
+        self.__final_values__ = deque()
 
-        def value(l, r):
-            return (unsigned(r) << 16) | unsigned(l)
+        self.__v2_offset__ = accurateripv2_offset
+        self.__v2_skip__ = accurateripv2_offset
+        self.__v2_index__ = 1
+        self.__v2_checksum__ = 0
 
-        def unsigned(v):
-            return (v if (v >= 0) else ((1 << 16) - (-v)))
+    def update(self, framelist):
+        from audiotools.pcm import FrameList
 
         if not isinstance(framelist, FrameList):
             raise TypeError("framelist must be instance of Framelist")
@@ -67,45 +83,109 @@ class __Checksum__(object):
         elif framelist.bits_per_sample != 16:
             raise ValueError("FrameList must have 16 bits-per-sample")
 
-        if ((len(self.__values__) +
+        if ((self.__processed_frames__ +
              framelist.frames) > (self.__total_pcm_frames__ +
                                   self.__pcm_frame_range__ - 1)):
             raise ValueError("too many samples for checksum")
 
-        self.__values__.extend(
-            [value(l, r) for (l, r) in izip(framelist.channel(0),
-                                            framelist.channel(1))])
+        # convert the whole FrameList to values at once
+        values = __values__(framelist)
+
+        first = self.__processed_frames__ + 1
+        last = first + framelist.frames
+        start = self.__start_offset__
+        end = self.__end_offset__
+        total = self.__total_pcm_frames__
+        queue_size = self.__pcm_frame_range__ - 1
+
+        # calculate initial checksum
+        lo = max(first, start)
+        hi = min(last, end + 1)
+        if lo < hi:
+            window = values[lo - first:hi - first]
+            self.__checksums_v1__[0] = (
+                self.__checksums_v1__[0] +
+                sum([v * i for (i, v) in enumerate(window, lo)])
+            ) & 0xFFFFFFFF
+            self.__values_sum__ += sum(window)
+
+        # store the first (pcm_frame_range - 1) values in initial_values
+        lo = max(first, start)
+        free = queue_size - len(self.__initial_values__)
+        if (lo < last) and (free > 0):
+            self.__initial_values__.extend(
+                values[lo - first:min(last, lo + free) - first])
+
+        # store the trailing (pcm_frame_range - 1) values in final_values
+        lo = max(first, end + 1)
+        free = queue_size - len(self.__final_values__)
+        if (lo < last) and (free > 0):
+            self.__final_values__.extend(
+                values[lo - first:min(last, lo + free) - first])
+
+        # calculate incremental checksums
+        checksums = self.__checksums_v1__
+        for index in range(max(first, total + 1), last):
+            initial_value = self.__initial_values__.popleft()
+            final_value = self.__final_values__.popleft()
+            checksums[index - total] = (
+                checksums[index - total - 1] +
+                (end * final_value) -
+                self.__values_sum__ -
+                ((start - 1) * initial_value)) & 0xFFFFFFFF
+            self.__values_sum__ += (final_value - initial_value)
+
+        # calculate V2 checksum at its single offset
+        skip = min(self.__v2_skip__, len(values))
+        self.__v2_skip__ -= skip
+        first = self.__v2_index__
+        last = first + len(values) - skip
+        lo = max(first, start)
+        hi = min(last, end + 1)
+        if lo < hi:
+            self.__v2_checksum__ = (
+                self.__v2_checksum__ +
+                sum([(v * i) >> 32 for (i, v) in
+                     enumerate(values[lo - first + skip:hi - first + skip],
+                               lo)])) & 0xFFFFFFFF
+        self.__v2_index__ = last
+
+        self.__processed_frames__ += framelist.frames
 
     def checksums_v1(self):
-        if (len(self.__values__) < (self.__total_pcm_frames__ +
-                                    self.__pcm_frame_range__ - 1)):
+        if (self.__processed_frames__ < (self.__total_pcm_frames__ +
+                                         self.__pcm_frame_range__ - 1)):
             raise ValueError("insufficient samples for checksum")
 
-        return [sum([(v * i) if
-                     ((i >= self.__start_offset__) and
-                      (i <= self.__end_offset__)) else 0
-                     for (i, v) in
-                     enumerate(self.__values__[r:
-                                               r + self.__total_pcm_frames__],
-                               1)]) & 0xFFFFFFFF
-                for r in range(self.__pcm_frame_range__)]
-
-    def checksums_v2(self):
-        if (len(self.__values__) < (self.__total_pcm_frames__ +
-                                    self.__pcm_frame_range__ - 1)):
+        return self.__checksums_v1__[:]
+
+    def checksum_v2(self):
+        if (self.__processed_frames__ < (self.__total_pcm_frames__ +
+                                         self.__pcm_frame_range__ - 1)):
             raise ValueError("insufficient samples for checksum")
 
-        def combine(x):
-            return (x >> 32) + (x & 0xFFFFFFFF)
-
-        return [sum([combine(v * i) if
-                     ((i >= self.__start_offset__) and
-                      (i <= self.__end_offset__)) else 0
-                     for (i, v) in
-                     enumerate(self.__values__[r:
-                                               r + self.__total_pcm_frames__],
-                               1)]) & 0xFFFFFFFF
-                for r in range(self.__pcm_frame_range__)]
+        return (self.__v2_checksum__ +
+                self.__checksums_v1__[self.__v2_offset__]) & 0xFFFFFFFF
+
+
+def __values__(framelist):
+    """given a 2 channel, 16 bits-per-sample FrameList
+    returns a list of AccurateRip values, one per PCM frame"""
+
+    from array import array
+    from sys import byteorder
+
+    # each little-endian stereo PCM frame is also
+    # a little-endian 32-bit value of the right channel
+    # in the high bits and the left channel in the low bits
+    values = array("I" if (array("I").itemsize == 4) else "L")
+    if PY3:
+        values.frombytes(framelist.to_bytes(False, True))
+    else:
+        values.fromstring(framelist.to_bytes(False, True))
+    if byteorder == "big":
+        values.byteswap()
+    return values.tolist()
 
 
 def match_offset(ar_matches, checksums, initial_offset):
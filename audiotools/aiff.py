@@ -309,8 +309,11 @@ class AIFF_File_Chunk(AIFF_Chunk):
 
         f.write(self.id)
         f.write(struct.pack(">I", self.__size__))
+        from audiotools import __copy_file_data__
+
         self.__aiff_file__.seek(self.__offset__)
-        to_write = self.__size__
+        to_write = self.__size__ - __copy_file_data__(
+            self.__aiff_file__.read, f.write, self.__size__)
         while to_write > 0:
             s = self.__aiff_file__.read(min(0x100000, to_write))
             f.write(s)
@@ -1126,3 +1129,7 @@ class AiffAudio(AiffContainer):
                 fixed_aiff.update_metadata(fixed_metadata)
 
         return fixes_performed + metadata_fixes
+
+
+def __file_type__(header, file):
+    return AiffAudio if (header[8:12] == b"AIFF") else None
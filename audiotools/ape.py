@@ -44,7 +44,16 @@ def __number_pair__(current, total):
 
 def limited_transfer_data(from_function, to_function, max_bytes):
     """transfers up to max_bytes from from_function to to_function
-    or as many bytes as from_function generates as strings"""
+    or as many bytes as from_function generates as strings
+
+    if from_function and to_function are the read and write methods
+    of regular files, their data is copied by the kernel where possible"""
+
+    from audiotools import __copy_file_data__
+
+    max_bytes -= __copy_file_data__(from_function, to_function, max_bytes)
+    if max_bytes <= 0:
+        return
 
     BUFFER_SIZE = 0x100000
     s = from_function(BUFFER_SIZE)
@@ -0,0 +1,559 @@
+# Audio Tools, a module and set of tools for manipulating audio data
+# Copyright (C) 2007-2015  Brian Langenberger
+
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+
+import os
+import os.path
+import sys
+import weakref
+from itertools import count
+from audiotools import PY3
+
+# entries are pickled with a protocol
+# every supported version of Python can read
+PICKLE_PROTOCOL = 2
+
+# the layout of the cache's tables and entries,
+# incremented whenever either changes
+CACHE_FORMAT = 2
+
+# open caches by ID, so that opened AudioFile objects
+# can add their metadata to the cache they came from
+# without holding (and having to pickle) a reference to it
+__caches__ = weakref.WeakValueDictionary()
+__cache_ids__ = count()
+
+
+def stat_key(stat):
+    """given an os.stat_result,
+    returns a (device, inode, size, mtime) tuple of integers
+    where mtime is in nanoseconds
+
+    a file whose key is unchanged is presumed to be unchanged"""
+
+    if hasattr(stat, "st_mtime_ns"):
+        mtime = stat.st_mtime_ns
+    else:
+        mtime = int(stat.st_mtime * 1000000000)
+    return (stat.st_dev, stat.st_ino, stat.st_size, mtime)
+
+
+def source_fingerprint():
+    """returns a string identifying the audiotools modules
+    by their names, sizes and modification times
+
+    pickled AudioFile objects depend on their classes' layouts
+    which may change without VERSION changing,
+    such as when running from a development tree"""
+
+    import audiotools
+    from hashlib import md5
+
+    directory = os.path.dirname(os.path.abspath(audiotools.__file__))
+    fingerprint = md5()
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".py"):
+            try:
+                (device,
+                 inode,
+                 size,
+                 mtime) = stat_key(os.stat(os.path.join(directory, name)))
+            except OSError:
+                continue
+            fingerprint.update(
+                (u"%s %d %d\n" % (name, size, mtime)).encode("utf-8"))
+    return fingerprint.hexdigest()
+
+
+def __cached_metadata__(audiofile, key, metadata):
+    """returns the cached MetaData of audiofile
+    if the file hasn't changed since it was cached,
+    otherwise reads and returns its MetaData from disk"""
+
+    from pickle import loads
+
+    try:
+        unchanged = (stat_key(os.stat(audiofile.filename)) == key)
+    except OSError:
+        unchanged = False
+
+    if unchanged:
+        # a fresh copy each time
+        # so callers are free to modify the result
+        return loads(metadata)
+    else:
+        # file has been retagged or replaced,
+        # so stop using the cached copy altogether
+        try:
+            del(audiofile.get_metadata)
+        except AttributeError:
+            pass
+        return audiofile.get_metadata()
+
+
+def __recorded_metadata__(audiofile, cache_id, path, key, entry):
+    """reads and returns the MetaData of audiofile
+    and adds it to the file's entry in the cache with the given ID,
+    if that cache is still open"""
+
+    try:
+        del(audiofile.get_metadata)
+    except AttributeError:
+        pass
+    metadata = audiofile.get_metadata()
+
+    cache = __caches__.get(cache_id)
+    if cache is not None:
+        cache.__set_metadata__(path, key, entry, metadata)
+
+    return metadata
+
+
+class AudioFileCache(object):
+    """a persistent on-disk cache of opened AudioFile objects
+
+    each entry stores a file's detected AudioFile class,
+    its AudioFile object (and thus its stream parameters)
+    and its parsed MetaData, once something has read it,
+    keyed by the file's absolute path
+    and validated by its device, inode, size and modification time
+    so that reopening an unchanged file reads none of it
+
+    the cache also records when files were last verified
+    by decoding them successfully
+    and when they last matched the AccurateRip database"""
+
+    def __init__(self, path, max_entries=1000000):
+        """path is the cache database file's path
+        which is created if necessary
+
+        max_entries is the maximum number of files to cache
+        after which the least recently used entries are removed
+
+        may raise IOError if the cache cannot be opened"""
+
+        import sqlite3
+        from threading import Lock
+        from audiotools import VERSION
+
+        if max_entries < 1:
+            raise ValueError("max_entries must be > 0")
+
+        self.__max_entries__ = max_entries
+        self.__pending__ = {}
+        self.__used__ = {}
+        self.__verified__ = {}
+        self.__accuraterip__ = {}
+
+        # open_files may consult the cache from several threads at once
+        # so the connection and pending entries are guarded by a lock
+        self.__lock__ = Lock()
+
+        try:
+            # the long timeout allows concurrent processes
+            # to wait out each other's writes
+            self.__db__ = sqlite3.connect(path,
+                                          timeout=60,
+                                          check_same_thread=False)
+            try:
+                self.__db__.execute("PRAGMA journal_mode=WAL")
+            except sqlite3.DatabaseError:
+                # not all filesystems support write-ahead logging
+                pass
+            self.__db__.execute(
+                "CREATE TABLE IF NOT EXISTS properties " +
+                "(key TEXT PRIMARY KEY, value TEXT)")
+
+            # entries from another cache format, version of Audio Tools
+            # or version of Python may not unpickle correctly,
+            # so discard them
+            version = u"%d %s %s %d" % (CACHE_FORMAT,
+                                        VERSION,
+                                        source_fingerprint(),
+                                        sys.version_info[0])
+            row = self.__db__.execute(
+                "SELECT value FROM properties WHERE key = 'version'"
+            ).fetchone()
+            if (row is None) or (row[0] != version):
+                self.__db__.execute("DROP TABLE IF EXISTS files")
+                self.__db__.execute(
+                    "INSERT OR REPLACE INTO properties VALUES " +
+                    "('version', ?)", (version,))
+
+            self.__db__.execute(
+                "CREATE TABLE IF NOT EXISTS files " +
+                "(path TEXT PRIMARY KEY, " +
+                "device INTEGER, inode INTEGER, " +
+                "size INTEGER, mtime INTEGER, " +
+                "last_used REAL, entry BLOB, metadata BLOB)")
+            self.__db__.execute(
+                "CREATE INDEX IF NOT EXISTS files_last_used " +
+                "ON files (last_used)")
+            self.__db__.execute(
+                "CREATE TABLE IF NOT EXISTS verified " +
+                "(path TEXT PRIMARY KEY, " +
+                "device INTEGER, inode INTEGER, " +
+                "size INTEGER, mtime INTEGER, " +
+                "verified REAL)")
+            self.__db__.execute(
+                "CREATE TABLE IF NOT EXISTS accuraterip " +
+                "(path TEXT PRIMARY KEY, " +
+                "device INTEGER, inode INTEGER, " +
+                "size INTEGER, mtime INTEGER, " +
+                "verified REAL, results BLOB)")
+            self.__db__.commit()
+        except sqlite3.Error as err:
+            raise IOError(str(err))
+
+        self.__id__ = next(__cache_ids__)
+        __caches__[self.__id__] = self
+
+    def __key__(self, filename):
+        if PY3:
+            return os.path.abspath(filename)
+        else:
+            from audiotools import FS_ENCODING
+            return os.path.abspath(filename).decode(FS_ENCODING, "replace")
+
+    def get(self, filename):
+        """given a filename string, returns a cached
+        (AudioFile class, AudioFile object) tuple
+
+        the class is None if the file isn't a supported type
+        and the object is None if the class isn't available
+
+        raises KeyError if the file isn't cached
+        or has changed since it was cached"""
+
+        import sqlite3
+        from time import time
+        from pickle import loads
+        from functools import partial
+
+        path = self.__key__(filename)
+        try:
+            key = stat_key(os.stat(filename))
+        except OSError:
+            raise KeyError(filename)
+
+        with self.__lock__:
+            if path in self.__pending__:
+                (pending_key, entry, metadata) = self.__pending__[path]
+                if pending_key != key:
+                    raise KeyError(filename)
+            else:
+                try:
+                    row = self.__db__.execute(
+                        "SELECT device, inode, size, mtime, entry, " +
+                        "metadata FROM files WHERE path = ?",
+                        (path,)).fetchone()
+                except sqlite3.Error:
+                    raise KeyError(filename)
+                if (row is None) or (tuple(row[0:4]) != key):
+                    raise KeyError(filename)
+                entry = bytes(row[4])
+                metadata = bytes(row[5]) if (row[5] is not None) else None
+
+        try:
+            (audio_class, audiofile) = loads(entry)
+        except Exception:
+            # a class may have been moved or removed
+            raise KeyError(filename)
+
+        with self.__lock__:
+            self.__used__[path] = time()
+
+        if audiofile is not None:
+            audiofile.filename = filename
+            if metadata is not None:
+                audiofile.get_metadata = partial(__cached_metadata__,
+                                                 audiofile,
+                                                 key,
+                                                 metadata)
+            else:
+                self.__record_metadata__(audiofile, path, key, entry)
+        return (audio_class, audiofile)
+
+    def set(self, filename, audio_class, audiofile):
+        """caches the given AudioFile class and AudioFile object
+        for the given filename string
+
+        audio_class may be None if the file isn't a supported type
+        audiofile may be None if the class isn't available
+
+        the object's MetaData is cached also
+        the first time its get_metadata() method is called,
+        but nothing is written to disk until flush() is called"""
+
+        from time import time
+        from pickle import dumps, PicklingError
+
+        try:
+            key = stat_key(os.stat(filename))
+        except OSError:
+            return
+
+        try:
+            entry = dumps((audio_class, audiofile), PICKLE_PROTOCOL)
+        except (PicklingError, TypeError, AttributeError):
+            # leave files which can't be pickled uncached
+            return
+
+        path = self.__key__(filename)
+        with self.__lock__:
+            self.__pending__[path] = (key, entry, None)
+            self.__used__[path] = time()
+
+        if audiofile is not None:
+            self.__record_metadata__(audiofile, path, key, entry)
+
+    def __record_metadata__(self, audiofile, path, key, entry):
+        """has the first call to audiofile's get_metadata()
+        add the result to its cache entry"""
+
+        from functools import partial
+
+        audiofile.get_metadata = partial(__recorded_metadata__,
+                                         audiofile,
+                                         self.__id__,
+                                         path,
+                                         key,
+                                         entry)
+
+    def __set_metadata__(self, path, key, entry, metadata):
+        """adds MetaData to the given file's cache entry
+        which is written to disk by the next call to flush()"""
+
+        from time import time
+        from pickle import dumps, PicklingError
+
+        try:
+            metadata = dumps(metadata, PICKLE_PROTOCOL)
+        except (PicklingError, TypeError, AttributeError):
+            return
+
+        with self.__lock__:
+            self.__pending__[path] = (key, entry, metadata)
+            self.__used__[path] = time()
+
+    def set_verified(self, filename):
+        """records that the given filename string
+        has just been verified by decoding it successfully
+
+        nothing is written to disk until flush() is called"""
+
+        from time import time
+
+        try:
+            key = stat_key(os.stat(filename))
+        except OSError:
+            return
+
+        with self.__lock__:
+            self.__verified__[self.__key__(filename)] = (key, time())
+
+    def verified(self, filename):
+        """given a filename string, returns the time it was last
+        verified as a float number of seconds since the epoch
+
+        returns None if the file has never been verified
+        or has changed since it was"""
+
+        import sqlite3
+
+        path = self.__key__(filename)
+        try:
+            key = stat_key(os.stat(filename))
+        except OSError:
+            return None
+
+        with self.__lock__:
+            if path in self.__verified__:
+                (verified_key, verified) = self.__verified__[path]
+            else:
+                try:
+                    row = self.__db__.execute(
+                        "SELECT device, inode, size, mtime, verified " +
+                        "FROM verified WHERE path = ?", (path,)).fetchone()
+                except sqlite3.Error:
+                    return None
+                if row is None:
+                    return None
+                (verified_key, verified) = (tuple(row[0:4]), row[4])
+
+        if verified_key == key:
+            return verified
+        else:
+            return None
+
+    def set_accuraterip(self, filename, results):
+        """records that the given filename string
+        has just matched the AccurateRip database
+        where results is a list of picklable per-track results
+
+        nothing is written to disk until flush() is called"""
+
+        from time import time
+        from pickle import dumps
+
+        try:
+            key = stat_key(os.stat(filename))
+        except OSError:
+            return
+
+        entry = dumps(results, PICKLE_PROTOCOL)
+
+        with self.__lock__:
+            self.__accuraterip__[self.__key__(filename)] = (key,
+                                                            time(),
+                                                            entry)
+
+    def accuraterip(self, filename):
+        """given a filename string, returns a (time, results) tuple
+        of when it last matched the AccurateRip database,
+        as a float number of seconds since the epoch,
+        and the list of results recorded then
+
+        returns None if the file has never matched
+        or has changed since it did"""
+
+        import sqlite3
+        from pickle import loads
+
+        path = self.__key__(filename)
+        try:
+            key = stat_key(os.stat(filename))
+        except OSError:
+            return None
+
+        with self.__lock__:
+            if path in self.__accuraterip__:
+                (matched_key, matched, entry) = self.__accuraterip__[path]
+            else:
+                try:
+                    row = self.__db__.execute(
+                        "SELECT device, inode, size, mtime, verified, " +
+                        "results FROM accuraterip WHERE path = ?",
+                        (path,)).fetchone()
+                except sqlite3.Error:
+                    return None
+                if row is None:
+                    return None
+                (matched_key, matched, entry) = (tuple(row[0:4]),
+                                                 row[4],
+                                                 bytes(row[5]))
+
+        if matched_key != key:
+            return None
+
+        try:
+            return (matched, loads(entry))
+        except Exception:
+            return None
+
+    def flush(self):
+        """writes new entries, usage times and verification times to disk
+        and removes the least recently used entries
+        if the cache holds more than its maximum"""
+
+        import sqlite3
+
+        with self.__lock__:
+            (pending, used, verified, accuraterip) = (self.__pending__,
+                                                      self.__used__,
+                                                      self.__verified__,
+                                                      self.__accuraterip__)
+            self.__pending__ = {}
+            self.__used__ = {}
+            self.__verified__ = {}
+            self.__accuraterip__ = {}
+
+            if ((len(pending) == 0) and
+                (len(used) == 0) and
+                (len(verified) == 0) and
+                (len(accuraterip) == 0)):
+                return
+
+            try:
+                # a single short transaction per flush
+                # keeps other writers from waiting long
+                with self.__db__:
+                    self.__db__.executemany(
+                        "INSERT OR REPLACE INTO files VALUES " +
+                        "(?, ?, ?, ?, ?, ?, ?, ?)",
+                        [(path,) + key + (used.get(path, 0),
+                                          sqlite3.Binary(entry),
+                                          (sqlite3.Binary(metadata)
+                                           if (metadata is not None)
+                                           else None))
+                         for (path, (key, entry, metadata)) in
+                         pending.items()])
+                    self.__db__.executemany(
+                        "UPDATE files SET last_used = ? WHERE path = ?",
+                        [(last_used, path)
+                         for (path, last_used) in used.items()
+                         if path not in pending])
+                    self.__db__.executemany(
+                        "INSERT OR REPLACE INTO verified VALUES " +
+                        "(?, ?, ?, ?, ?, ?)",
+                        [(path,) + key + (when,)
+                         for (path, (key, when)) in verified.items()])
+                    self.__db__.executemany(
+                        "INSERT OR REPLACE INTO accuraterip VALUES " +
+                        "(?, ?, ?, ?, ?, ?, ?)",
+                        [(path,) + key + (when, sqlite3.Binary(entry))
+                         for (path, (key, when, entry)) in
+                         accuraterip.items()])
+
+                    (total,) = self.__db__.execute(
+                        "SELECT COUNT(*) FROM files").fetchone()
+                    if total > self.__max_entries__:
+                        self.__db__.execute(
+                            "DELETE FROM files WHERE path IN " +
+                            "(SELECT path FROM files " +
+                            "ORDER BY last_used LIMIT ?)",
+                            (total - self.__max_entries__,))
+            except sqlite3.Error:
+                # the cache is only an optimization,
+                # so failing to update it isn't an error
+                pass
+
+    def clear(self):
+        """removes all entries from the cache"""
+
+        with self.__lock__:
+            with self.__db__:
+                self.__db__.execute("DELETE FROM files")
+                self.__db__.execute("DELETE FROM verified")
+                self.__db__.execute("DELETE FROM accuraterip")
+            self.__pending__ = {}
+            self.__used__ = {}
+            self.__verified__ = {}
+            self.__accuraterip__ = {}
+
+    def close(self):
+        """flushes any pending entries and closes the cache"""
+
+        self.flush()
+        __caches__.pop(self.__id__, None)
+        self.__db__.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1646,7 +1646,8 @@ class FlacAudio(WaveContainer, AiffContainer):
             metadata.build(writer)
 
             # write remaining old data to new file
-            transfer_data(old_file.read, writer.write_bytes)
+            writer.flush()
+            transfer_data(old_file.read, new_file.write)
 
             # commit change to disk
             old_file.close()
@@ -2539,12 +2540,14 @@ class FlacAudio(WaveContainer, AiffContainer):
         return flac
 
     def convert(self, target_path, target_class, compression=None,
-                progress=None):
+                progress=None, threaded=False):
         """encodes a new AudioFile from existing AudioFile
 
         take a filename string, target class and optional compression string
         encodes a new AudioFile in the target class and returns
         the resulting object
+        if threaded is True, decoding is performed in a background thread
+        alongside encoding
         may raise EncodingError if some problem occurs during encoding"""
 
         # If a FLAC has embedded RIFF *and* embedded AIFF chunks,
@@ -2562,7 +2565,8 @@ class FlacAudio(WaveContainer, AiffContainer):
                                          target_path,
                                          target_class,
                                          compression,
-                                         progress)
+                                         progress,
+                                         threaded)
         elif (self.has_foreign_aiff_chunks() and
               hasattr(target_class, "from_aiff") and
               callable(target_class.from_aiff)):
@@ -2570,11 +2574,12 @@ class FlacAudio(WaveContainer, AiffContainer):
                                          target_path,
                                          target_class,
                                          compression,
-                                         progress)
+                                         progress,
+                                         threaded)
         else:
             return target_class.from_pcm(
                 target_path,
-                to_pcm_progress(self, progress),
+                to_pcm_progress(self, progress, threaded),
                 compression,
                 total_pcm_frames=self.total_frames())
 
@@ -2598,6 +2603,18 @@ class FlacAudio(WaveContainer, AiffContainer):
 
         return self.__samplerate__
 
+    def md5sum(self):
+        """returns STREAMINFO's MD5 sum of the decoded PCM data
+        as a 16 byte string, or None if the sum is empty
+
+        the decoder checks this sum at the end of the stream
+        so a successful verify() confirms it"""
+
+        if self.__md5__ != b"\x00" * 16:
+            return self.__md5__
+        else:
+            return None
+
     def __read_streaminfo__(self):
         valid_header_types = frozenset(range(0, 6 + 1))
         with open(self.filename, "rb") as f:
@@ -3476,3 +3493,156 @@ def sizes_to_offsets(sizes):
         offsets.append((current_position, frame_frames))
         current_position += frame_size
     return offsets
+
+
+def __encode_flac_frames__(pcm_data, sample_rate, channels, channel_mask,
+                           bits_per_sample, initial_frame_number,
+                           encoding_options):
+    """encodes a string of little-endian, signed PCM data
+    to FLAC frames numbered from initial_frame_number
+
+    returns a (frame_data, [(frame_size, frame_frames), ...]) tuple
+    where frame_data is a binary string of the encoded frames"""
+
+    from io import BytesIO
+    from tempfile import mkstemp
+    import os
+    from audiotools.encoders import encode_flac
+    from audiotools import PCMFileReader
+
+    (fd, temp_filename) = mkstemp(suffix=".flac")
+    os.close(fd)
+    try:
+        sizes = encode_flac(temp_filename,
+                            pcmreader=PCMFileReader(BytesIO(pcm_data),
+                                                    sample_rate,
+                                                    channels,
+                                                    channel_mask,
+                                                    bits_per_sample),
+                            padding_size=0,
+                            initial_frame_number=initial_frame_number,
+                            **encoding_options)
+        with open(temp_filename, "rb") as f:
+            # skip "fLaC" file ID and STREAMINFO block
+            f.seek(4 + 4 + 34)
+            return (f.read(), sizes)
+    finally:
+        os.unlink(temp_filename)
+
+
+def encode_flac_parallel(filename, pcmreader, padding_size=4096,
+                         processes=1, blocks_per_job=64,
+                         **encoding_options):
+    """encodes a FLAC file from pcmreader
+    by encoding groups of blocks_per_job frames in a pool of processes
+
+    takes the same arguments as audiotools.encoders.encode_flac
+    and its output is identical to it for the same options
+    returns a list of (frame_size, frame_frames) tuples
+
+    may raise IOError or ValueError if a problem occurs during encoding"""
+
+    from audiotools.encoders import encode_flac
+
+    if processes <= 1:
+        return encode_flac(filename,
+                           pcmreader=pcmreader,
+                           padding_size=padding_size,
+                           **encoding_options)
+
+    from hashlib import md5
+    from collections import deque
+    from multiprocessing import Pool
+    from audiotools import BufferedPCMReader
+    from audiotools.bitstream import BitstreamWriter
+
+    block_size = encoding_options.get("block_size", 4096)
+    if (block_size < 1) or (block_size > 65535):
+        raise ValueError("block size must be between 1 and 65535")
+    if blocks_per_job < 1:
+        raise ValueError("blocks_per_job must be > 0")
+    job_frames = block_size * blocks_per_job
+
+    sample_rate = pcmreader.sample_rate
+    channels = pcmreader.channels
+    channel_mask = pcmreader.channel_mask
+    bits_per_sample = pcmreader.bits_per_sample
+
+    # all jobs start on a block boundary
+    # so frames are split exactly as a single encoder would split them
+    reader = BufferedPCMReader(pcmreader)
+    md5sum = md5()
+    sizes = []
+    total_samples = 0
+
+    # write placeholder metadata to be populated once encoding is done
+    metadata = FlacMetaData(
+        [Flac_STREAMINFO(minimum_block_size=block_size,
+                         maximum_block_size=block_size,
+                         minimum_frame_size=(2 ** 24) - 1,
+                         maximum_frame_size=0,
+                         sample_rate=sample_rate,
+                         channels=channels,
+                         bits_per_sample=bits_per_sample,
+                         total_samples=0,
+                         md5sum=b"\x00" * 16)] +
+        ([Flac_PADDING(padding_size)] if padding_size else []))
+
+    output = open(filename, "wb")
+    writer = BitstreamWriter(output, False)
+    try:
+        writer.write_bytes(b"fLaC")
+        metadata.build(writer)
+        writer.flush()
+
+        def write_job(job):
+            (frame_data, frame_sizes) = job.get()
+            output.write(frame_data)
+            sizes.extend(frame_sizes)
+
+        pool = Pool(processes)
+        try:
+            # keep a bounded number of jobs in flight
+            # and write their output in the order they were submitted
+            jobs = deque()
+            frame_number = 0
+            framelist = reader.read(job_frames)
+            while len(framelist) > 0:
+                pcm_data = framelist.to_bytes(False, True)
+                md5sum.update(pcm_data)
+                total_samples += framelist.frames
+                if len(jobs) >= (processes * 2):
+                    write_job(jobs.popleft())
+                jobs.append(pool.apply_async(
+                    __encode_flac_frames__,
+                    (pcm_data,
+                     sample_rate,
+                     channels,
+                     channel_mask,
+                     bits_per_sample,
+                     frame_number,
+                     encoding_options)))
+                frame_number += blocks_per_job
+                framelist = reader.read(job_frames)
+
+            while len(jobs) > 0:
+                write_job(jobs.popleft())
+        finally:
+            pool.terminate()
+            pool.join()
+
+        # rewrite STREAMINFO with final values
+        streaminfo = metadata.get_block(Flac_STREAMINFO.BLOCK_ID)
+        if len(sizes) > 0:
+            streaminfo.minimum_frame_size = min(s[0] for s in sizes)
+            streaminfo.maximum_frame_size = max(s[0] for s in sizes)
+        streaminfo.total_samples = total_samples
+        streaminfo.md5sum = md5sum.digest()
+        output.seek(0, 0)
+        writer.write_bytes(b"fLaC")
+        metadata.build(writer)
+        writer.flush()
+    finally:
+        writer.close()
+
+    return sizes
@@ -294,49 +294,9 @@ def skip_id3v2_comment(file):
     """seeks past an ID3v2 comment if found in the file stream
     returns the number of bytes skipped"""
 
-    from audiotools.bitstream import parse
-
-    start = file.tell()
-    try:
-        # check initial header
-        if file.read(3) == b"ID3":
-            bytes_skipped = 3
-        else:
-            file.seek(start)
-            return 0
-
-        # ensure major version is valid
-        if ord(file.read(1)) in (2, 3, 4):
-            bytes_skipped += 1
-        else:
-            file.seek(start)
-            return 0
-
-        # skip minor version
-        file.read(1)
-        bytes_skipped += 1
-
-        # skip flags
-        file.read(1)
-        bytes_skipped += 1
+    from audiotools._mpeg import skip_id3v2
 
-        # get the whole size of the tag
-        try:
-            tag_size = decode_syncsafe32(parse("32u", False, file.read(4))[0])
-        except ValueError:
-            file.seek(start)
-            return 0
-        bytes_skipped += 4
-
-        # skip to the end of its length
-        file.read(tag_size)
-        bytes_skipped += tag_size
-
-        # check for additional ID3v2 tags recursively
-        return bytes_skipped + skip_id3v2_comment(file)
-    except IOError:
-        file.seek(start)
-        return 0
+    return skip_id3v2(file)
 
 
 def total_id3v2_comments(file):
@@ -2367,6 +2327,12 @@ class ID3CommentPair(MetaData):
     def __repr__(self):
         return "ID3CommentPair(%s, %s)" % (repr(self.id3v2), repr(self.id3v1))
 
+    def __reduce__(self):
+        # unpickled pairs are rebuilt from their comments
+        # since __getattr__ needs both set before anything else
+
+        return (ID3CommentPair, (self.id3v2, self.id3v1))
+
     def __getattr__(self, attr):
         assert((self.id3v2 is not None) or (self.id3v1 is not None))
         if attr in self.FIELDS:
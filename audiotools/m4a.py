@@ -16,7 +16,7 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
 
 
-from audiotools import (AudioFile, InvalidFile, BIN, Image)
+from audiotools import (AudioFile, InvalidFile, BIN, Image, config)
 from audiotools.m4a_atoms import *
 
 
@@ -24,10 +24,23 @@ class InvalidM4A(InvalidFile):
     pass
 
 
+def __m4a_atom_header__(reader):
+    """given a BitstreamReader, reads an atom header
+    and returns a (size, name, header size) tuple
+    where size includes the header
+    and a 64-bit size follows the name if the 32-bit size is 1"""
+
+    (length, name) = reader.parse("32u 4b")
+    if length == 1:
+        return (reader.parse("64U")[0], name, 16)
+    else:
+        return (length, name, 8)
+
+
 def get_m4a_atom(reader, *atoms):
     """given a BitstreamReader and atom name strings
     returns a (size, substream) of the final atom data
-    (not including its 64-bit size/name header)
+    (not including its size/name header)
     after traversing the parent atoms
     """
 
@@ -36,17 +49,20 @@ def get_m4a_atom(reader, *atoms):
         # assert(isinstance(next_atom, bytes))
 
         try:
-            (length, stream_atom) = reader.parse("32u 4b")
+            (length, stream_atom, header_size) = __m4a_atom_header__(reader)
             while stream_atom != next_atom:
-                if (length - 8) >= 0:
-                    reader.skip_bytes(length - 8)
-                    (length, stream_atom) = reader.parse("32u 4b")
+                if (length - header_size) >= 0:
+                    reader.skip_bytes(length - header_size)
+                    (length,
+                     stream_atom,
+                     header_size) = __m4a_atom_header__(reader)
                 else:
                     raise KeyError(next_atom)
             if last:
-                return (length - 8, reader.substream(length - 8))
+                return (length - header_size,
+                        reader.substream(length - header_size))
             else:
-                reader = reader.substream(length - 8)
+                reader = reader.substream(length - header_size)
         except IOError:
             raise KeyError(next_atom)
 
@@ -54,7 +70,7 @@ def get_m4a_atom(reader, *atoms):
 def get_m4a_atom_offset(reader, *atoms):
     """given a BitstreamReader and atom name strings
     returns a (size, offset) of the final atom data
-    (including its 64-bit size/name header)
+    (including its size/name header)
     after traversing the parent atoms"""
 
     offset = 0
@@ -64,20 +80,22 @@ def get_m4a_atom_offset(reader, *atoms):
         # assert(isinstance(next_atom, bytes))
 
         try:
-            (length, stream_atom) = reader.parse("32u 4b")
-            offset += 8
+            (length, stream_atom, header_size) = __m4a_atom_header__(reader)
+            offset += header_size
             while stream_atom != next_atom:
-                if (length - 8) > 0:
-                    reader.skip_bytes(length - 8)
-                    offset += (length - 8)
-                    (length, stream_atom) = reader.parse("32u 4b")
-                    offset += 8
+                if (length - header_size) > 0:
+                    reader.skip_bytes(length - header_size)
+                    offset += (length - header_size)
+                    (length,
+                     stream_atom,
+                     header_size) = __m4a_atom_header__(reader)
+                    offset += header_size
                 else:
                     raise KeyError(next_atom)
             if last:
-                return (length, offset - 8)
+                return (length, offset - header_size)
             else:
-                reader = reader.substream(length - 8)
+                reader = reader.substream(length - header_size)
         except IOError:
             raise KeyError(next_atom)
 
@@ -92,21 +110,270 @@ def has_m4a_atom(reader, *atoms):
         # assert(isinstance(next_atom, bytes))
 
         try:
-            (length, stream_atom) = reader.parse("32u 4b")
+            (length, stream_atom, header_size) = __m4a_atom_header__(reader)
             while stream_atom != next_atom:
-                if (length - 8) > 0:
-                    reader.skip_bytes(length - 8)
-                    (length, stream_atom) = reader.parse("32u 4b")
+                if (length - header_size) > 0:
+                    reader.skip_bytes(length - header_size)
+                    (length,
+                     stream_atom,
+                     header_size) = __m4a_atom_header__(reader)
                 else:
                     return False
             if last:
                 return True
             else:
-                reader = reader.substream(length - 8)
+                reader = reader.substream(length - header_size)
         except IOError:
             return False
 
 
+# bytes of top-level "free" padding placed after "moov"
+# whenever a file must be rewritten to enlarge it
+# so that later metadata updates can be done in place
+MOOV_PADDING = 0x1000
+
+
+def get_m4a_top_level_atoms(file):
+    """given a seekable file object, returns a list of
+    (name, offset, size, header size) tuples for each top-level atom
+    where size includes the atom's header
+
+    only atom headers are read, so large atoms such as "mdat" are skipped
+
+    raises IOError if an atom is invalid"""
+
+    from struct import unpack
+    from audiotools.text import ERR_M4A_INVALID_ATOM
+
+    file.seek(0, 2)
+    file_size = file.tell()
+    atoms = []
+    offset = 0
+    while offset < file_size:
+        file.seek(offset, 0)
+        header = file.read(8)
+        if len(header) < 8:
+            raise IOError(ERR_M4A_INVALID_ATOM)
+        (size, name) = unpack(">I4s", header)
+        header_size = 8
+        if size == 1:
+            # 64-bit size follows atom name
+            header = file.read(8)
+            if len(header) < 8:
+                raise IOError(ERR_M4A_INVALID_ATOM)
+            (size,) = unpack(">Q", header)
+            header_size = 16
+        elif size == 0:
+            # atom extends to the end of the file
+            size = file_size - offset
+        if (size < header_size) or ((offset + size) > file_size):
+            raise IOError(ERR_M4A_INVALID_ATOM)
+        atoms.append((name, offset, size, header_size))
+        offset += size
+    return atoms
+
+
+def get_m4a_sample_offsets(stbl):
+    """given an "stbl" M4A_Tree_Atom with parsed
+    "stsz", "stsc" and "stco" or "co64" child atoms,
+    returns a list of (offset, size) tuples, one per sample,
+    where offset is the sample's absolute position in the file
+    and size is its length in bytes
+
+    raises KeyError if a required child atom is missing"""
+
+    sizes = stbl[b"stsz"].block_sizes
+    if stbl.has_child(b"stco"):
+        chunk_offsets = stbl[b"stco"].offsets
+    else:
+        chunk_offsets = stbl[b"co64"].offsets
+    blocks = stbl[b"stsc"].blocks
+
+    offsets = []
+    sample = 0
+    for (i, (first_chunk, samples_per_chunk, description)) in \
+            enumerate(blocks):
+        # each block applies until the next block's first chunk
+        if (i + 1) < len(blocks):
+            last_chunk = blocks[i + 1][0]
+        else:
+            last_chunk = len(chunk_offsets) + 1
+        for offset in chunk_offsets[first_chunk - 1:last_chunk - 1]:
+            for size in sizes[sample:sample + samples_per_chunk]:
+                offsets.append((offset, size))
+                offset += size
+            sample += samples_per_chunk
+    return offsets
+
+
+def update_moov_metadata(filename, metadata):
+    """given a filename string and M4A_META_Atom,
+    replaces the file's moov -> udta -> meta atom with it
+
+    "moov" is rewritten in place if it and any "free" atoms after it
+    have room for the new atom, or if nothing else follows it
+    otherwise, the file is rewritten to a new copy with bounded memory
+    with "free" padding after "moov" and its chunk offsets adjusted
+
+    raises IOError if a problem occurs reading or writing the file"""
+
+    from io import BytesIO
+    from audiotools.bitstream import BitstreamReader, BitstreamRecorder
+
+    with open(filename, "rb") as f:
+        atoms = get_m4a_top_level_atoms(f)
+        for (i, (name, offset, size, header_size)) in enumerate(atoms):
+            if name == b"moov":
+                (moov_index, moov_offset, moov_size) = (i, offset, size)
+                f.seek(offset + header_size, 0)
+                moov_data = f.read(size - header_size)
+                break
+        else:
+            # no "moov" atom to add metadata to
+            return
+
+    moov = M4A_Tree_Atom.parse(
+        b"moov",
+        len(moov_data),
+        BitstreamReader(BytesIO(moov_data), False),
+        {b"trak": M4A_Tree_Atom,
+         b"mdia": M4A_Tree_Atom,
+         b"minf": M4A_Tree_Atom,
+         b"stbl": M4A_Tree_Atom,
+         b"stco": M4A_STCO_Atom,
+         b"co64": M4A_CO64_Atom,
+         b"udta": M4A_Tree_Atom})
+
+    # adjust moov -> udta -> meta atom
+    # (generating sub-atoms as necessary)
+    if not moov.has_child(b"udta"):
+        moov.add_child(M4A_Tree_Atom(b"udta", []))
+    udta = moov[b"udta"]
+    if udta.has_child(b"meta"):
+        udta.replace_child(metadata)
+    else:
+        udta.add_child(metadata)
+
+    # "free" atoms directly after "moov" are available space
+    following = atoms[moov_index + 1:]
+    available = moov_size
+    for (name, offset, size, header_size) in following:
+        if name in (b"free", b"skip"):
+            available += size
+            following = following[1:]
+        else:
+            break
+
+    new_size = 8 + moov.size()
+    if (new_size == available) or ((available - new_size) >= 8):
+        # new "moov" fits, so nothing else moves
+        padding = available - new_size
+        truncate = False
+    elif len(following) == 0:
+        # "moov" is the final atom, so it may grow or shrink freely
+        padding = 0
+        truncate = True
+    else:
+        __rewrite_moov__(filename, moov, moov_offset, moov_offset + available)
+        return
+
+    moov_atom = BitstreamRecorder(False)
+    moov_atom.build("32u 4b", (new_size, b"moov"))
+    moov.build(moov_atom)
+    with open(filename, "r+b") as f:
+        f.seek(moov_offset, 0)
+        f.write(moov_atom.data())
+        if padding > 0:
+            f.write(__free_atom_data__(padding))
+        if truncate:
+            f.truncate()
+
+
+def __free_atom_data__(size):
+    """returns a "free" atom of the given size as bytes
+    including its header"""
+
+    from struct import pack
+
+    return pack(">I4s", size, b"free") + b"\x00" * (size - 8)
+
+
+def __chunk_offset_atoms__(moov):
+    """yields a (stbl atom, chunk offset atom) tuple
+    for each track's "stco" or "co64" atom in the given "moov" atom"""
+
+    for trak in moov:
+        if trak.name == b"trak":
+            try:
+                stbl = trak[b"mdia"][b"minf"][b"stbl"]
+            except KeyError:
+                continue
+            for atom in stbl:
+                if atom.name in (b"stco", b"co64"):
+                    yield (stbl, atom)
+
+
+def __rewrite_moov__(filename, moov, moov_start, moov_end):
+    """given a filename string, updated "moov" M4A_Tree_Atom,
+    and the offsets at which the old "moov" atom begins and ends
+    (including any "free" atoms following it),
+    rewrites the file with the new "moov" atom and padding
+    and shifts any chunk offsets pointing beyond the old "moov"
+
+    data is copied in bounded chunks rather than held in memory"""
+
+    from audiotools import TemporaryFile
+    from audiotools.ape import limited_transfer_data
+    from audiotools.bitstream import BitstreamRecorder
+    from audiotools.text import ERR_M4A_IOERROR
+
+    chunk_offsets = [(stbl, atom, list(atom.offsets))
+                     for (stbl, atom) in __chunk_offset_atoms__(moov)]
+
+    while True:
+        shift = (8 + moov.size() + MOOV_PADDING) - (moov_end - moov_start)
+        for (stbl, atom, offsets) in chunk_offsets:
+            atom.offsets = [(offset + shift) if (offset >= moov_end)
+                            else offset for offset in offsets]
+
+        # chunks moved past 4GiB need 64-bit offsets
+        # which enlarges "moov" again, so try once more
+        overflows = [i for (i, (stbl, atom, offsets))
+                     in enumerate(chunk_offsets)
+                     if ((atom.name == b"stco") and
+                         (max(atom.offsets + [0]) > 0xFFFFFFFF))]
+        if len(overflows) == 0:
+            break
+        for i in overflows:
+            (stbl, atom, offsets) = chunk_offsets[i]
+            co64 = M4A_CO64_Atom(atom.version, atom.flags, offsets)
+            stbl.leaf_atoms = [co64 if (leaf is atom) else leaf
+                               for leaf in stbl]
+            chunk_offsets[i] = (stbl, co64, offsets)
+
+    moov_atom = BitstreamRecorder(False)
+    moov_atom.build("32u 4b", (8 + moov.size(), b"moov"))
+    moov.build(moov_atom)
+
+    with open(filename, "rb") as original:
+        original.seek(0, 2)
+        remaining = original.tell() - moov_end
+        original.seek(0, 0)
+
+        rewritten = TemporaryFile(filename)
+        limited_transfer_data(original.read, rewritten.write, moov_start)
+        rewritten.write(moov_atom.data())
+        rewritten.write(__free_atom_data__(MOOV_PADDING))
+        original.seek(moov_end, 0)
+        limited_transfer_data(original.read, rewritten.write, remaining)
+
+        # don't replace the original with a partial copy
+        if rewritten.tell() != (moov_start + moov_atom.bytes() +
+                                MOOV_PADDING + remaining):
+            raise IOError(ERR_M4A_IOERROR)
+        rewritten.close()
+
+
 class M4ATaggedAudio(object):
     @classmethod
     def supports_metadata(cls):
@@ -198,65 +465,10 @@ class M4ATaggedAudio(object):
                 metadata.build(writer)
             # writer will close "f" when finished
         else:
-            from audiotools import TemporaryFile
-
             # if there's insufficient room,
-            # attempt to resize the outermost "free" also
-
-            # this is only possible if the file is laid out correctly,
-            # with "free" coming after "moov" but before "mdat"
-            # FIXME
-
-            # if neither fix is possible, the whole file must be rewritten
-            # which also requires adjusting the "stco" atom offsets
-            with open(self.filename, "rb") as f:
-                m4a_tree = M4A_Tree_Atom.parse(
-                    None,
-                    os.path.getsize(self.filename),
-                    BitstreamReader(f, False),
-                    {b"moov": M4A_Tree_Atom,
-                     b"trak": M4A_Tree_Atom,
-                     b"mdia": M4A_Tree_Atom,
-                     b"minf": M4A_Tree_Atom,
-                     b"stbl": M4A_Tree_Atom,
-                     b"stco": M4A_STCO_Atom,
-                     b"udta": M4A_Tree_Atom})
-
-            # find initial mdat offset
-            initial_mdat_offset = m4a_tree.child_offset(b"mdat")
-
-            # adjust moov -> udta -> meta atom
-            # (generating sub-atoms as necessary)
-            if not m4a_tree.has_child(b"moov"):
-                return
-            else:
-                moov = m4a_tree[b"moov"]
-            if not moov.has_child(b"udta"):
-                moov.append_child(M4A_Tree_Atom(b"udta", []))
-            udta = moov[b"udta"]
-            if not udta.has_child(b"meta"):
-                udta.append_child(metadata)
-            else:
-                udta.replace_child(metadata)
-
-            # find new mdat offset
-            new_mdat_offset = m4a_tree.child_offset(b"mdat")
-
-            # adjust moov -> trak -> mdia -> minf -> stbl -> stco offsets
-            # based on the difference between the new mdat position and the old
-            try:
-                delta_offset = new_mdat_offset - initial_mdat_offset
-                stco = m4a_tree[b"moov"][b"trak"][b"mdia"][b"minf"][b"stbl"][b"stco"]
-                stco.offsets = [offset + delta_offset for offset in
-                                stco.offsets]
-            except KeyError:
-                # if there is no stco atom, don't worry about it
-                pass
-
-            # then write entire tree back to disk
-            with BitstreamWriter(TemporaryFile(self.filename),
-                                 False) as writer:
-                m4a_tree.build(writer)
+            # rebuild "moov" using any "free" atoms following it
+            # which rewrites the whole file only as a last resort
+            update_moov_metadata(self.filename, metadata)
 
     def set_metadata(self, metadata):
         """takes a MetaData object and sets this track's metadata
@@ -664,7 +876,493 @@ class M4AAudio_nero(M4AAudio_faac):
         else:
             return cls(filename)
 
-if BIN.can_execute(BIN["neroAacEnc"]) and BIN.can_execute(BIN["neroAacDec"]):
+def __fdk_aac_vbr_mode__(faac_quality):
+    """given a faac quality string, returns the fdk-aac VBR mode string
+    whose typical bitrate is nearest that quality's"""
+
+    quality = int(faac_quality)
+    if quality < 60:
+        return "1"
+    elif quality < 75:
+        return "2"
+    elif quality < 100:
+        return "3"
+    elif quality < 125:
+        return "4"
+    else:
+        return "5"
+
+
+def __faac_quality_description__(faac_quality):
+    """given a faac quality string, returns a unicode description
+    of the fdk-aac VBR mode it's encoded at"""
+
+    from audiotools.text import COMP_FDK_AAC_FAAC
+
+    return COMP_FDK_AAC_FAAC % {"mode": __fdk_aac_vbr_mode__(faac_quality)}
+
+
+class M4AAudio_native(M4AAudio_faac):
+    """an M4A audio file using the fdk-aac library for I/O"""
+
+    from audiotools.text import (COMP_FDK_AAC_1, COMP_FDK_AAC_5)
+
+    DEFAULT_COMPRESSION = "4"
+
+    # faac's qualities remain valid so that existing options
+    # and configured defaults are encoded at the nearest VBR mode
+    FAAC_COMPRESSION_MODES = dict([(mode, __fdk_aac_vbr_mode__(mode))
+                                   for mode in
+                                   M4AAudio_faac.COMPRESSION_MODES])
+    COMPRESSION_MODES = (("1", "2", "3", "4", "5") +
+                         M4AAudio_faac.COMPRESSION_MODES)
+    COMPRESSION_DESCRIPTIONS = dict(
+        [(mode, __faac_quality_description__(mode))
+         for mode in M4AAudio_faac.COMPRESSION_MODES] +
+        [("1", COMP_FDK_AAC_1),
+         ("5", COMP_FDK_AAC_5)])
+    BINARIES = tuple()
+    BINARY_URLS = {}
+
+    # PCM frames per AAC-LC access unit
+    BLOCK_SIZE = 1024
+
+    # access units per mdat chunk
+    FRAMES_PER_CHUNK = 20
+
+    # sample rates supported by the AAC-LC encoder
+    SAMPLE_RATES = (8000, 11025, 12000, 16000, 22050, 24000,
+                    32000, 44100, 48000, 64000, 88200, 96000)
+
+    def __init__(self, filename):
+        """filename is a plain string"""
+
+        AudioFile.__init__(self, filename)
+
+        try:
+            moov = self.__moov__()
+        except IOError:
+            from audiotools.text import ERR_M4A_IOERROR
+            raise InvalidM4A(ERR_M4A_IOERROR)
+        except KeyError:
+            from audiotools.text import ERR_M4A_MISSING_MOOV
+            raise InvalidM4A(ERR_M4A_MISSING_MOOV)
+
+        try:
+            mdia = moov[b"trak"][b"mdia"]
+        except KeyError:
+            from audiotools.text import ERR_M4A_MISSING_MDIA
+            raise InvalidM4A(ERR_M4A_MISSING_MDIA)
+
+        try:
+            mdhd = mdia[b"mdhd"]
+        except KeyError:
+            from audiotools.text import ERR_M4A_MISSING_MDHD
+            raise InvalidM4A(ERR_M4A_MISSING_MDHD)
+
+        try:
+            stsd = mdia[b"minf"][b"stbl"][b"stsd"]
+        except KeyError:
+            from audiotools.text import ERR_M4A_MISSING_STSD
+            raise InvalidM4A(ERR_M4A_MISSING_STSD)
+
+        if ((len(stsd.descriptions) == 0) or
+            (stsd.descriptions[0].name != b"mp4a")):
+            from audiotools.text import ERR_M4A_INVALID_MP4A
+            raise InvalidM4A(ERR_M4A_INVALID_MP4A)
+        mp4a = stsd.descriptions[0]
+
+        self.__channels__ = mp4a.channels
+        self.__bits_per_sample__ = mp4a.bits_per_sample
+        self.__sample_rate__ = mdhd.sample_rate
+        self.__length__ = mdhd.track_length
+
+        # the edit list gives the encoder delay and length of the stream
+        # but if there isn't one, treat the first access unit
+        # as encoder delay like faad does
+        self.__encoder_delay__ = self.BLOCK_SIZE
+        self.__total_frames__ = max(self.__length__ - self.BLOCK_SIZE, 0)
+        try:
+            elst = moov[b"trak"][b"edts"][b"elst"]
+            time_scale = moov[b"mvhd"].time_scale
+            for (duration, media_time, media_rate) in elst.entries:
+                # skip empty edits
+                if media_time >= 0:
+                    self.__encoder_delay__ = media_time
+                    self.__total_frames__ = ((duration *
+                                              self.__sample_rate__) //
+                                             time_scale)
+                    break
+        except (KeyError, ZeroDivisionError):
+            pass
+
+    def __moov__(self):
+        """returns the file's "moov" atom as an M4A_Tree_Atom
+        with the atoms needed for decoding parsed
+
+        raises IOError if a problem occurs reading the file
+        or KeyError if the atom is not found"""
+
+        from io import BytesIO
+        from audiotools.bitstream import BitstreamReader
+
+        # seek past "mdat", wherever it is, rather than reading it
+        with open(self.filename, "rb") as f:
+            for (name, offset, size, header_size) in \
+                    get_m4a_top_level_atoms(f):
+                if name == b"moov":
+                    f.seek(offset + header_size, 0)
+                    moov_data = f.read(size - header_size)
+                    break
+            else:
+                raise KeyError(b"moov")
+
+        try:
+            return M4A_Tree_Atom.parse(
+                b"moov",
+                len(moov_data),
+                BitstreamReader(BytesIO(moov_data), False),
+                {b"mvhd": M4A_MVHD_Atom,
+                 b"trak": M4A_Tree_Atom,
+                 b"edts": M4A_Tree_Atom,
+                 b"elst": M4A_ELST_Atom,
+                 b"mdia": M4A_Tree_Atom,
+                 b"mdhd": M4A_MDHD_Atom,
+                 b"minf": M4A_Tree_Atom,
+                 b"stbl": M4A_Tree_Atom,
+                 b"stsd": M4A_STSD_Atom,
+                 b"mp4a": M4A_MP4A_Atom,
+                 b"stsz": M4A_STSZ_Atom,
+                 b"stsc": M4A_STSC_Atom,
+                 b"stco": M4A_STCO_Atom,
+                 b"co64": M4A_CO64_Atom})
+        except ValueError as err:
+            raise IOError(str(err))
+
+    @classmethod
+    def available(cls, system_binaries):
+        """returns True if all necessary compenents are available
+        to support format"""
+
+        try:
+            from audiotools.decoders import AACDecoder
+            from audiotools.encoders import encode_aac
+
+            return True
+        except ImportError:
+            return False
+
+    def cd_frames(self):
+        """returns the total length of the track in CD frames
+
+        each CD frame is 1/75th of a second"""
+
+        try:
+            return (self.total_frames() * 75) // self.sample_rate()
+        except ZeroDivisionError:
+            return 0
+
+    def total_frames(self):
+        """returns the total PCM frames of the track as an integer"""
+
+        return self.__total_frames__
+
+    def seekable(self):
+        """returns True if the file is seekable"""
+
+        return True
+
+    def to_pcm(self):
+        """returns a PCMReader object containing the track's PCM data"""
+
+        from audiotools.decoders import AACDecoder
+        from audiotools import PCMReaderError
+
+        try:
+            # sample offsets are fetched anew
+            # since a metadata update may have moved the mdat atom
+            stbl = self.__moov__()[b"trak"][b"mdia"][b"minf"][b"stbl"]
+            return AACDecoder(
+                self.filename,
+                stbl[b"stsd"].descriptions[0].esds().decoder_specific_info,
+                get_m4a_sample_offsets(stbl),
+                self.__encoder_delay__,
+                self.__total_frames__)
+        except (IOError, ValueError, KeyError) as msg:
+            return PCMReaderError(error_message=str(msg),
+                                  sample_rate=self.sample_rate(),
+                                  channels=self.channels(),
+                                  channel_mask=int(self.channel_mask()),
+                                  bits_per_sample=self.bits_per_sample())
+
+    @classmethod
+    def from_pcm(cls, filename, pcmreader,
+                 compression=None, total_pcm_frames=None):
+        """encodes a new file from PCM data
+
+        takes a filename string, PCMReader object,
+        optional compression level string and
+        optional total_pcm_frames integer
+        encodes a new audio file from pcmreader's data
+        at the given filename with the specified compression level
+        and returns a new M4AAudio object"""
+
+        import time
+        from audiotools.encoders import encode_aac
+        from audiotools.bitstream import BitstreamWriter
+        from audiotools import PCMConverter
+        from audiotools import CounterPCMReader
+        from audiotools import ChannelMask
+        from audiotools import EncodingError
+        from audiotools import __default_quality__
+
+        if ((compression is None) or (compression not in
+                                      cls.COMPRESSION_MODES)):
+            compression = __default_quality__(cls.NAME)
+        compression = cls.FAAC_COMPRESSION_MODES.get(compression, compression)
+
+        if total_pcm_frames is not None:
+            pcmreader = total_counter = CounterPCMReader(pcmreader)
+
+        # the encoder takes 16 bits-per-sample mono or stereo input
+        # at one of its supported sample rates
+        sample_rate = min([r for r in cls.SAMPLE_RATES
+                           if r >= pcmreader.sample_rate] +
+                          [cls.SAMPLE_RATES[-1]])
+        channels = min(pcmreader.channels, 2)
+        if ((pcmreader.sample_rate != sample_rate) or
+            (pcmreader.channels != channels) or
+            (pcmreader.bits_per_sample != 16)):
+            pcmreader = PCMConverter(
+                pcmreader,
+                sample_rate=sample_rate,
+                channels=channels,
+                channel_mask=ChannelMask.from_channels(channels),
+                bits_per_sample=16)
+
+        pcmreader = CounterPCMReader(pcmreader)
+
+        ftyp = ALACAudio.__ftyp_atom__()
+        create_date = int(time.time()) + 2082844800
+
+        try:
+            f = open(filename, "wb")
+        except IOError as err:
+            pcmreader.close()
+            raise EncodingError(str(err))
+
+        # write "ftyp" and "mdat" atoms, followed by "moov"
+        # so that access units go directly to disk as they're encoded
+        # where the encoder's 16 bytes of "mdat" header
+        # are either "free" and "mdat" atom headers
+        # or a single "mdat" header with a 64-bit size
+        try:
+            m4a_writer = BitstreamWriter(f, False)
+            m4a_writer.build("32u 4b", (ftyp.size() + 8, ftyp.name))
+            ftyp.build(m4a_writer)
+            m4a_writer.flush()
+            mdat_offset = 8 + ftyp.size()
+
+            (audio_specific_config,
+             frame_byte_sizes,
+             encoder_delay) = encode_aac(file=f,
+                                         pcmreader=pcmreader,
+                                         vbr_mode=int(compression))
+        except (IOError, ValueError) as err:
+            m4a_writer.close()
+            cls.__unlink__(filename)
+            raise EncodingError(str(err))
+        except Exception:
+            m4a_writer.close()
+            cls.__unlink__(filename)
+            raise
+        finally:
+            pcmreader.close()
+
+        if ((total_pcm_frames is not None) and
+            (total_pcm_frames != total_counter.frames_written)):
+            from audiotools.text import ERR_TOTAL_PCM_FRAMES_MISMATCH
+            m4a_writer.close()
+            cls.__unlink__(filename)
+            raise EncodingError(ERR_TOTAL_PCM_FRAMES_MISMATCH)
+
+        moov = cls.__moov_atom__(pcmreader,
+                                 create_date,
+                                 mdat_offset,
+                                 pcmreader.frames_written,
+                                 encoder_delay,
+                                 audio_specific_config,
+                                 frame_byte_sizes)
+
+        try:
+            f.seek(0, 2)
+            m4a_writer.build("32u 4b", (moov.size() + 8, moov.name))
+            moov.build(m4a_writer)
+            m4a_writer.flush()
+            m4a_writer.close()
+        except IOError as err:
+            m4a_writer.close()
+            cls.__unlink__(filename)
+            raise EncodingError(str(err))
+
+        return cls(filename)
+
+    @classmethod
+    def __moov_atom__(cls, pcmreader,
+                      create_date,
+                      mdat_offset,
+                      total_pcm_frames,
+                      encoder_delay,
+                      audio_specific_config,
+                      frame_byte_sizes):
+        """pcmreader is the PCMReader object that was encoded
+        create_date is the file's creation time, in the Apple epoch, as an int
+        mdat_offset is the number of bytes before the start of the mdat atom
+        total_pcm_frames is the length of the stream, in PCM frames
+        encoder_delay is the number of PCM frames the stream is delayed by
+        audio_specific_config is the encoder's AudioSpecificConfig bytes
+        frame_byte_sizes is a list of access unit sizes, in bytes
+        """
+
+        media_length = len(frame_byte_sizes) * cls.BLOCK_SIZE
+
+        return M4A_Tree_Atom(
+            b"moov",
+            [ALACAudio.__mvhd_atom__(pcmreader, create_date, total_pcm_frames),
+             M4A_Tree_Atom(
+                 b"trak",
+                 [ALACAudio.__tkhd_atom__(create_date, total_pcm_frames),
+                  M4A_Tree_Atom(
+                      b"edts",
+                      [M4A_ELST_Atom(
+                          version=0,
+                          flags=0,
+                          entries=[(total_pcm_frames,
+                                    encoder_delay,
+                                    0x10000)])]),
+                  M4A_Tree_Atom(
+                      b"mdia",
+                      [ALACAudio.__mdhd_atom__(pcmreader,
+                                               create_date,
+                                               media_length),
+                       ALACAudio.__hdlr_atom__(),
+                       M4A_Tree_Atom(b"minf",
+                                     [ALACAudio.__smhd_atom__(),
+                                      M4A_Tree_Atom(
+                                          b"dinf",
+                                          [ALACAudio.__dref_atom__()]),
+                                      M4A_Tree_Atom(
+                                          b"stbl",
+                                          [cls.__stsd_atom__(
+                                              pcmreader,
+                                              total_pcm_frames,
+                                              audio_specific_config,
+                                              frame_byte_sizes),
+                                           M4A_STTS_Atom(
+                                               version=0,
+                                               flags=0,
+                                               times=[(len(frame_byte_sizes),
+                                                       cls.BLOCK_SIZE)]),
+                                           cls.__stsc_atom__(
+                                               frame_byte_sizes),
+                                           M4A_STSZ_Atom(
+                                               version=0,
+                                               flags=0,
+                                               byte_size=0,
+                                               block_sizes=frame_byte_sizes),
+                                           cls.__chunk_offset_atom__(
+                                               mdat_offset,
+                                               frame_byte_sizes)])])])]),
+             M4A_Tree_Atom(b"udta", [ALACAudio.__meta_atom__()])])
+
+    @classmethod
+    def __stsd_atom__(cls, pcmreader,
+                      total_pcm_frames,
+                      audio_specific_config,
+                      frame_byte_sizes):
+        max_frame_size = max(frame_byte_sizes + [0])
+        try:
+            average_bitrate = ((sum(frame_byte_sizes) * 8 *
+                                pcmreader.sample_rate) // total_pcm_frames)
+        except ZeroDivisionError:
+            average_bitrate = 0
+
+        return M4A_STSD_Atom(
+            version=0,
+            flags=0,
+            descriptions=[
+                M4A_MP4A_Atom(
+                    reference_index=1,
+                    qt_version=0,
+                    qt_revision_level=0,
+                    qt_vendor=b"\x00\x00\x00\x00",
+                    channels=pcmreader.channels,
+                    bits_per_sample=16,
+                    qt_compression_id=0,
+                    audio_packet_size=0,
+                    # 16.16 fixed point, if it fits
+                    sample_rate=((pcmreader.sample_rate << 16)
+                                 if (pcmreader.sample_rate < 0x10000)
+                                 else 0),
+                    qt_extension=b"",
+                    sub_atoms=[
+                        M4A_ESDS_Atom(
+                            version=0,
+                            flags=0,
+                            es_id=0,
+                            object_type=0x40,  # MPEG-4 audio
+                            stream_type=0x05,  # audio stream
+                            buffer_size=max_frame_size,
+                            max_bitrate=((max_frame_size * 8 *
+                                          pcmreader.sample_rate) //
+                                         cls.BLOCK_SIZE),
+                            average_bitrate=average_bitrate,
+                            decoder_specific_info=audio_specific_config)])])
+
+    @classmethod
+    def __stsc_atom__(cls, frame_byte_sizes):
+        total_frames = len(frame_byte_sizes)
+        blocks = [(1, min(total_frames, cls.FRAMES_PER_CHUNK), 1)]
+        if (total_frames > cls.FRAMES_PER_CHUNK) and \
+                (total_frames % cls.FRAMES_PER_CHUNK):
+            blocks.append((1 + (total_frames // cls.FRAMES_PER_CHUNK),
+                           total_frames % cls.FRAMES_PER_CHUNK,
+                           1))
+
+        return M4A_STSC_Atom(
+            version=0,
+            flags=0,
+            blocks=[b for b in blocks if b[1] > 0])
+
+    @classmethod
+    def __chunk_offset_atom__(cls, mdat_offset, frame_byte_sizes):
+        """returns an "stco" atom of chunk offsets
+        or a "co64" atom if any offset needs more than 32 bits"""
+
+        chunk_offsets = []
+        offset = mdat_offset + 16
+        for i in range(0, len(frame_byte_sizes), cls.FRAMES_PER_CHUNK):
+            chunk_offsets.append(offset)
+            offset += sum(frame_byte_sizes[i:i + cls.FRAMES_PER_CHUNK])
+
+        if max(chunk_offsets + [0]) > 0xFFFFFFFF:
+            return M4A_CO64_Atom(
+                version=0,
+                flags=0,
+                offsets=chunk_offsets)
+        else:
+            return M4A_STCO_Atom(
+                version=0,
+                flags=0,
+                offsets=chunk_offsets)
+
+
+# the in-process libfdk-aac encoder and decoder
+# are only used when enabled in the config file
+if (config.getboolean_default("M4A", "native", False) and
+        M4AAudio_native.available(BIN)):
+    M4AAudio = M4AAudio_native
+elif BIN.can_execute(BIN["neroAacEnc"]) and BIN.can_execute(BIN["neroAacDec"]):
     M4AAudio = M4AAudio_nero
 else:
     M4AAudio = M4AAudio_faac
@@ -1076,7 +1774,8 @@ class ALACAudio(M4ATaggedAudio, AudioFile):
 
             # build our complete output file
             try:
-                m4a_writer = BitstreamWriter(open(filename, "wb"), False)
+                m4a_file = open(filename, "wb")
+                m4a_writer = BitstreamWriter(m4a_file, False)
             except IOError as err:
                 mdat_file.close()
                 raise EncodingError(str(err))
@@ -1088,7 +1787,8 @@ class ALACAudio(M4ATaggedAudio, AudioFile):
                 m4a_writer.build("32u 4b", (free.size() + 8, free.name))
                 free.build(m4a_writer)
                 mdat_file.seek(0, 0)
-                transfer_data(mdat_file.read, m4a_writer.write_bytes)
+                m4a_writer.flush()
+                transfer_data(mdat_file.read, m4a_file.write)
                 mdat_file.close()
                 m4a_writer.close()
             except IOError as err:
@@ -1368,3 +2068,83 @@ class ALACAudio(M4ATaggedAudio, AudioFile):
     @classmethod
     def __free_atom__(cls, size):
         return M4A_FREE_Atom(size)
+
+
+# the most atoms __file_type__ will step over at any one level
+# before giving up on finding the one it's looking for
+MAX_PROBED_ATOMS = 64
+
+
+def __find_atom__(file, end, name):
+    """given a seekable file positioned at an atom header,
+    the offset at which the enclosing atom ends (or None for EOF)
+    and an atom name bytes, steps over sibling atoms
+    by reading only their headers
+
+    returns the offset at which the named atom ends
+    with the file positioned at that atom's data
+    or returns None if the atom isn't found"""
+
+    from struct import unpack
+
+    for i in range(MAX_PROBED_ATOMS):
+        position = file.tell()
+        if (end is not None) and ((position + 8) > end):
+            return None
+        header = file.read(8)
+        if len(header) < 8:
+            return None
+        (size, atom_name) = unpack(">I4s", header)
+        if size == 1:
+            # 64-bit size follows atom name
+            header = file.read(8)
+            if len(header) < 8:
+                return None
+            (size,) = unpack(">Q", header)
+            if size < 16:
+                return None
+        elif size == 0:
+            # atom extends to the end of its container
+            if atom_name == name:
+                return end
+            else:
+                return None
+        elif size < 8:
+            return None
+
+        if atom_name == name:
+            return position + size
+        else:
+            # seeking past a large atom such as "mdat"
+            # reads none of its data
+            file.seek(position + size, 0)
+    else:
+        return None
+
+
+def __file_type__(header, file):
+    if header[8:12] not in (b"mp41", b"mp42", b"M4A ", b"M4B "):
+        return None
+
+    # walk moov->trak->mdia->minf->stbl->stsd atoms
+    # which works the same whether "moov" precedes "mdat" or not
+    end = None
+    for atom_name in [b"moov", b"trak", b"mdia", b"minf", b"stbl", b"stsd"]:
+        end = __find_atom__(file, end, atom_name)
+        if end is None:
+            return None
+
+    # skip stsd version, flags and description count
+    # to get the name of its first description atom
+    stsd = file.read(16)
+    if len(stsd) < 16:
+        return None
+    elif stsd[12:16] == b"alac":
+        # if first description is "alac" atom, it's an ALAC
+        return ALACAudio
+    elif stsd[12:16] == b"mp4a":
+        # if first description is "mp4a" atom, it's M4A
+        return M4AAudio
+    else:
+        # otherwise, it's unknown
+        return None
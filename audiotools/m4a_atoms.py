@@ -921,6 +921,44 @@ class M4A_STCO_Atom(M4A_Leaf_Atom):
         return 8 + (4 * len(self.offsets))
 
 
+class M4A_CO64_Atom(M4A_Leaf_Atom):
+    def __init__(self, version, flags, offsets):
+        self.name = b'co64'
+        self.version = version
+        self.flags = flags
+        self.offsets = offsets
+
+    def __repr__(self):
+        return "M4A_CO64_Atom(%s, %s, %s)" % \
+            (self.version, self.flags, self.offsets)
+
+    @classmethod
+    def parse(cls, name, data_size, reader, parsers):
+        """given a 4 byte name, data_size int, BitstreamReader
+        and dict of {"atom":handler} sub-parsers,
+        returns an atom of this class"""
+
+        assert(name == b"co64")
+        (version, flags, offset_count) = reader.parse("8u 24u 32u")
+        return cls(version, flags,
+                   [reader.parse("64U")[0] for i in range(offset_count)])
+
+    def build(self, writer):
+        """writes the atom to the given BitstreamWriter
+        not including its 64-bit size / name header"""
+
+        writer.build("8u 24u 32u", (self.version, self.flags,
+                                    len(self.offsets)))
+        for offset in self.offsets:
+            writer.build("64U", (offset,))
+
+    def size(self):
+        """returns the atom's size
+        not including its 64-bit size / name header"""
+
+        return 8 + (8 * len(self.offsets))
+
+
 class M4A_ALAC_Atom(M4A_Leaf_Atom):
     def __init__(self, reference_index, qt_version, qt_revision_level,
                  qt_vendor, channels, bits_per_sample, qt_compression_id,
@@ -1072,6 +1110,345 @@ class M4A_SUB_ALAC_Atom(M4A_Leaf_Atom):
         return 28
 
 
+class M4A_MP4A_Atom(M4A_Leaf_Atom):
+    def __init__(self, reference_index, qt_version, qt_revision_level,
+                 qt_vendor, channels, bits_per_sample, qt_compression_id,
+                 audio_packet_size, sample_rate, qt_extension, sub_atoms):
+        self.name = b'mp4a'
+        self.reference_index = reference_index
+        self.qt_version = qt_version
+        self.qt_revision_level = qt_revision_level
+        self.qt_vendor = qt_vendor
+        self.channels = channels
+        self.bits_per_sample = bits_per_sample
+        self.qt_compression_id = qt_compression_id
+        self.audio_packet_size = audio_packet_size
+        self.sample_rate = sample_rate
+        self.qt_extension = qt_extension
+        self.sub_atoms = sub_atoms
+
+    def __repr__(self):
+        return "M4A_MP4A_Atom(%s)" % \
+            ",".join(map(repr, [self.reference_index,
+                                self.qt_version,
+                                self.qt_revision_level,
+                                self.qt_vendor,
+                                self.channels,
+                                self.bits_per_sample,
+                                self.qt_compression_id,
+                                self.audio_packet_size,
+                                self.sample_rate,
+                                self.qt_extension,
+                                self.sub_atoms]))
+
+    @classmethod
+    def parse(cls, name, data_size, reader, parsers):
+        """given a 4 byte name, data_size int, BitstreamReader
+        and dict of {"atom":handler} sub-parsers,
+        returns an atom of this class"""
+
+        (reference_index,
+         qt_version,
+         qt_revision_level,
+         qt_vendor,
+         channels,
+         bits_per_sample,
+         qt_compression_id,
+         audio_packet_size,
+         sample_rate) = reader.parse(
+            "6P 16u 16u 16u 4b 16u 16u 16u 16u 32u")
+
+        # QuickTime sound description versions 1 and 2
+        # carry extra fields before any sub-atoms
+        qt_extension = reader.read_bytes({1: 16, 2: 36}.get(qt_version, 0))
+
+        # "esds" may also be found inside a QuickTime "wave" atom
+        sub_atoms = parse_sub_atoms(data_size - 28 - len(qt_extension),
+                                    reader,
+                                    {b"esds": M4A_ESDS_Atom,
+                                     b"wave": M4A_Tree_Atom})
+
+        return cls(reference_index=reference_index,
+                   qt_version=qt_version,
+                   qt_revision_level=qt_revision_level,
+                   qt_vendor=qt_vendor,
+                   channels=channels,
+                   bits_per_sample=bits_per_sample,
+                   qt_compression_id=qt_compression_id,
+                   audio_packet_size=audio_packet_size,
+                   sample_rate=sample_rate,
+                   qt_extension=qt_extension,
+                   sub_atoms=sub_atoms)
+
+    def build(self, writer):
+        """writes the atom to the given BitstreamWriter
+        not including its 64-bit size / name header"""
+
+        writer.build("6P 16u 16u 16u 4b 16u 16u 16u 16u 32u",
+                     (self.reference_index,
+                      self.qt_version,
+                      self.qt_revision_level,
+                      self.qt_vendor,
+                      self.channels,
+                      self.bits_per_sample,
+                      self.qt_compression_id,
+                      self.audio_packet_size,
+                      self.sample_rate))
+        writer.write_bytes(self.qt_extension)
+        for sub_atom in self.sub_atoms:
+            writer.build("32u 4b", (sub_atom.size() + 8, sub_atom.name))
+            sub_atom.build(writer)
+
+    def size(self):
+        """returns the atom's size
+        not including its 64-bit size / name header"""
+
+        return (28 + len(self.qt_extension) +
+                sum([8 + sub_atom.size() for sub_atom in self.sub_atoms]))
+
+    def esds(self):
+        """returns the M4A_ESDS_Atom describing the audio stream
+
+        raises KeyError if it is not found"""
+
+        for sub_atom in self.sub_atoms:
+            if sub_atom.name == b"esds":
+                return sub_atom
+            elif sub_atom.name == b"wave":
+                for wave_atom in sub_atom:
+                    if wave_atom.name == b"esds":
+                        return wave_atom
+        else:
+            raise KeyError(b"esds")
+
+
+def __read_descriptor__(reader):
+    """given a BitstreamReader, returns an MPEG-4 descriptor's
+    (tag, size, header size) tuple
+    where size is the length of the descriptor's data in bytes"""
+
+    tag = reader.read(8)
+    size = 0
+    header_size = 1
+    while True:
+        (more, bits) = reader.parse("1u 7u")
+        size = (size << 7) | bits
+        header_size += 1
+        if (not more) or (header_size == 5):
+            return (tag, size, header_size)
+
+
+def __descriptor_header_size__(size):
+    """returns the size of an MPEG-4 descriptor's header in bytes
+    given the length of its data"""
+
+    header_size = 2
+    while (size >> (7 * (header_size - 1))) and (header_size < 5):
+        header_size += 1
+    return header_size
+
+
+def __build_descriptor__(writer, tag, size):
+    """writes an MPEG-4 descriptor's tag and size
+    to the given BitstreamWriter"""
+
+    writer.write(8, tag)
+    length_bytes = __descriptor_header_size__(size) - 1
+    for i in reversed(range(length_bytes)):
+        writer.build("1u 7u", (1 if i else 0, (size >> (7 * i)) & 0x7F))
+
+
+class M4A_ESDS_Atom(M4A_Leaf_Atom):
+    def __init__(self, version, flags, es_id, object_type, stream_type,
+                 buffer_size, max_bitrate, average_bitrate,
+                 decoder_specific_info):
+        self.name = b'esds'
+        self.version = version
+        self.flags = flags
+        self.es_id = es_id
+        self.object_type = object_type
+        self.stream_type = stream_type
+        self.buffer_size = buffer_size
+        self.max_bitrate = max_bitrate
+        self.average_bitrate = average_bitrate
+        self.decoder_specific_info = decoder_specific_info
+
+    def __repr__(self):
+        return "M4A_ESDS_Atom(%s)" % \
+            ",".join(map(repr, [self.version,
+                                self.flags,
+                                self.es_id,
+                                self.object_type,
+                                self.stream_type,
+                                self.buffer_size,
+                                self.max_bitrate,
+                                self.average_bitrate,
+                                self.decoder_specific_info]))
+
+    @classmethod
+    def parse(cls, name, data_size, reader, parsers):
+        """given a 4 byte name, data_size int, BitstreamReader
+        and dict of {"atom":handler} sub-parsers,
+        returns an atom of this class"""
+
+        from audiotools.text import ERR_M4A_INVALID_ESDS
+
+        (version, flags) = reader.parse("8u 24u")
+
+        (tag, es_size, header_size) = __read_descriptor__(reader)
+        if tag != 3:
+            raise IOError(ERR_M4A_INVALID_ESDS)
+        es = reader.substream(es_size)
+        (es_id,
+         stream_dependence,
+         url,
+         ocr_stream) = es.parse("16u 1u 1u 1u 5p")
+        es_size -= 3
+        if stream_dependence:
+            es.skip(16)
+            es_size -= 2
+        if url:
+            url_length = es.read(8)
+            es.skip_bytes(url_length)
+            es_size -= (1 + url_length)
+        if ocr_stream:
+            es.skip(16)
+            es_size -= 2
+
+        # the remaining sub-descriptors may appear in any order
+        config = None
+        while es_size > 0:
+            (tag, size, header_size) = __read_descriptor__(es)
+            descriptor = es.substream(size)
+            es_size -= (header_size + size)
+            if tag == 4:
+                config = descriptor.parse("8u 6u 1p 1p 24u 32u 32u")
+                decoder_specific_info = b""
+                size -= 13
+                while size > 0:
+                    (tag, info_size, header_size) = \
+                        __read_descriptor__(descriptor)
+                    if tag == 5:
+                        decoder_specific_info = \
+                            descriptor.read_bytes(info_size)
+                    else:
+                        descriptor.skip_bytes(info_size)
+                    size -= (header_size + info_size)
+
+        if config is None:
+            raise IOError(ERR_M4A_INVALID_ESDS)
+
+        (object_type,
+         stream_type,
+         buffer_size,
+         max_bitrate,
+         average_bitrate) = config
+
+        return cls(version=version,
+                   flags=flags,
+                   es_id=es_id,
+                   object_type=object_type,
+                   stream_type=stream_type,
+                   buffer_size=buffer_size,
+                   max_bitrate=max_bitrate,
+                   average_bitrate=average_bitrate,
+                   decoder_specific_info=decoder_specific_info)
+
+    def __descriptor_sizes__(self):
+        """returns (ES, DecoderConfig, DecoderSpecificInfo) sizes
+        of descriptor data, not including their headers"""
+
+        info_size = len(self.decoder_specific_info)
+        config_size = (13 +
+                       __descriptor_header_size__(info_size) + info_size)
+        es_size = (3 +
+                   __descriptor_header_size__(config_size) + config_size +
+                   __descriptor_header_size__(1) + 1)
+        return (es_size, config_size, info_size)
+
+    def build(self, writer):
+        """writes the atom to the given BitstreamWriter
+        not including its 64-bit size / name header"""
+
+        (es_size, config_size, info_size) = self.__descriptor_sizes__()
+
+        writer.build("8u 24u", (self.version, self.flags))
+
+        # ES descriptor with no dependence, URL or OCR stream
+        __build_descriptor__(writer, 3, es_size)
+        writer.build("16u 8u", (self.es_id, 0))
+
+        # DecoderConfig descriptor
+        __build_descriptor__(writer, 4, config_size)
+        writer.build("8u 6u 1u 1u 24u 32u 32u",
+                     (self.object_type,
+                      self.stream_type,
+                      0,   # upstream
+                      1,   # reserved
+                      self.buffer_size,
+                      self.max_bitrate,
+                      self.average_bitrate))
+
+        # DecoderSpecificInfo descriptor
+        __build_descriptor__(writer, 5, info_size)
+        writer.write_bytes(self.decoder_specific_info)
+
+        # SLConfig descriptor with MP4 predefined value
+        __build_descriptor__(writer, 6, 1)
+        writer.write(8, 2)
+
+    def size(self):
+        """returns the atom's size
+        not including its 64-bit size / name header"""
+
+        es_size = self.__descriptor_sizes__()[0]
+        return 4 + __descriptor_header_size__(es_size) + es_size
+
+
+class M4A_ELST_Atom(M4A_Leaf_Atom):
+    def __init__(self, version, flags, entries):
+        self.name = b'elst'
+        self.version = version
+        self.flags = flags
+        self.entries = entries
+
+    def __repr__(self):
+        return "M4A_ELST_Atom(%s, %s, %s)" % \
+            (repr(self.version), repr(self.flags), repr(self.entries))
+
+    @classmethod
+    def parse(cls, name, data_size, reader, parsers):
+        """given a 4 byte name, data_size int, BitstreamReader
+        and dict of {"atom":handler} sub-parsers,
+        returns an atom of this class
+
+        entries are (segment duration, media time, media rate) tuples
+        where a media time of -1 indicates an empty edit"""
+
+        (version, flags) = reader.parse("8u 24u")
+        entry_format = "32u 32s 32u" if (version == 0) else "64U 64S 32u"
+        return cls(version=version,
+                   flags=flags,
+                   entries=[tuple(reader.parse(entry_format))
+                            for i in range(reader.read(32))])
+
+    def build(self, writer):
+        """writes the atom to the given BitstreamWriter
+        not including its 64-bit size / name header"""
+
+        entry_format = "32u 32s 32u" if (self.version == 0) else "64U 64S 32u"
+        writer.build("8u 24u 32u",
+                     (self.version, self.flags, len(self.entries)))
+        for entry in self.entries:
+            writer.build(entry_format, entry)
+
+    def size(self):
+        """returns the atom's size
+        not including its 64-bit size / name header"""
+
+        return 8 + ((12 if (self.version == 0) else 20) * len(self.entries))
+
+
 class M4A_META_Atom(MetaData, M4A_Tree_Atom):
     UNICODE_ATTRIB_TO_ILST = {"track_name": b"\xa9nam",
                               "album_name": b"\xa9alb",
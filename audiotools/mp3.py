@@ -106,98 +106,30 @@ class MP3Audio(AudioFile):
 
         AudioFile.__init__(self, filename)
 
-        from audiotools.bitstream import parse
-
         try:
             mp3file = open(filename, "rb")
         except IOError as msg:
             raise InvalidMP3(str(msg))
 
         try:
-            try:
-                header_bytes = MP3Audio.__find_next_mp3_frame__(mp3file)
-            except IOError:
-                from audiotools.text import ERR_MP3_FRAME_NOT_FOUND
-                raise InvalidMP3(ERR_MP3_FRAME_NOT_FOUND)
-
-            (frame_sync,
-             mpeg_id,
-             layer,
-             bit_rate,
-             sample_rate,
-             pad,
-             channels) = parse("11u 2u 2u 1p 4u 2u 1u 1p 2u 6p",
-                               False,
-                               mp3file.read(4))
-
-            self.__samplerate__ = self.SAMPLE_RATE[mpeg_id][sample_rate]
-            if self.__samplerate__ is None:
-                from audiotools.text import ERR_MP3_INVALID_SAMPLE_RATE
-                raise InvalidMP3(ERR_MP3_INVALID_SAMPLE_RATE)
-            if channels in (0, 1, 2):
-                self.__channels__ = 2
-            else:
-                self.__channels__ = 1
-
-            first_frame = mp3file.read(self.frame_length(mpeg_id,
-                                                         layer,
-                                                         bit_rate,
-                                                         sample_rate,
-                                                         pad) - 4)
-
-            if ((b"Xing" in first_frame) and
-                (len(first_frame[first_frame.index(b"Xing"):
-                                 first_frame.index(b"Xing") + 160]) == 160)):
-                # pull length from Xing header, if present
-                self.__pcm_frames__ = (
-                    parse("32p 32p 32u 32p 832p",
-                          0,
-                          first_frame[first_frame.index(b"Xing"):
-                                      first_frame.index(b"Xing") + 160])[0] *
-                    self.PCM_FRAMES_PER_MPEG_FRAME[layer])
-            else:
-                # otherwise, bounce through file frames
-                from audiotools.bitstream import BitstreamReader
-
-                reader = BitstreamReader(mp3file, False)
-                self.__pcm_frames__ = 0
-
-                try:
-                    (frame_sync,
-                     mpeg_id,
-                     layer,
-                     bit_rate,
-                     sample_rate,
-                     pad) = reader.parse("11u 2u 2u 1p 4u 2u 1u 9p")
-
-                    while frame_sync == 0x7FF:
-                        self.__pcm_frames__ += \
-                            self.PCM_FRAMES_PER_MPEG_FRAME[layer]
-
-                        reader.skip_bytes(self.frame_length(mpeg_id,
-                                                            layer,
-                                                            bit_rate,
-                                                            sample_rate,
-                                                            pad) - 4)
-
-                        (frame_sync,
-                         mpeg_id,
-                         layer,
-                         bit_rate,
-                         sample_rate,
-                         pad) = reader.parse("11u 2u 2u 1p 4u 2u 1u 9p")
-                except IOError:
-                    pass
-                except ValueError as err:
-                    raise InvalidMP3(err)
+            frames = MPEGFrameIndex(mp3file)
         finally:
             mp3file.close()
 
+        self.__samplerate__ = frames.sample_rate
+        self.__channels__ = frames.channels
+        self.__pcm_frames__ = frames.total_pcm_frames()
+
     def lossless(self):
         """returns False"""
 
         return False
 
+    def seekable(self):
+        """returns True if the file is seekable"""
+
+        return True
+
     def to_pcm(self):
         """returns a PCMReader object containing the track's PCM data"""
 
@@ -498,63 +430,13 @@ class MP3Audio(AudioFile):
     # places mp3file at the position of the next MP3 frame's start
     @classmethod
     def __find_next_mp3_frame__(cls, mp3file):
-        from audiotools.id3 import skip_id3v2_comment
-
-        # if we're starting at an ID3v2 header, skip it to save a bunch of time
-        bytes_skipped = skip_id3v2_comment(mp3file)
-
-        # then find the next mp3 frame
-        from audiotools.bitstream import BitstreamReader
-
-        reader = BitstreamReader(mp3file, False)
-        pos = reader.getpos()
-        try:
-            (sync,
-             mpeg_id,
-             layer_description) = reader.parse("11u 2u 2u 1p")
-        except IOError as err:
-            raise err
-
-        while (not ((sync == 0x7FF) and
-                    (mpeg_id in (0, 2, 3)) and
-                    (layer_description in (1, 2, 3)))):
-            reader.setpos(pos)
-            reader.skip(8)
-            bytes_skipped += 1
-            pos = reader.getpos()
-            try:
-                (sync,
-                 mpeg_id,
-                 layer_description) = reader.parse("11u 2u 2u 1p")
-            except IOError as err:
-                raise err
-        else:
-            reader.setpos(pos)
-            return bytes_skipped
+        return find_mpeg_frame(mp3file)
 
     @classmethod
     def __find_mp3_start__(cls, mp3file):
         """places mp3file at the position of the MP3 file's start"""
 
-        from audiotools.id3 import skip_id3v2_comment
-
-        # if we're starting at an ID3v2 header, skip it to save a bunch of time
-        skip_id3v2_comment(mp3file)
-
-        from audiotools.bitstream import BitstreamReader
-
-        reader = BitstreamReader(mp3file, False)
-
-        # skip over any bytes that aren't a valid MPEG header
-        pos = reader.getpos()
-        (frame_sync, mpeg_id, layer) = reader.parse("11u 2u 2u 1p")
-        while (not ((frame_sync == 0x7FF) and
-                    (mpeg_id in (0, 2, 3)) and
-                    (layer in (1, 2, 3)))):
-            reader.setpos(pos)
-            reader.skip(8)
-            pos = reader.getpos()
-        reader.setpos(pos)
+        find_mpeg_frame(mp3file)
 
     @classmethod
     def __find_last_mp3_frame__(cls, mp3file):
@@ -650,6 +532,227 @@ class MP3Audio(AudioFile):
         messenger.info(ERR_PROGRAM_PACKAGE_MANAGER)
 
 
+# bytes read at a time when scanning for MPEG frames
+SCAN_BLOCK_SIZE = 65536
+
+
+def __frame_tables__():
+    """returns a (frame_lengths, pcm_frames) tuple of lists
+    indexed by the second and third bytes of an MPEG frame header
+    where frame_lengths is the frame's length in bytes
+    (or 0 if the header is invalid)
+    and pcm_frames is the number of PCM frames in the frame"""
+
+    frame_lengths = [0] * 0x10000
+    pcm_frames = [0] * 0x10000
+
+    for key in range(0xE000, 0x10000):
+        mpeg_id = (key >> 11) & 3
+        layer = (key >> 9) & 3
+        bit_rate = MP3Audio.BIT_RATE[mpeg_id][layer][(key >> 4) & 0xF]
+        sample_rate = MP3Audio.SAMPLE_RATE[mpeg_id][(key >> 2) & 3]
+        pad = (key >> 1) & 1
+        if (bit_rate is None) or (sample_rate is None) or (layer == 0):
+            continue
+        elif layer == 3:
+            # layer I
+            frame_lengths[key] = (((12 * bit_rate) // sample_rate) + pad) * 4
+            pcm_frames[key] = 384
+        else:
+            # layer II/III, where MPEG-2 and MPEG-2.5 layer III
+            # frames have half as many samples
+            pcm_frames[key] = (576 if ((layer == 1) and (mpeg_id != 3))
+                               else 1152)
+            frame_lengths[key] = (((pcm_frames[key] // 8) * bit_rate) //
+                                  sample_rate) + pad
+
+    return (frame_lengths, pcm_frames)
+
+
+# header bits which must match the first frame's
+# for subsequent frames to be considered part of the same stream
+# (sync, MPEG ID, layer and sample rate)
+FRAME_HEADER_MASK = 0xFE0C
+
+
+def find_mpeg_frame(mp3file):
+    """given a seekable file object positioned at or before
+    an MPEG frame or ID3v2 tag, places the file at the start
+    of the next valid MPEG frame and returns the number of bytes skipped
+
+    raises IOError if no MPEG frame is found"""
+
+    from audiotools._mpeg import skip_id3v2, find_frame
+
+    # if we're starting at an ID3v2 header, skip it to save a bunch of time
+    bytes_skipped = skip_id3v2(mp3file)
+
+    frame_skipped = find_frame(mp3file)
+    if frame_skipped is None:
+        from audiotools.text import ERR_MP3_FRAME_NOT_FOUND
+        raise IOError(ERR_MP3_FRAME_NOT_FOUND)
+    else:
+        return bytes_skipped + frame_skipped
+
+
+class MPEGFrameIndex(object):
+    """the MPEG frames of an MP3 or MP2 file
+
+    this is built by scanning whole blocks of the file
+    for frame headers rather than parsing each one with a BitstreamReader
+    and skips scanning altogether if the first frame
+    contains a Xing, Info or VBRI header with a frame count"""
+
+    # (frame_lengths, pcm_frames) lookup tables
+    TABLES = __frame_tables__()
+
+    def __init__(self, mp3file):
+        """mp3file is a seekable file object positioned at
+        the start of the file
+
+        raises InvalidMP3 if no valid MPEG frame is found"""
+
+        try:
+            find_mpeg_frame(mp3file)
+        except IOError:
+            from audiotools.text import ERR_MP3_FRAME_NOT_FOUND
+            raise InvalidMP3(ERR_MP3_FRAME_NOT_FOUND)
+
+        (frame_lengths, pcm_frames) = self.TABLES
+
+        self.first_frame = mp3file.tell()
+        header = bytearray(mp3file.read(4))
+        key = (header[1] << 8) | header[2]
+        if (len(header) < 4) or (frame_lengths[key] == 0):
+            from audiotools.text import ERR_MP3_FRAME_NOT_FOUND
+            raise InvalidMP3(ERR_MP3_FRAME_NOT_FOUND)
+
+        self.header = key
+        self.sample_rate = MP3Audio.SAMPLE_RATE[(key >> 11) & 3][
+            (key >> 2) & 3]
+        self.channels = 1 if ((header[3] >> 6) == 3) else 2
+        self.pcm_frames_per_mpeg_frame = pcm_frames[key]
+
+        # frame counts and gapless info from an encoder's header frame
+        self.vbr_header = None
+        self.encoder_delay = 0
+        self.encoder_padding = 0
+        self.mpeg_frames = None
+
+        first_frame = bytes(header) + mp3file.read(frame_lengths[key] - 4)
+        self.__parse_vbr_header__(first_frame)
+
+        # a VBR header frame holds no audio
+        self.audio_start = (self.first_frame if (self.vbr_header is None)
+                            else (self.first_frame + len(first_frame)))
+
+        if self.mpeg_frames is None:
+            self.scan(mp3file)
+
+    def __parse_vbr_header__(self, frame):
+        """given the first MPEG frame as bytes
+        populates VBR header fields, if any"""
+
+        from struct import unpack
+
+        for tag in [b"Xing", b"Info"]:
+            # Xing/Info follows the side information
+            # whose size varies, so search for it
+            offset = frame.find(tag, 4, 4 + 2 + 32 + 4)
+            if offset == -1:
+                continue
+
+            self.vbr_header = tag.decode("ascii")
+            if (offset + 8) > len(frame):
+                return
+            (flags,) = unpack(">I", frame[offset + 4:offset + 8])
+            offset += 8
+            if flags & 0x1:
+                if (offset + 4) <= len(frame):
+                    (self.mpeg_frames,) = unpack(">I",
+                                                 frame[offset:offset + 4])
+                offset += 4
+            if flags & 0x2:
+                offset += 4    # stream bytes
+            if flags & 0x4:
+                offset += 100  # table of contents
+            if flags & 0x8:
+                offset += 4    # quality indicator
+
+            # LAME's extension follows
+            # with encoder delay and padding as two 12-bit fields
+            if ((frame[offset:offset + 4] in (b"LAME", b"Lavf", b"Lavc") and
+                 ((offset + 24) <= len(frame)))):
+                delay_padding = bytearray(frame[offset + 21:offset + 24])
+                self.encoder_delay = ((delay_padding[0] << 4) |
+                                      (delay_padding[1] >> 4))
+                self.encoder_padding = (((delay_padding[1] & 0xF) << 8) |
+                                        delay_padding[2])
+            return
+
+        # VBRI is always 32 bytes after the frame header
+        # and its delay isn't trimmed by decoders, so it's not kept
+        if ((frame[36:40] == b"VBRI") and (len(frame) >= 54)):
+            self.vbr_header = u"VBRI"
+            (delay,
+             stream_bytes,
+             self.mpeg_frames) = unpack(">2xHxxII", frame[40:54])
+
+    def scan(self, mp3file):
+        """scans mp3file for every audio frame
+        populating the MPEG frame count"""
+
+        (frame_lengths, pcm_frames) = self.TABLES
+        mask = FRAME_HEADER_MASK
+        header = self.header & mask
+
+        mpeg_frames = 0
+        position = self.audio_start
+        mp3file.seek(position, 0)
+        buffer = bytearray()
+        buffer_start = position
+        i = 0
+
+        while True:
+            if (i + 3) > len(buffer):
+                if i > len(buffer):
+                    # frame extends past the end of the buffer
+                    # so skip its remainder
+                    mp3file.seek(buffer_start + i, 0)
+                    buffer = bytearray()
+                else:
+                    buffer = buffer[i:]
+                buffer_start += i
+                i = 0
+                block = mp3file.read(SCAN_BLOCK_SIZE)
+                if len(block) == 0:
+                    break
+                buffer += bytearray(block)
+                continue
+
+            key = (buffer[i + 1] << 8) | buffer[i + 2]
+            if (buffer[i] != 0xFF) or ((key & mask) != header):
+                break
+            length = frame_lengths[key]
+            if length == 0:
+                break
+
+            mpeg_frames += 1
+            i += length
+
+        self.mpeg_frames = mpeg_frames
+
+    def total_pcm_frames(self):
+        """returns the total PCM frames of the stream
+
+        less any encoder delay and padding from a LAME header,
+        which decoders trim from their output"""
+
+        return max(self.mpeg_frames * self.pcm_frames_per_mpeg_frame -
+                   self.encoder_delay -
+                   self.encoder_padding, 0)
+
+
 class MP2Audio(MP3Audio):
     """an MP2 audio file"""
 
@@ -773,3 +876,39 @@ class MP2Audio(MP3Audio):
              "url": u"http://www.mpg123.org/"})
 
         messenger.info(ERR_PROGRAM_PACKAGE_MANAGER)
+
+
+def __file_type__(header, file):
+    from audiotools.bitstream import parse
+
+    # header is at least 32 bits, so no IOError is possible
+    (frame_sync,
+     mpeg_id,
+     layer_description,
+     protection,
+     bitrate,
+     sample_rate,
+     pad,
+     private,
+     channels,
+     mode_extension,
+     copy,
+     original,
+     emphasis) = parse("11u 2u 2u 1u 4u 2u 1u " +
+                       "1u 2u 2u 1u 1u 2u", False, header[0:4])
+    if ((frame_sync != 0x7FF) or
+        (mpeg_id != 3) or
+        (bitrate == 0xF) or
+        (sample_rate == 3) or
+        (emphasis == 2)):
+        # nothing else starts with an initial byte of 0xFF
+        # so the file is unknown
+        return None
+    elif layer_description == 1:
+        # MP3s are MPEG-1, Layer-III
+        return MP3Audio
+    elif layer_description == 2:
+        # MP2s are MPEG-1, Layer-II
+        return MP2Audio
+    else:
+        return None
@@ -163,3 +163,100 @@ def packets_to_pages(packets, bitstream_serial_number,
             page.append(segment)
 
     yield page
+
+
+# bytes read from the end of a file at a time
+# when searching backward for its last page
+TAIL_SCAN_BLOCK_SIZE = 65536
+
+# the size of an Ogg page header, not including its segment table
+PAGE_HEADER_SIZE = 27
+
+
+def last_page(file, bitstream_serial_number):
+    """given a seekable file object of an Ogg stream
+    and the serial number of its first logical bitstream,
+    returns (offset, Page) of the last valid page in the file
+    by searching backward from the end
+
+    returns None if no valid page is found
+    or the last page doesn't end the given bitstream,
+    as happens with chained or truncated streams"""
+
+    from io import BytesIO
+    from struct import unpack
+
+    file.seek(0, 2)
+    file_size = file.tell()
+    block_size = TAIL_SCAN_BLOCK_SIZE
+
+    while True:
+        block_start = max(file_size - block_size, 0)
+        file.seek(block_start, 0)
+        block = file.read(file_size - block_start)
+
+        offset = block.rfind(b"OggS")
+        while offset >= 0:
+            if len(block) - offset >= PAGE_HEADER_SIZE:
+                segment_count = ord(block[offset + 26:offset + 27])
+                segments = block[offset + PAGE_HEADER_SIZE:
+                                 offset + PAGE_HEADER_SIZE + segment_count]
+                page_size = (PAGE_HEADER_SIZE + segment_count +
+                             sum(bytearray(segments)))
+                if ((len(segments) == segment_count) and
+                    (offset + page_size <= len(block))):
+                    # let the page reader validate the page's checksum
+                    try:
+                        with PageReader(
+                            BytesIO(block[offset:
+                                          offset + page_size])) as reader:
+                            page = reader.read()
+                    except (IOError, ValueError):
+                        page = None
+
+                    if page is not None:
+                        if ((page.bitstream_serial_number ==
+                             bitstream_serial_number) and page.stream_end):
+                            return (block_start + offset, page)
+                        else:
+                            return None
+            offset = block.rfind(b"OggS", 0, offset)
+
+        if block_start == 0:
+            return None
+        else:
+            block_size *= 2
+
+
+def total_granule_position(filename, bitstream_serial_number):
+    """given the filename of an Ogg stream
+    and the serial number of its first logical bitstream,
+    returns the granule position at the end of that bitstream
+
+    this is taken from the stream's last page when possible
+    and falls back to reading every page of chained or damaged streams
+
+    returns 0 if the stream can't be read"""
+
+    try:
+        with open(filename, "rb") as f:
+            tail = last_page(f, bitstream_serial_number)
+    except IOError:
+        return 0
+
+    if (tail is not None) and (tail[1].granule_position >= 0):
+        return tail[1].granule_position
+
+    try:
+        with PageReader(open(filename, "rb")) as reader:
+            page = reader.read()
+            granule_position = page.granule_position
+
+            while not page.stream_end:
+                page = reader.read()
+                granule_position = max(granule_position,
+                                       page.granule_position)
+
+            return granule_position
+    except (IOError, ValueError):
+        return 0
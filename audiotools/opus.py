@@ -45,6 +45,7 @@ class OpusAudio(VorbisAudio):
         AudioFile.__init__(self, filename)
         self.__channels__ = 0
         self.__channel_mask__ = 0
+        self.__total_frames__ = None
 
         # get channel count and channel mask from first packet
         from audiotools.bitstream import BitstreamReader
@@ -141,20 +142,13 @@ class OpusAudio(VorbisAudio):
     def total_frames(self):
         """returns the total PCM frames of the track as an integer"""
 
-        from audiotools._ogg import PageReader
+        if self.__total_frames__ is None:
+            from audiotools.ogg import total_granule_position
 
-        try:
-            with PageReader(open(self.filename, "rb")) as reader:
-                page = reader.read()
-                pcm_samples = page.granule_position
-
-                while not page.stream_end:
-                    page = reader.read()
-                    pcm_samples = max(pcm_samples, page.granule_position)
+            self.__total_frames__ = total_granule_position(
+                self.filename, self.__serial_number__)
 
-                return pcm_samples
-        except (IOError, ValueError):
-            return 0
+        return self.__total_frames__
 
     def sample_rate(self):
         """returns the rate of the track's audio as an integer number of Hz"""
@@ -474,3 +468,8 @@ class OpusAudio(VorbisAudio):
              "url": "http://www.opus-codec.org/"})
 
         messenger.info(ERR_PROGRAM_PACKAGE_MANAGER)
+
+
+def __file_type__(header, file):
+    # the first Ogg page's packet is the identification header
+    return OpusAudio if (header[0x1C:0x26] == b"OpusHead\x01") else None
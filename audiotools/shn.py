@@ -592,12 +592,14 @@ class ShortenAudio(WaveContainer, AiffContainer):
             raise err
 
     def convert(self, target_path, target_class, compression=None,
-                progress=None):
+                progress=None, threaded=False):
         """encodes a new AudioFile from existing AudioFile
 
         take a filename string, target class and optional compression string
         encodes a new AudioFile in the target class and returns
         the resulting object
+        if threaded is True, decoding is performed in a background thread
+        alongside encoding
         may raise EncodingError if some problem occurs during encoding"""
 
         # A Shorten file cannot contain both RIFF and AIFF chunks
@@ -614,7 +616,8 @@ class ShortenAudio(WaveContainer, AiffContainer):
                                          target_path,
                                          target_class,
                                          compression,
-                                         progress)
+                                         progress,
+                                         threaded)
         elif (self.has_foreign_aiff_chunks() and
               hasattr(target_class, "from_aiff") and
               callable(target_class.from_aiff)):
@@ -622,10 +625,11 @@ class ShortenAudio(WaveContainer, AiffContainer):
                                          target_path,
                                          target_class,
                                          compression,
-                                         progress)
+                                         progress,
+                                         threaded)
         else:
             return target_class.from_pcm(
                 target_path,
-                to_pcm_progress(self, progress),
+                to_pcm_progress(self, progress, threaded),
                 compression,
                 total_pcm_frames=self.total_frames())
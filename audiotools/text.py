@@ -143,9 +143,16 @@ OPT_CUESHEET_TRACKVERIFY = \
     u"the cuesheet to verify disc image with AccurateRip"
 OPT_NO_SUMMARY = u"suppress summary output"
 OPT_ACCURATERIP = u"verify tracks against those of AccurateRip database"
+OPT_INCREMENTAL_TRACKVERIFY = \
+    u"skip tracks unchanged since they last verified successfully"
+OPT_MAX_AGE_TRACKVERIFY = \
+    u"skip only tracks which last verified within this many days"
+OPT_LEDGER_TRACKVERIFY = \
+    u"the file to record verified tracks in, instead of the file cache"
 OPT_SAMPLE_RATE = u"sample rate of output files, in Hz"
 OPT_CHANNELS = u"channel count of output files"
 OPT_BPS = u"bits-per-sample of output files"
+OPT_RESAMPLER_QUALITY = u"quality of resampling to a new sample rate"
 OPT_TRACKLINT_FIX = u"perform suggest fixes"
 OPT_TRACKTAG_COMMENT_FILE = u"a file containing comment text"
 OPT_TRACKTAG_REPLACE = u"completely replace all metadata"
@@ -233,6 +240,7 @@ LAB_OUTPUT_TYPE_DESCRIPTION = u"name"
 LAB_OUTPUT_QUALITY_DESCRIPTION = u"description"
 LAB_SUPPORTED_FIELDS = u"Supported fields are:"
 LAB_CD2TRACK_PROGRESS = u"track %(track_number)2.2d -> %(filename)s"
+LAB_CD2TRACK_READING = u"reading track %(track_number)2.2d"
 LAB_CD2TRACK_LOG = u"Rip log : "
 LAB_CD2TRACK_APPLY = u"extract tracks"
 LAB_ACCURATERIP_CHECKSUM = u"checksum"
@@ -361,6 +369,7 @@ LAB_TRACKVERIFY_AR_CHECKSUM = u"Checksum"
 LAB_TRACKVERIFY_AR_OFFSET = u"Offset"
 LAB_TRACKVERIFY_AR_CONFIDENCE = u"Confidence"
 LAB_TRACKVERIFY_AR_CONF = u"Conf."
+LAB_TRACKVERIFY_SKIPPED = u"%d unchanged tracks skipped"
 LAB_TRACKTAG_UPDATING = u"updating tracks"
 LAB_TRACKTAG_UPDATED = u"%d tracks updated"
 LAB_TRACKTAG_UPDATED_1 = u"1 track updated"
@@ -469,6 +478,9 @@ COMP_FLAC_0 = u"least compresson, fastest compression speed"
 COMP_FLAC_8 = u"most compression, slowest compression speed"
 COMP_NERO_LOW = u"lowest quality, corresponds to neroAacEnc -q 0.4"
 COMP_NERO_HIGH = u"highest quality, corresponds to neroAacEnc -q 1"
+COMP_FDK_AAC_1 = u"lowest quality, smallest files"
+COMP_FDK_AAC_5 = u"highest quality, largest files"
+COMP_FDK_AAC_FAAC = u"faac quality, encoded at %(mode)s"
 COMP_LAME_0 = u"high quality, larger files, corresponds to lame's -V0"
 COMP_LAME_6 = u"lower quality, smaller files, corresponds to lame's -V6"
 COMP_LAME_MEDIUM = u"corresponds to lame's --preset medium"
@@ -598,6 +610,9 @@ ERR_M4A_MISSING_MDHD = u"required mdhd atom not found"
 ERR_M4A_UNSUPPORTED_MDHD = u"unsupported mdhd version"
 ERR_M4A_INVALID_MDHD = u"invalid mdhd atom"
 ERR_M4A_INVALID_LEAF_ATOMS = u"leaf atoms must be a list"
+ERR_M4A_INVALID_ATOM = u"invalid atom"
+ERR_M4A_INVALID_ESDS = u"invalid esds atom"
+ERR_M4A_MISSING_MOOV = u"required moov atom not found"
 ERR_ALAC_IOERROR = u"I/O error opening ALAC file"
 ERR_ALAC_INVALID_ALAC = u"invalid alac atom"
 ERR_MP3_FRAME_NOT_FOUND = u"MP3 frame not found"
@@ -673,6 +688,8 @@ ERR_TRACKCMP_TYPE_MISMATCH = u"both files to be compared must be audio files"
 ERR_TRACKSPLIT_NO_CUESHEET = u"you must specify a cuesheet to split audio file"
 ERR_TRACKSPLIT_OVERLONG_CUESHEET = u"cuesheet too long for track being split"
 ERR_TRACKVERIFY = u"not from a CD"
+ERR_TRACKVERIFY_NO_LEDGER = \
+    u"skipping verified tracks requires --ledger or a file cache"
 ERR_RENAME = u"unable to rename \"%(source)s\" to \"%(target)s\""
 ERR_INVALID_IMAGE = u"%(filename)s: %(message)s"
 ERR_TRACKTAG_COMMENT_NOT_UTF8 = \
@@ -683,6 +700,7 @@ ERR_OUTPUT_OUTPUTS_ARE_INPUT = \
     u"output tracks must have different names than input tracks"
 ERR_OUTPUT_INVALID_FORMAT = u"output tracks must have valid format string"
 ERR_CANCELLED = u"cancelled"
+ERR_WORKER_EXITED = u"worker process exited during job with status %s"
 
 # Cleaning messages
 CLEAN_REMOVE_DUPLICATE_TAG = u"removed duplicate tag %(field)s"
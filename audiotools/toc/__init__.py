@@ -612,29 +612,49 @@ def read_tocfile_string(tocfile):
 
     raises SheetException if some error occurs parsing the file"""
 
-    import audiotools.ply.lex as lex
-    import audiotools.ply.yacc as yacc
-    from audiotools.ply.yacc import NullLogger
-    import audiotools.toc.tokrules
-    import audiotools.toc.yaccrules
     from sys import version_info
 
     str_type = str if (version_info[0] >= 3) else unicode
 
     assert(isinstance(tocfile, str_type))
 
-    lexer = lex.lex(module=audiotools.toc.tokrules)
+    (lexer, parser) = __parser__()
+    lexer = lexer.clone()
     lexer.input(tocfile)
-    parser = yacc.yacc(module=audiotools.toc.yaccrules,
-                       debug=0,
-                       errorlog=NullLogger(),
-                       write_tables=0)
     try:
         return parser.parse(lexer=lexer)
     except ValueError as err:
         raise SheetException(str(err))
 
 
+def __parser__():
+    """returns a (lexer, parser) tuple for .toc files
+
+    since building the lexer and LALR parsing tables is far slower
+    than parsing a typical sheet, both are built on first use
+    and reused for the rest of the process
+    with each parse operating on its own clone of the lexer"""
+
+    global __parser_cache__
+
+    if __parser_cache__ is None:
+        import audiotools.ply.lex as lex
+        import audiotools.ply.yacc as yacc
+        from audiotools.ply.yacc import NullLogger
+        import audiotools.toc.tokrules
+        import audiotools.toc.yaccrules
+
+        __parser_cache__ = (
+            lex.lex(module=audiotools.toc.tokrules),
+            yacc.yacc(module=audiotools.toc.yaccrules,
+                      debug=0,
+                      errorlog=NullLogger(),
+                      write_tables=0))
+    return __parser_cache__
+
+__parser_cache__ = None
+
+
 def write_tocfile(sheet, filename, file):
     """given a Sheet object and filename unicode string,
     writes a .toc file to the given file object"""
@@ -254,7 +254,8 @@ class TrueAudio(AudioFile, ApeGainedAudio):
 
                 # transfer TTA frames from temporary space to disk
                 frames.seek(0, 0)
-                transfer_data(frames.read, writer.write_bytes)
+                writer.flush()
+                transfer_data(frames.read, file.write)
                 frames.close()
         finally:
             counter.close()
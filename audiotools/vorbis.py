@@ -42,6 +42,7 @@ class VorbisAudio(AudioFile):
         AudioFile.__init__(self, filename)
         self.__sample_rate__ = 0
         self.__channels__ = 0
+        self.__total_frames__ = None
         try:
             self.__read_identification__()
         except IOError as msg:
@@ -156,26 +157,24 @@ class VorbisAudio(AudioFile):
     def total_frames(self):
         """returns the total PCM frames of the track as an integer"""
 
-        from audiotools._ogg import PageReader
+        if self.__total_frames__ is None:
+            from audiotools.ogg import total_granule_position
 
-        try:
-            with PageReader(open(self.filename, "rb")) as reader:
-                page = reader.read()
-                pcm_samples = page.granule_position
-
-                while not page.stream_end:
-                    page = reader.read()
-                    pcm_samples = max(pcm_samples, page.granule_position)
+            self.__total_frames__ = total_granule_position(
+                self.filename, self.__serial_number__)
 
-                return pcm_samples
-        except (IOError, ValueError):
-            return 0
+        return self.__total_frames__
 
     def sample_rate(self):
         """returns the rate of the track's audio as an integer number of Hz"""
 
         return self.__sample_rate__
 
+    def seekable(self):
+        """returns True if the file is seekable"""
+
+        return True
+
     def to_pcm(self):
         """returns a PCMReader object containing the track's PCM data"""
 
@@ -564,3 +563,8 @@ class VorbisChannelMask(ChannelMask):
                     "back_left", "back_right", "low_frequency"]
         else:
             return []
+
+
+def __file_type__(header, file):
+    # the first Ogg page's packet is the identification header
+    return VorbisAudio if (header[0x1C:0x23] == b"\x01vorbis") else None
@@ -129,8 +129,11 @@ class RIFF_File_Chunk(RIFF_Chunk):
 
         f.write(self.id)
         f.write(struct.pack("<I", self.__size__))
+        from audiotools import __copy_file_data__
+
         self.__wav_file__.seek(self.__offset__)
-        to_write = self.__size__
+        to_write = self.__size__ - __copy_file_data__(
+            self.__wav_file__.read, f.write, self.__size__)
         while to_write > 0:
             s = self.__wav_file__.read(min(0x100000, to_write))
             f.write(s)
@@ -1136,3 +1139,7 @@ class WaveAudio(WaveContainer):
             WaveAudio.wave_from_chunks(output_filename, chunk_queue)
 
         return fixes_performed
+
+
+def __file_type__(header, file):
+    return WaveAudio if (header[8:12] == b"WAVE") else None
@@ -16,7 +16,7 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
 
 
-from audiotools import WaveContainer, InvalidFile
+from audiotools import (WaveContainer, InvalidFile)
 from audiotools.ape import ApeTaggedAudio, ApeGainedAudio
 
 
@@ -58,6 +58,7 @@ LIBRARY_URLS = {"libcdio_paranoia": "http://www.gnu.org/software/libcdio/",
                 "vorbisfile": "http://xiph.org",
                 "opusfile": "http://www.opus-codec.org",
                 "opus": "http://www.opus-codec.org",
+                "fdk-aac": "http://sourceforge.net/projects/opencore-amr/",
                 "mp3lame": "http://lame.sourceforge.net",
                 "twolame": "http://twolame.sourceforge.net",
                 "vorbisenc": "http://www.xiph.org",
@@ -673,6 +674,24 @@ class audiotools_decoders(Extension):
                                               "Opus decoding",
                                               False))
 
+        if system_libraries.present("fdk-aac"):
+            if system_libraries.guaranteed_present("fdk-aac"):
+                libraries.add("fdk-aac")
+            else:
+                extra_compile_args.extend(
+                    system_libraries.extra_compile_args("fdk-aac"))
+                extra_link_args.extend(
+                    system_libraries.extra_link_args("fdk-aac"))
+            defines.append(("HAS_AAC", None))
+            sources.append("src/decoders/aac.c")
+            self.__library_manifest__.append(("fdk-aac",
+                                              "AAC decoding",
+                                              True))
+        else:
+            self.__library_manifest__.append(("fdk-aac",
+                                              "AAC decoding",
+                                              False))
+
         Extension.__init__(self,
                            "audiotools.decoders",
                            sources=sources,
@@ -789,6 +808,24 @@ class audiotools_encoders(Extension):
                                               "Opus encoding",
                                               False))
 
+        if system_libraries.present("fdk-aac"):
+            if system_libraries.guaranteed_present("fdk-aac"):
+                libraries.add("fdk-aac")
+            else:
+                extra_compile_args.extend(
+                    system_libraries.extra_compile_args("fdk-aac"))
+                extra_link_args.extend(
+                    system_libraries.extra_link_args("fdk-aac"))
+            defines.append(("HAS_AAC", None))
+            sources.append("src/encoders/aac.c")
+            self.__library_manifest__.append(("fdk-aac",
+                                              "AAC encoding",
+                                              True))
+        else:
+            self.__library_manifest__.append(("fdk-aac",
+                                              "AAC encoding",
+                                              False))
+
         Extension.__init__(self,
                            "audiotools.encoders",
                            sources=sources,
@@ -829,6 +866,13 @@ class audiotools_ogg(Extension):
                            define_macros=[("HAS_PYTHON", None)])
 
 
+class audiotools_mpeg(Extension):
+    def __init__(self):
+        Extension.__init__(self,
+                           "audiotools._mpeg",
+                           sources=["src/mod_mpeg.c"])
+
+
 class audiotools_accuraterip(Extension):
     def __init__(self):
         Extension.__init__(self,
@@ -922,6 +966,7 @@ ext_modules = [audiotools_pcm(),
                audiotools_encoders(system_libraries),
                audiotools_bitstream(),
                audiotools_ogg(),
+               audiotools_mpeg(),
                audiotools_accuraterip(),
                audiotools_output(system_libraries)]
 
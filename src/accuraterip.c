@@ -86,6 +86,8 @@ Checksum_init(accuraterip_Checksum *self, PyObject *args, PyObject *kwds)
     self->accuraterip_v1.checksums = NULL;
     self->accuraterip_v1.initial_values = NULL;
     self->accuraterip_v1.final_values = NULL;
+    self->values = NULL;
+    self->values_size = 0;
     self->framelist_class = NULL;
 
     if (!PyArg_ParseTupleAndKeywords(args, kwds, "i|iiiii", kwlist,
@@ -170,6 +172,7 @@ Checksum_dealloc(accuraterip_Checksum *self)
     free(self->accuraterip_v1.checksums);
     free_queue(self->accuraterip_v1.initial_values);
     free_queue(self->accuraterip_v1.final_values);
+    free(self->values);
 
     Py_XDECREF(self->framelist_class);
 
@@ -217,53 +220,97 @@ Checksum_update(accuraterip_Checksum* self, PyObject *args)
         return NULL;
     }
 
-    /*update checksum values*/
+    /*convert the whole FrameList to checksum values at once*/
+    if (framelist->frames > self->values_size) {
+        uint32_t *values = realloc(self->values,
+                                   framelist->frames * sizeof(uint32_t));
+        if (values == NULL) {
+            return PyErr_NoMemory();
+        }
+        self->values = values;
+        self->values_size = framelist->frames;
+    }
     for (i = 0; i < framelist->frames; i++) {
-        const unsigned v = value(framelist->samples[i * channels],
-                                 framelist->samples[i * channels + 1]);
-        update_frame_v1(&(self->accuraterip_v1),
-                        self->total_pcm_frames,
-                        self->start_offset,
-                        self->end_offset,
-                        v);
-        update_frame_v2(&(self->accuraterip_v2),
-                        self->total_pcm_frames,
-                        self->start_offset,
-                        self->end_offset,
-                        v);
+        self->values[i] = value(framelist->samples[i * channels],
+                                framelist->samples[i * channels + 1]);
     }
 
+    /*then update checksums from those values*/
+    update_values_v1(&(self->accuraterip_v1),
+                     self->total_pcm_frames,
+                     self->start_offset,
+                     self->end_offset,
+                     self->values,
+                     framelist->frames);
+    update_values_v2(&(self->accuraterip_v2),
+                     self->start_offset,
+                     self->end_offset,
+                     self->values,
+                     framelist->frames);
+
     self->processed_frames += framelist->frames;
 
     Py_INCREF(Py_None);
     return Py_None;
 }
 
+static inline unsigned
+max_(unsigned x, unsigned y)
+{
+    return (x > y) ? x : y;
+}
+
+static inline unsigned
+min_(unsigned x, unsigned y)
+{
+    return (x < y) ? x : y;
+}
+
 static void
-update_frame_v1(struct accuraterip_v1 *v1,
-                unsigned total_pcm_frames,
-                unsigned start_offset,
-                unsigned end_offset,
-                unsigned value)
+update_values_v1(struct accuraterip_v1 *v1,
+                 unsigned total_pcm_frames,
+                 unsigned start_offset,
+                 unsigned end_offset,
+                 const uint32_t *values,
+                 unsigned count)
 {
+    /*indexes of the first and one past the last value, starting from 1*/
+    const unsigned first = v1->index;
+    const unsigned last = first + count;
+    unsigned index;
+
+    /*rather than test every value against every offset,
+      each part of the calculation walks only the span of indexes
+      it applies to*/
+
     /*calculate initial checksum*/
-    if ((v1->index >= start_offset) && (v1->index <= end_offset)) {
-        v1->checksums[0] += (value * v1->index);
+    for (index = max_(first, start_offset);
+         index < min_(last, end_offset + 1);
+         index++) {
+        const uint32_t value = values[index - first];
+        v1->checksums[0] += (value * index);
         v1->values_sum += value;
     }
 
     /*store the first (pcm_frame_range - 1) values in initial_values*/
-    if ((v1->index >= start_offset) && (!queue_full(v1->initial_values))) {
-        queue_push(v1->initial_values, value);
+    for (index = max_(first, start_offset);
+         (index < last) && (!queue_full(v1->initial_values));
+         index++) {
+        queue_push(v1->initial_values, values[index - first]);
     }
 
     /*store the trailing (pcm_frame_range - 1) values in final_values*/
-    if ((v1->index > end_offset) && (!queue_full(v1->final_values))) {
-        queue_push(v1->final_values, value);
+    for (index = max_(first, end_offset + 1);
+         (index < last) && (!queue_full(v1->final_values));
+         index++) {
+        queue_push(v1->final_values, values[index - first]);
     }
 
-    /*calculate incremental checksums*/
-    if (v1->index > total_pcm_frames) {
+    /*calculate incremental checksums,
+      each of which needs only the previous checksum,
+      the running sum of values in the window
+      and the values entering and leaving it*/
+    for (index = max_(first, total_pcm_frames + 1); index < last; index++) {
         const uint32_t initial_value = queue_pop(v1->initial_values);
 
         const uint32_t final_value = queue_pop(v1->final_values);
@@ -274,8 +321,8 @@ update_frame_v1(struct accuraterip_v1 *v1,
         const uint32_t final_value_product =
             (uint32_t)end_offset * final_value;
 
-        v1->checksums[v1->index - total_pcm_frames] =
-            v1->checksums[v1->index - total_pcm_frames - 1] +
+        v1->checksums[index - total_pcm_frames] =
+            v1->checksums[index - total_pcm_frames - 1] +
             final_value_product -
             v1->values_sum -
             initial_value_product;
@@ -284,25 +331,38 @@ update_frame_v1(struct accuraterip_v1 *v1,
         v1->values_sum += final_value;
     }
 
-    v1->index++;
+    v1->index = last;
 }
 
 static void
-update_frame_v2(struct accuraterip_v2 *v2,
-                unsigned total_pcm_frames,
-                unsigned start_offset,
-                unsigned end_offset,
-                unsigned value)
+update_values_v2(struct accuraterip_v2 *v2,
+                 unsigned start_offset,
+                 unsigned end_offset,
+                 const uint32_t *values,
+                 unsigned count)
 {
-    if (!v2->current_offset) {
-        if ((v2->index >= start_offset) && (v2->index <= end_offset)) {
-            const uint64_t v_i = ((uint64_t)value * (uint64_t)(v2->index));
-            v2->checksum += (uint32_t)(v_i >> 32);
-        }
-        v2->index++;
-    } else {
-        v2->current_offset--;
+    /*skip values prior to the V2 checksum's window*/
+    const unsigned skip = min_(v2->current_offset, count);
+    unsigned first;
+    unsigned last;
+    unsigned index;
+
+    v2->current_offset -= skip;
+    values += skip;
+    count -= skip;
+
+    first = v2->index;
+    last = first + count;
+
+    for (index = max_(first, start_offset);
+         index < min_(last, end_offset + 1);
+         index++) {
+        const uint64_t v_i = ((uint64_t)values[index - first] *
+                              (uint64_t)index);
+        v2->checksum += (uint32_t)(v_i >> 32);
     }
+
+    v2->index = last;
 }
 
 static PyObject*
@@ -65,6 +65,10 @@ typedef struct {
     struct accuraterip_v1 accuraterip_v1;
     struct accuraterip_v2 accuraterip_v2;
 
+    /*FrameList samples converted to checksum values*/
+    uint32_t *values;
+    unsigned values_size;
+
     PyObject* framelist_class;
 } accuraterip_Checksum;
 
@@ -80,19 +84,23 @@ Checksum_dealloc(accuraterip_Checksum *self);
 static PyObject*
 Checksum_update(accuraterip_Checksum* self, PyObject *args);
 
+/*updates the V1 checksums from an array of "count" values
+  whose first value is at v1->index*/
 static void
-update_frame_v1(struct accuraterip_v1 *v1,
-                unsigned total_pcm_frames,
-                unsigned start_offset,
-                unsigned end_offset,
-                unsigned value);
-
+update_values_v1(struct accuraterip_v1 *v1,
+                 unsigned total_pcm_frames,
+                 unsigned start_offset,
+                 unsigned end_offset,
+                 const uint32_t *values,
+                 unsigned count);
+
+/*updates the V2 checksum from an array of "count" values*/
 static void
-update_frame_v2(struct accuraterip_v2 *v2,
-                unsigned total_pcm_frames,
-                unsigned start_offset,
-                unsigned end_offset,
-                unsigned value);
+update_values_v2(struct accuraterip_v2 *v2,
+                 unsigned start_offset,
+                 unsigned end_offset,
+                 const uint32_t *values,
+                 unsigned count);
 
 static struct queue*
 init_queue(unsigned total_size);
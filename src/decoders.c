@@ -38,6 +38,9 @@ extern PyTypeObject decoders_MP3DecoderType;
 #ifdef HAS_OPUS
 extern PyTypeObject decoders_OpusDecoderType;
 #endif
+#ifdef HAS_AAC
+extern PyTypeObject decoders_AACDecoderType;
+#endif
 extern PyTypeObject decoders_TTADecoderType;
 extern PyTypeObject decoders_Sine_Mono_Type;
 extern PyTypeObject decoders_Sine_Stereo_Type;
@@ -88,6 +91,12 @@ MOD_INIT(decoders)
         return MOD_ERROR_VAL;
     #endif
 
+    #ifdef HAS_AAC
+    decoders_AACDecoderType.tp_new = PyType_GenericNew;
+    if (PyType_Ready(&decoders_AACDecoderType) < 0)
+        return MOD_ERROR_VAL;
+    #endif
+
     decoders_TTADecoderType.tp_new = PyType_GenericNew;
     if (PyType_Ready(&decoders_TTADecoderType) < 0)
         return MOD_ERROR_VAL;
@@ -146,6 +155,12 @@ MOD_INIT(decoders)
                        (PyObject *)&decoders_OpusDecoderType);
     #endif
 
+    #ifdef HAS_AAC
+    Py_INCREF(&decoders_AACDecoderType);
+    PyModule_AddObject(m, "AACDecoder",
+                       (PyObject *)&decoders_AACDecoderType);
+    #endif
+
     Py_INCREF(&decoders_TTADecoderType);
     PyModule_AddObject(m, "TTADecoder",
                        (PyObject *)&decoders_TTADecoderType);
@@ -0,0 +1,464 @@
+#include "aac.h"
+#include "../framelist.h"
+
+/********************************************************
+ Audio Tools, a module and set of tools for manipulating audio data
+ Copyright (C) 2007-2015  Brian Langenberger
+
+ This program is free software; you can redistribute it and/or modify
+ it under the terms of the GNU General Public License as published by
+ the Free Software Foundation; either version 2 of the License, or
+ (at your option) any later version.
+
+ This program is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU General Public License for more details.
+
+ You should have received a copy of the GNU General Public License
+ along with this program; if not, write to the Free Software
+ Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+*******************************************************/
+
+static PyObject*
+AACDecoder_new(PyTypeObject *type,
+               PyObject *args, PyObject *kwds)
+{
+    decoders_AACDecoder *self;
+
+    self = (decoders_AACDecoder *)type->tp_alloc(type, 0);
+
+    return (PyObject *)self;
+}
+
+int
+AACDecoder_init(decoders_AACDecoder *self,
+                PyObject *args, PyObject *kwds)
+{
+    char *filename;
+    const char *config;
+#ifdef PY_SSIZE_T_CLEAN
+    Py_ssize_t config_len;
+#else
+    int config_len;
+#endif
+    PyObject *frames;
+    PyObject *frames_seq;
+    UCHAR *config_buffer[1];
+    UINT config_size[1];
+    unsigned i;
+    int frame_size;
+
+    self->file = NULL;
+    self->decoder = NULL;
+    self->frame_count = 0;
+    self->frame_offsets = NULL;
+    self->frame_sizes = NULL;
+    self->next_frame = 0;
+    self->frame_data = NULL;
+    self->frame_data_size = 0;
+    self->pcm = NULL;
+    self->pcm_frames_start = 0;
+    self->pcm_frames_remaining = 0;
+    self->audiotools_pcm = NULL;
+    self->channels = NULL;
+    self->closed = 0;
+
+    /*the M4A container is parsed on the Python side
+      which passes in the track's AudioSpecificConfig,
+      a list of (file offset, byte size) tuples, one per access unit,
+      the number of encoder delay PCM frames to discard
+      and the total number of PCM frames to return*/
+    if (!PyArg_ParseTuple(args, "ss#OLL",
+                          &filename,
+                          &config,
+                          &config_len,
+                          &frames,
+                          &(self->encoder_delay),
+                          &(self->total_pcm_frames)))
+        return -1;
+
+    if (self->encoder_delay < 0) {
+        PyErr_SetString(PyExc_ValueError, "encoder delay must be >= 0");
+        return -1;
+    }
+    if (self->total_pcm_frames < 0) {
+        PyErr_SetString(PyExc_ValueError, "total PCM frames must be >= 0");
+        return -1;
+    }
+
+    self->skip_pcm_frames = self->encoder_delay;
+    self->remaining_pcm_frames = self->total_pcm_frames;
+
+    /*convert frames list to offset and size arrays*/
+    if ((frames_seq = PySequence_Fast(frames,
+                                      "frames must be a sequence")) == NULL)
+        return -1;
+
+    self->frame_count = (unsigned)PySequence_Fast_GET_SIZE(frames_seq);
+    self->frame_offsets = malloc(sizeof(long long) * (self->frame_count + 1));
+    self->frame_sizes = malloc(sizeof(unsigned) * (self->frame_count + 1));
+    for (i = 0; i < self->frame_count; i++) {
+        if (!PyArg_ParseTuple(PySequence_Fast_GET_ITEM(frames_seq, i),
+                              "LI",
+                              &(self->frame_offsets[i]),
+                              &(self->frame_sizes[i]))) {
+            Py_DECREF(frames_seq);
+            return -1;
+        }
+        if (self->frame_sizes[i] > self->frame_data_size) {
+            self->frame_data_size = self->frame_sizes[i];
+        }
+    }
+    Py_DECREF(frames_seq);
+
+    self->frame_data = malloc(self->frame_data_size + 1);
+    self->pcm = malloc(sizeof(INT_PCM) * AAC_PCM_BUFFER_SIZE);
+
+    if ((self->file = fopen(filename, "rb")) == NULL) {
+        PyErr_SetFromErrnoWithFilename(PyExc_IOError, filename);
+        return -1;
+    }
+
+    /*initialize decoder for raw access units
+      configured from the track's AudioSpecificConfig*/
+    if ((self->decoder = aacDecoder_Open(TT_MP4_RAW, 1)) == NULL) {
+        PyErr_SetString(PyExc_ValueError, "error initializing AAC decoder");
+        return -1;
+    }
+
+    config_buffer[0] = (UCHAR*)config;
+    config_size[0] = (UINT)config_len;
+    if (aacDecoder_ConfigRaw(self->decoder,
+                             config_buffer,
+                             config_size) != AAC_DEC_OK) {
+        PyErr_SetString(PyExc_ValueError, "invalid AudioSpecificConfig");
+        return -1;
+    }
+
+    /*the configuration fixes the output's stream parameters
+      though they're only reliable after the first frame is decoded*/
+    self->sample_rate =
+        aacDecoder_GetStreamInfo(self->decoder)->aacSampleRate;
+    self->channel_count =
+        aacDecoder_GetStreamInfo(self->decoder)->channelConfig;
+    self->frame_size = 1024;
+
+    if ((frame_size = AACDecoder_decode_frame(self)) < 0) {
+        return -1;
+    } else {
+        self->pcm_frames_start = 0;
+        self->pcm_frames_remaining = frame_size;
+    }
+
+    if ((self->audiotools_pcm = open_audiotools_pcm()) == NULL)
+        return -1;
+
+    self->channels = aa_int_new();
+
+    return 0;
+}
+
+void
+AACDecoder_dealloc(decoders_AACDecoder *self)
+{
+    if (self->decoder != NULL)
+        aacDecoder_Close(self->decoder);
+
+    if (self->file != NULL)
+        fclose(self->file);
+
+    free(self->frame_offsets);
+    free(self->frame_sizes);
+    free(self->frame_data);
+    free(self->pcm);
+
+    Py_XDECREF(self->audiotools_pcm);
+
+    if (self->channels != NULL)
+        self->channels->del(self->channels);
+
+    Py_TYPE(self)->tp_free((PyObject*)self);
+}
+
+static PyObject*
+AACDecoder_sample_rate(decoders_AACDecoder *self, void *closure)
+{
+    return Py_BuildValue("i", self->sample_rate);
+}
+
+static PyObject*
+AACDecoder_bits_per_sample(decoders_AACDecoder *self, void *closure)
+{
+    /*always 16 bps*/
+    const int bits_per_sample = 16;
+
+    return Py_BuildValue("i", bits_per_sample);
+}
+
+static PyObject*
+AACDecoder_channels(decoders_AACDecoder *self, void *closure)
+{
+    return Py_BuildValue("i", self->channel_count);
+}
+
+static PyObject*
+AACDecoder_channel_mask(decoders_AACDecoder *self, void *closure)
+{
+    /*use same channel assignment as M4AAudio.channel_mask()*/
+    int channel_mask;
+
+    enum {
+        fL  = 0x1,
+        fR  = 0x2,
+        fC  = 0x4,
+        LFE = 0x8,
+        bL  = 0x10,
+        bR  = 0x20
+    };
+
+    switch (self->channel_count) {
+    case 1:
+        /*fC*/
+        channel_mask = fC;
+        break;
+    case 2:
+        /*fL fR*/
+        channel_mask = fL | fR;
+        break;
+    case 3:
+        /*fL fR fC*/
+        channel_mask = fL | fR | fC;
+        break;
+    case 4:
+        /*fL fR bL bR*/
+        channel_mask = fL | fR | bL | bR;
+        break;
+    case 5:
+        /*fL fR fC bL bR*/
+        channel_mask = fL | fR | fC | bL | bR;
+        break;
+    case 6:
+        /*fL fR fC LFE bL bR*/
+        channel_mask = fL | fR | fC | LFE | bL | bR;
+        break;
+    default:
+        /*undefined*/
+        channel_mask = 0x0;
+        break;
+    }
+
+    return Py_BuildValue("i", channel_mask);
+}
+
+static int
+AACDecoder_decode_frame(decoders_AACDecoder *self)
+{
+    unsigned frame_size;
+    UCHAR *buffer[1];
+    UINT buffer_size[1];
+    UINT bytes_valid;
+    CStreamInfo *info;
+
+    if (self->next_frame >= self->frame_count) {
+        return 0;
+    } else {
+        frame_size = self->frame_sizes[self->next_frame];
+    }
+
+    /*read the next raw access unit from disk*/
+    if (fseek(self->file,
+              (long)self->frame_offsets[self->next_frame],
+              SEEK_SET)) {
+        PyErr_SetFromErrno(PyExc_IOError);
+        return -1;
+    }
+    if (fread(self->frame_data, 1, frame_size, self->file) != frame_size) {
+        PyErr_SetString(PyExc_IOError, "I/O error reading AAC frame");
+        return -1;
+    }
+
+    buffer[0] = self->frame_data;
+    buffer_size[0] = frame_size;
+    bytes_valid = frame_size;
+    if (aacDecoder_Fill(self->decoder,
+                        buffer,
+                        buffer_size,
+                        &bytes_valid) != AAC_DEC_OK) {
+        PyErr_SetString(PyExc_ValueError, "error filling AAC decoder");
+        return -1;
+    }
+
+    /*the buffer size is given in samples
+      which is no larger than its size in bytes
+      should the library take it to mean the latter*/
+    if (aacDecoder_DecodeFrame(self->decoder,
+                               self->pcm,
+                               AAC_PCM_BUFFER_SIZE,
+                               0) != AAC_DEC_OK) {
+        PyErr_SetString(PyExc_ValueError, "error decoding AAC frame");
+        return -1;
+    }
+
+    self->next_frame++;
+
+    info = aacDecoder_GetStreamInfo(self->decoder);
+    self->sample_rate = info->sampleRate;
+    self->channel_count = info->numChannels;
+    self->frame_size = info->frameSize;
+
+    return info->frameSize;
+}
+
+static PyObject*
+AACDecoder_read(decoders_AACDecoder* self, PyObject *args)
+{
+    aa_int *channels = self->channels;
+
+    if (self->closed) {
+        PyErr_SetString(PyExc_ValueError, "stream is closed");
+        return NULL;
+    }
+
+    channels->reset(channels);
+
+    while (self->remaining_pcm_frames > 0) {
+        int skipped;
+        int pcm_frames;
+        int c;
+
+        if (self->pcm_frames_remaining == 0) {
+            /*decode next access unit*/
+            const int frame_size = AACDecoder_decode_frame(self);
+            if (frame_size < 0) {
+                return NULL;
+            } else if (frame_size == 0) {
+                /*stream ends short of its total length*/
+                self->remaining_pcm_frames = 0;
+                break;
+            } else {
+                self->pcm_frames_start = 0;
+                self->pcm_frames_remaining = frame_size;
+            }
+        }
+
+        /*drop encoder delay from the start of the stream*/
+        skipped = (int)(self->skip_pcm_frames < self->pcm_frames_remaining ?
+                        self->skip_pcm_frames :
+                        self->pcm_frames_remaining);
+        self->skip_pcm_frames -= skipped;
+        self->pcm_frames_start += skipped;
+        self->pcm_frames_remaining -= skipped;
+        if (self->pcm_frames_remaining == 0) {
+            continue;
+        }
+
+        /*and padding from the end of the stream*/
+        pcm_frames = (int)(self->remaining_pcm_frames <
+                           self->pcm_frames_remaining ?
+                           self->remaining_pcm_frames :
+                           self->pcm_frames_remaining);
+
+        /*split interleaved buffer by channel*/
+        for (c = 0; c < self->channel_count; c++) {
+            a_int *channel = channels->append(channels);
+            const INT_PCM *pcm = self->pcm +
+                (self->pcm_frames_start * self->channel_count) + c;
+            int i;
+
+            channel->resize(channel, pcm_frames);
+            for (i = 0; i < pcm_frames; i++) {
+                a_append(channel, pcm[i * self->channel_count]);
+            }
+        }
+
+        self->pcm_frames_start += pcm_frames;
+        self->pcm_frames_remaining -= pcm_frames;
+        self->remaining_pcm_frames -= pcm_frames;
+
+        return aa_int_to_FrameList(self->audiotools_pcm,
+                                   channels,
+                                   16);
+    }
+
+    /*return empty FrameList at end of stream*/
+    {
+        int c;
+        for (c = 0; c < self->channel_count; c++) {
+            channels->append(channels);
+        }
+    }
+
+    return aa_int_to_FrameList(self->audiotools_pcm,
+                               channels,
+                               16);
+}
+
+static PyObject*
+AACDecoder_seek(decoders_AACDecoder* self, PyObject *args)
+{
+    long long seeked_offset;
+    long long stream_offset;
+    unsigned frame;
+
+    if (self->closed) {
+        PyErr_SetString(PyExc_ValueError, "cannot seek closed stream");
+        return NULL;
+    }
+
+    if (!PyArg_ParseTuple(args, "L", &seeked_offset))
+        return NULL;
+
+    if (seeked_offset < 0) {
+        PyErr_SetString(PyExc_ValueError, "cannot seek to negative value");
+        return NULL;
+    }
+
+    /*don't seek past the end of the stream*/
+    if (seeked_offset > self->total_pcm_frames)
+        seeked_offset = self->total_pcm_frames;
+
+    /*every access unit decodes to the same number of PCM frames
+      but overlaps the one before it,
+      so start decoding one access unit early
+      and discard PCM frames up to the requested one*/
+    stream_offset = seeked_offset + self->encoder_delay;
+    frame = (unsigned)(stream_offset / self->frame_size);
+    if (frame > 0)
+        frame--;
+    if (frame > self->frame_count)
+        frame = self->frame_count;
+
+    aacDecoder_SetParam(self->decoder, AAC_TPDEC_CLEAR_BUFFER, 1);
+    self->next_frame = frame;
+    self->pcm_frames_start = 0;
+    self->pcm_frames_remaining = 0;
+    self->skip_pcm_frames =
+        stream_offset - ((long long)frame * self->frame_size);
+    self->remaining_pcm_frames = self->total_pcm_frames - seeked_offset;
+
+    return Py_BuildValue("L", seeked_offset);
+}
+
+static PyObject*
+AACDecoder_close(decoders_AACDecoder* self, PyObject *args)
+{
+    self->closed = 1;
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject*
+AACDecoder_enter(decoders_AACDecoder* self, PyObject *args)
+{
+    Py_INCREF(self);
+    return (PyObject *)self;
+}
+
+static PyObject*
+AACDecoder_exit(decoders_AACDecoder* self, PyObject *args)
+{
+    self->closed = 1;
+    Py_INCREF(Py_None);
+    return Py_None;
+}
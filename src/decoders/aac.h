@@ -0,0 +1,175 @@
+#include <Python.h>
+#include <stdio.h>
+#include <fdk-aac/aacdecoder_lib.h>
+#include "../array.h"
+#include "../pcmconv.h"
+
+/********************************************************
+ Audio Tools, a module and set of tools for manipulating audio data
+ Copyright (C) 2007-2015  Brian Langenberger
+
+ This program is free software; you can redistribute it and/or modify
+ it under the terms of the GNU General Public License as published by
+ the Free Software Foundation; either version 2 of the License, or
+ (at your option) any later version.
+
+ This program is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU General Public License for more details.
+
+ You should have received a copy of the GNU General Public License
+ along with this program; if not, write to the Free Software
+ Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+*******************************************************/
+
+/*enough for a 2048 PCM frame HE-AAC access unit across 8 channels*/
+#define AAC_PCM_BUFFER_SIZE 2048 * 8 * 2
+
+typedef struct {
+    PyObject_HEAD
+
+    FILE *file;
+    HANDLE_AACDECODER decoder;
+
+    /*the (offset, size) of each raw access unit in the file*/
+    unsigned frame_count;
+    long long *frame_offsets;
+    unsigned *frame_sizes;
+    unsigned next_frame;
+
+    uint8_t *frame_data;
+    unsigned frame_data_size;
+
+    /*the most recently decoded access unit, not yet returned*/
+    INT_PCM *pcm;
+    int pcm_frames_start;
+    int pcm_frames_remaining;
+
+    int sample_rate;
+    int channel_count;
+    int frame_size;
+
+    /*encoder delay, in PCM frames, and PCM frames yet to be returned*/
+    long long skip_pcm_frames;
+    long long encoder_delay;
+    long long total_pcm_frames;
+    long long remaining_pcm_frames;
+
+    int closed;
+    aa_int *channels;
+    PyObject *audiotools_pcm;
+} decoders_AACDecoder;
+
+static PyObject*
+AACDecoder_new(PyTypeObject *type,
+               PyObject *args, PyObject *kwds);
+
+int
+AACDecoder_init(decoders_AACDecoder *self,
+                PyObject *args, PyObject *kwds);
+
+void
+AACDecoder_dealloc(decoders_AACDecoder *self);
+
+static PyObject*
+AACDecoder_sample_rate(decoders_AACDecoder *self, void *closure);
+
+static PyObject*
+AACDecoder_bits_per_sample(decoders_AACDecoder *self, void *closure);
+
+static PyObject*
+AACDecoder_channels(decoders_AACDecoder *self, void *closure);
+
+static PyObject*
+AACDecoder_channel_mask(decoders_AACDecoder *self, void *closure);
+
+static PyObject*
+AACDecoder_read(decoders_AACDecoder* self, PyObject *args);
+
+static PyObject*
+AACDecoder_seek(decoders_AACDecoder* self, PyObject *args);
+
+static PyObject*
+AACDecoder_close(decoders_AACDecoder* self, PyObject *args);
+
+static PyObject*
+AACDecoder_enter(decoders_AACDecoder* self, PyObject *args);
+
+static PyObject*
+AACDecoder_exit(decoders_AACDecoder* self, PyObject *args);
+
+/*decodes the next access unit to self->pcm
+  and returns its length in PCM frames,
+  returns 0 at the end of the stream
+  or returns -1 with an exception set if an error occurs*/
+static int
+AACDecoder_decode_frame(decoders_AACDecoder *self);
+
+PyGetSetDef AACDecoder_getseters[] = {
+    {"sample_rate",
+     (getter)AACDecoder_sample_rate, NULL, "sample rate", NULL},
+    {"bits_per_sample",
+     (getter)AACDecoder_bits_per_sample, NULL, "bits-per-sample", NULL},
+    {"channels",
+     (getter)AACDecoder_channels, NULL, "channels", NULL},
+    {"channel_mask",
+     (getter)AACDecoder_channel_mask, NULL, "channel mask", NULL},
+    {NULL}
+};
+
+PyMethodDef AACDecoder_methods[] = {
+    {"read", (PyCFunction)AACDecoder_read,
+     METH_VARARGS, "read(pcm_frame_count) -> FrameList"},
+    {"seek", (PyCFunction)AACDecoder_seek,
+     METH_VARARGS, "seek(desired_pcm_offset) -> actual_pcm_offset"},
+    {"close", (PyCFunction)AACDecoder_close,
+     METH_NOARGS, "close() -> None"},
+    {"__enter__", (PyCFunction)AACDecoder_enter,
+     METH_NOARGS, "enter() -> self"},
+    {"__exit__", (PyCFunction)AACDecoder_exit,
+     METH_VARARGS, "exit(exc_type, exc_value, traceback) -> None"},
+    {NULL}
+};
+
+PyTypeObject decoders_AACDecoderType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    "decoders.AACDecoder",     /* tp_name */
+    sizeof(decoders_AACDecoder), /* tp_basicsize */
+    0,                         /* tp_itemsize */
+    (destructor)AACDecoder_dealloc, /* tp_dealloc */
+    0,                         /* tp_print */
+    0,                         /* tp_getattr */
+    0,                         /* tp_setattr */
+    0,                         /* tp_reserved */
+    0,                         /* tp_repr */
+    0,                         /* tp_as_number */
+    0,                         /* tp_as_sequence */
+    0,                         /* tp_as_mapping */
+    0,                         /* tp_hash  */
+    0,                         /* tp_call */
+    0,                         /* tp_str */
+    0,                         /* tp_getattro */
+    0,                         /* tp_setattro */
+    0,                         /* tp_as_buffer */
+    Py_TPFLAGS_DEFAULT |
+    Py_TPFLAGS_BASETYPE,       /* tp_flags */
+    "AACDecoder objects",      /* tp_doc */
+    0,                         /* tp_traverse */
+    0,                         /* tp_clear */
+    0,                         /* tp_richcompare */
+    0,                         /* tp_weaklistoffset */
+    0,                         /* tp_iter */
+    0,                         /* tp_iternext */
+    AACDecoder_methods,        /* tp_methods */
+    0,                         /* tp_members */
+    AACDecoder_getseters,      /* tp_getset */
+    0,                         /* tp_base */
+    0,                         /* tp_dict */
+    0,                         /* tp_descr_get */
+    0,                         /* tp_descr_set */
+    0,                         /* tp_dictoffset */
+    (initproc)AACDecoder_init, /* tp_init */
+    0,                         /* tp_alloc */
+    AACDecoder_new,            /* tp_new */
+};
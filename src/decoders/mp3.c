@@ -20,6 +20,10 @@
  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
 *******************************************************/
 
+#ifndef MIN
+#define MIN(x, y) ((x) < (y) ? (x) : (y))
+#endif
+
 static PyObject*
 MP3Decoder_new(PyTypeObject *type,
                PyObject *args, PyObject *kwds)
@@ -166,6 +170,48 @@ MP3Decoder_read(decoders_MP3Decoder* self, PyObject *args)
     }
 }
 
+static PyObject*
+MP3Decoder_seek(decoders_MP3Decoder* self, PyObject *args)
+{
+    long long seeked_offset;
+    off_t total_length;
+    off_t actual_offset;
+
+    if (self->closed) {
+        PyErr_SetString(PyExc_ValueError, "cannot seek closed stream");
+        return NULL;
+    }
+
+    if (!PyArg_ParseTuple(args, "L", &seeked_offset))
+        return NULL;
+
+    if (seeked_offset < 0) {
+        PyErr_SetString(PyExc_ValueError, "cannot seek to negative value");
+        return NULL;
+    }
+
+    /*mpg123 locates the frame using its frame index,
+      which it extends by scanning frame headers (not decoding them)
+      when seeking past the indexed portion of the stream,
+      then decodes up to the requested sample
+      so the resulting offset is sample-accurate*/
+    if ((total_length = mpg123_length(self->handle)) >= 0) {
+        /*don't seek past the end of the stream*/
+        seeked_offset = MIN(seeked_offset, (long long)total_length);
+    }
+
+    actual_offset = mpg123_seek(self->handle,
+                                (off_t)seeked_offset,
+                                SEEK_SET);
+
+    if (actual_offset < 0) {
+        PyErr_SetString(PyExc_ValueError, "error seeking in MP3 stream");
+        return NULL;
+    }
+
+    return Py_BuildValue("L", (long long)actual_offset);
+}
+
 static PyObject*
 MP3Decoder_close(decoders_MP3Decoder* self, PyObject *args)
 {
@@ -63,6 +63,9 @@ MP3Decoder_channel_mask(decoders_MP3Decoder *self, void *closure);
 static PyObject*
 MP3Decoder_read(decoders_MP3Decoder* self, PyObject *args);
 
+static PyObject*
+MP3Decoder_seek(decoders_MP3Decoder* self, PyObject *args);
+
 static PyObject*
 MP3Decoder_close(decoders_MP3Decoder* self, PyObject *args);
 
@@ -87,6 +90,8 @@ PyGetSetDef MP3Decoder_getseters[] = {
 PyMethodDef MP3Decoder_methods[] = {
     {"read", (PyCFunction)MP3Decoder_read,
      METH_VARARGS, "read(pcm_frame_count) -> FrameList"},
+    {"seek", (PyCFunction)MP3Decoder_seek,
+     METH_VARARGS, "seek(desired_pcm_offset) -> actual_pcm_offset"},
     {"close", (PyCFunction)MP3Decoder_close,
      METH_NOARGS, "close() -> None"},
     {"__enter__", (PyCFunction)MP3Decoder_enter,
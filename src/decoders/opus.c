@@ -266,6 +266,43 @@ OpusDecoder_read(decoders_OpusDecoder* self, PyObject *args)
     }
 }
 
+static PyObject*
+OpusDecoder_seek(decoders_OpusDecoder* self, PyObject *args)
+{
+    long long seeked_offset;
+    ogg_int64_t total_length;
+
+    if (self->closed) {
+        PyErr_SetString(PyExc_ValueError, "cannot seek closed stream");
+        return NULL;
+    }
+
+    if (!PyArg_ParseTuple(args, "L", &seeked_offset))
+        return NULL;
+
+    if (seeked_offset < 0) {
+        PyErr_SetString(PyExc_ValueError, "cannot seek to negative value");
+        return NULL;
+    }
+
+    if ((total_length = op_pcm_total(self->opus_file, -1)) >= 0) {
+        /*don't seek past the end of the stream*/
+        if (seeked_offset > total_length)
+            seeked_offset = total_length;
+    }
+
+    /*libopusfile bisects the stream on Ogg page granule positions
+      (accounting for pre-skip and pre-roll)
+      then decodes up to the requested sample,
+      so the resulting offset is sample-accurate*/
+    if (op_pcm_seek(self->opus_file, (ogg_int64_t)seeked_offset) == 0) {
+        return Py_BuildValue("L", (long long)op_pcm_tell(self->opus_file));
+    } else {
+        PyErr_SetString(PyExc_ValueError, "error seeking in Opus stream");
+        return NULL;
+    }
+}
+
 static PyObject*
 OpusDecoder_close(decoders_OpusDecoder* self, PyObject *args)
 {
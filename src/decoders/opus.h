@@ -59,6 +59,9 @@ OpusDecoder_channel_mask(decoders_OpusDecoder *self, void *closure);
 static PyObject*
 OpusDecoder_read(decoders_OpusDecoder* self, PyObject *args);
 
+static PyObject*
+OpusDecoder_seek(decoders_OpusDecoder* self, PyObject *args);
+
 static PyObject*
 OpusDecoder_close(decoders_OpusDecoder* self, PyObject *args);
 
@@ -83,6 +86,8 @@ PyGetSetDef OpusDecoder_getseters[] = {
 PyMethodDef OpusDecoder_methods[] = {
     {"read", (PyCFunction)OpusDecoder_read,
      METH_VARARGS, "read(pcm_frame_count) -> FrameList"},
+    {"seek", (PyCFunction)OpusDecoder_seek,
+     METH_VARARGS, "seek(desired_pcm_offset) -> actual_pcm_offset"},
     {"close", (PyCFunction)OpusDecoder_close,
      METH_NOARGS, "close() -> None"},
     {"__enter__", (PyCFunction)OpusDecoder_enter,
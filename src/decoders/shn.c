@@ -45,6 +45,9 @@ SHNDecoder_init(decoders_SHNDecoder *self,
     PyObject *file;
     self->bitstream = NULL;
     self->stream_finished = 0;
+    self->beginning_of_frames = NULL;
+    self->current_pcm_frame = 0;
+    self->seek_remainder = aa_int_new();
 
     self->means = aa_int_new();
     self->previous_samples = aa_int_new();
@@ -92,6 +95,18 @@ SHNDecoder_init(decoders_SHNDecoder *self,
         PyErr_SetString(PyExc_IOError, "I/O error reading Shorten header");
         return -1;
     default:
+        /*note where the first audio command begins for rewinding*/
+        if (!setjmp(*br_try(self->bitstream))) {
+            self->beginning_of_frames =
+                self->bitstream->getpos(self->bitstream);
+            br_etry(self->bitstream);
+        } else {
+            br_etry(self->bitstream);
+            PyErr_SetString(PyExc_IOError,
+                            "I/O error reading Shorten header");
+            return -1;
+        }
+
         /*mark stream as not closed and ready for reading*/
         self->closed = 0;
 
@@ -108,9 +123,14 @@ SHNDecoder_dealloc(decoders_SHNDecoder *self)
     self->unshifted->del(self->unshifted);
     self->pcm_header->del(self->pcm_header);
     self->pcm_footer->del(self->pcm_footer);
+    self->seek_remainder->del(self->seek_remainder);
 
     Py_XDECREF(self->audiotools_pcm);
 
+    if (self->beginning_of_frames != NULL) {
+        self->beginning_of_frames->del(self->beginning_of_frames);
+    }
+
     if (self->bitstream != NULL) {
         self->bitstream->free(self->bitstream);
     }
@@ -182,6 +202,16 @@ SHNDecoder_read(decoders_SHNDecoder* self, PyObject *args)
         return NULL;
     }
 
+    if (self->seek_remainder->len) {
+        /*return any frames left over from the last seek() first*/
+        PyObject *framelist = aa_int_to_FrameList(self->audiotools_pcm,
+                                                  self->seek_remainder,
+                                                  self->bits_per_sample);
+        self->current_pcm_frame += self->seek_remainder->_[0]->len;
+        self->seek_remainder->reset(self->seek_remainder);
+        return framelist;
+    }
+
     if (self->stream_finished) {
         return empty_FrameList(self->audiotools_pcm,
                                self->header.channels,
@@ -192,6 +222,7 @@ SHNDecoder_read(decoders_SHNDecoder* self, PyObject *args)
 
     switch (read_framelist(self, self->unshifted)) {
     case OK:
+        self->current_pcm_frame += self->unshifted->_[0]->len;
         return aa_int_to_FrameList(self->audiotools_pcm,
                                    self->unshifted,
                                    self->bits_per_sample);
@@ -214,6 +245,106 @@ SHNDecoder_read(decoders_SHNDecoder* self, PyObject *args)
     }
 }
 
+static PyObject*
+SHNDecoder_seek(decoders_SHNDecoder* self, PyObject *args)
+{
+    long long seeked_offset;
+    aa_int* remainder = self->seek_remainder;
+
+    if (self->closed) {
+        PyErr_SetString(PyExc_ValueError, "cannot seek closed stream");
+        return NULL;
+    }
+
+    if (!PyArg_ParseTuple(args, "L", &seeked_offset))
+        return NULL;
+
+    if (seeked_offset < 0) {
+        PyErr_SetString(PyExc_ValueError, "cannot seek to negative value");
+        return NULL;
+    }
+
+    if ((uint64_t)seeked_offset < self->current_pcm_frame) {
+        /*Shorten's predictors depend on all the preceding samples
+          so seeking backward means decoding from the beginning again*/
+        unsigned c;
+
+        if (!setjmp(*br_try(self->bitstream))) {
+            self->bitstream->setpos(self->bitstream,
+                                    self->beginning_of_frames);
+            br_etry(self->bitstream);
+        } else {
+            br_etry(self->bitstream);
+            PyErr_SetString(PyExc_IOError, "I/O error seeking in stream");
+            return NULL;
+        }
+
+        for (c = 0; c < self->header.channels; c++) {
+            a_int* means = self->means->_[c];
+            means->mset(means, self->header.mean_count, 0);
+            self->previous_samples->_[c]->reset(self->previous_samples->_[c]);
+        }
+        self->block_length = self->header.block_length;
+        self->left_shift = 0;
+        self->stream_finished = 0;
+        self->current_pcm_frame = 0;
+        remainder->reset(remainder);
+    }
+
+    /*decode and discard whole blocks until the seeked offset is reached,
+      keeping the rest of the block which contains it for read()*/
+    while (self->current_pcm_frame < (uint64_t)seeked_offset) {
+        unsigned block_frames;
+
+        if (remainder->len == 0) {
+            if (self->stream_finished) {
+                break;
+            }
+
+            switch (read_framelist(self, remainder)) {
+            case OK:
+                break;
+            case END_OF_STREAM:
+                remainder->reset(remainder);
+                continue;
+            case UNKNOWN_COMMAND:
+                remainder->reset(remainder);
+                PyErr_SetString(PyExc_ValueError,
+                                "unknown command in Shorten stream");
+                return NULL;
+            case IOERROR:
+            default:
+                remainder->reset(remainder);
+                PyErr_SetString(PyExc_IOError,
+                                "I/O error reading Shorten file");
+                return NULL;
+            }
+        }
+
+        block_frames = remainder->_[0]->len;
+
+        if ((self->current_pcm_frame + block_frames) <=
+            (uint64_t)seeked_offset) {
+            self->current_pcm_frame += block_frames;
+            remainder->reset(remainder);
+        } else {
+            const unsigned to_skip =
+                (unsigned)(seeked_offset - self->current_pcm_frame);
+            unsigned c;
+
+            for (c = 0; c < remainder->len; c++) {
+                remainder->_[c]->de_head(remainder->_[c],
+                                         to_skip,
+                                         remainder->_[c]);
+            }
+            self->current_pcm_frame = seeked_offset;
+        }
+    }
+
+    return Py_BuildValue("K",
+                         (unsigned long long)self->current_pcm_frame);
+}
+
 static PyObject*
 SHNDecoder_pcm_split(decoders_SHNDecoder* self, PyObject *args)
 {
@@ -344,7 +475,8 @@ read_shn_header(decoders_SHNDecoder* self, BitstreamReader* reader)
 
         self->header.file_type = read_long(reader);
         self->header.channels = read_long(reader);
-        self->block_length = read_long(reader);
+        self->header.block_length = read_long(reader);
+        self->block_length = self->header.block_length;
         self->left_shift = 0;
         self->header.max_LPC = read_long(reader);
         self->header.mean_count = read_long(reader);
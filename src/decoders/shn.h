@@ -68,6 +68,7 @@ typedef struct {
         unsigned channels;
         unsigned max_LPC;
         unsigned mean_count;
+        unsigned block_length;
     } header;
 
     /*fields which may change during decoding*/
@@ -94,6 +95,15 @@ typedef struct {
 #ifndef STANDALONE
     /*a framelist generator*/
     PyObject* audiotools_pcm;
+
+    /*the position of the first command after the header*/
+    br_pos_t* beginning_of_frames;
+
+    /*the PCM frame offset of the next frame returned by read()*/
+    uint64_t current_pcm_frame;
+
+    /*frames decoded while seeking but not yet returned by read()*/
+    aa_int* seek_remainder;
 #endif
 
     /*a marker to indicate the stream has been explicitly closed*/
@@ -127,6 +137,9 @@ SHNDecoder_channel_mask(decoders_SHNDecoder *self, void *closure);
 static PyObject*
 SHNDecoder_read(decoders_SHNDecoder* self, PyObject *args);
 
+static PyObject*
+SHNDecoder_seek(decoders_SHNDecoder* self, PyObject *args);
+
 static PyObject*
 SHNDecoder_pcm_split(decoders_SHNDecoder* self, PyObject *args);
 
@@ -154,6 +167,8 @@ PyGetSetDef SHNDecoder_getseters[] = {
 PyMethodDef SHNDecoder_methods[] = {
     {"read", (PyCFunction)SHNDecoder_read,
      METH_VARARGS, "read(pcm_frame_count) -> FrameList"},
+    {"seek", (PyCFunction)SHNDecoder_seek,
+     METH_VARARGS, "seek(desired_pcm_offset) -> actual_pcm_offset"},
     {"close", (PyCFunction)SHNDecoder_close,
      METH_NOARGS, "close() -> None"},
     {"pcm_split", (PyCFunction)SHNDecoder_pcm_split,
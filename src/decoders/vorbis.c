@@ -298,6 +298,51 @@ VorbisDecoder_read(decoders_VorbisDecoder *self, PyObject *args) {
     }
 }
 
+static PyObject*
+VorbisDecoder_seek(decoders_VorbisDecoder *self, PyObject *args) {
+    long long seeked_offset;
+    ogg_int64_t total_length;
+
+    if (self->closed) {
+        PyErr_SetString(PyExc_ValueError, "cannot seek closed stream");
+        return NULL;
+    }
+
+    if (!PyArg_ParseTuple(args, "L", &seeked_offset))
+        return NULL;
+
+    if (seeked_offset < 0) {
+        PyErr_SetString(PyExc_ValueError, "cannot seek to negative value");
+        return NULL;
+    }
+
+    if ((total_length = ov_pcm_total(&(self->vorbisfile), -1)) >= 0) {
+        /*don't seek past the end of the stream*/
+        seeked_offset = MIN(seeked_offset, (long long)total_length);
+    }
+
+    /*libvorbisfile bisects the stream on Ogg page granule positions
+      then decodes up to the requested sample,
+      so the resulting offset is sample-accurate*/
+    switch (ov_pcm_seek(&(self->vorbisfile), (ogg_int64_t)seeked_offset)) {
+    case 0:
+        return Py_BuildValue("L",
+                             (long long)ov_pcm_tell(&(self->vorbisfile)));
+    case OV_ENOSEEK:
+        PyErr_SetString(PyExc_ValueError, "stream is not seekable");
+        return NULL;
+    case OV_EREAD:
+        PyErr_SetString(PyExc_IOError, "I/O error reading from Ogg stream");
+        return NULL;
+    case OV_EBADLINK:
+        PyErr_SetString(PyExc_ValueError, "invalid stream section");
+        return NULL;
+    default:
+        PyErr_SetString(PyExc_ValueError, "error seeking in Vorbis stream");
+        return NULL;
+    }
+}
+
 static PyObject*
 VorbisDecoder_close(decoders_VorbisDecoder *self, PyObject *args) {
     self->closed = 1;
@@ -51,6 +51,9 @@ VorbisDecoder_channel_mask(decoders_VorbisDecoder *self, void *closure);
 static PyObject*
 VorbisDecoder_read(decoders_VorbisDecoder *self, PyObject *args);
 
+static PyObject*
+VorbisDecoder_seek(decoders_VorbisDecoder *self, PyObject *args);
+
 static PyObject*
 VorbisDecoder_close(decoders_VorbisDecoder *self, PyObject *args);
 
@@ -84,6 +87,8 @@ PyGetSetDef VorbisDecoder_getseters[] = {
 PyMethodDef VorbisDecoder_methods[] = {
     {"read", (PyCFunction)VorbisDecoder_read, METH_VARARGS,
      "read(pcm_frame_count) -> FrameList"},
+    {"seek", (PyCFunction)VorbisDecoder_seek,
+     METH_VARARGS, "seek(desired_pcm_offset) -> actual_pcm_offset"},
     {"close", (PyCFunction)VorbisDecoder_close, METH_NOARGS,
      "close() -> None"},
     {"__enter__", (PyCFunction)VorbisDecoder_enter,
@@ -62,6 +62,11 @@ PyObject*
 encoders_encode_opus(PyObject *dummy, PyObject *args, PyObject *keywds);
 #endif
 
+#ifdef HAS_AAC
+PyObject*
+encoders_encode_aac(PyObject *dummy, PyObject *args, PyObject *keywds);
+#endif
+
 PyMethodDef module_methods[] = {
     {"encode_flac", (PyCFunction)encoders_encode_flac,
      METH_VARARGS | METH_KEYWORDS, "Encode FLAC file from PCMReader"},
@@ -89,5 +94,9 @@ PyMethodDef module_methods[] = {
     {"encode_opus", (PyCFunction)encoders_encode_opus,
     METH_VARARGS | METH_KEYWORDS, "Encode Opus file from PCMReader"},
     #endif
+    #ifdef HAS_AAC
+    {"encode_aac", (PyCFunction)encoders_encode_aac,
+    METH_VARARGS | METH_KEYWORDS, "Encode AAC mdat atom from PCMReader"},
+    #endif
     {NULL}
 };
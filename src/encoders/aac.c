@@ -0,0 +1,426 @@
+#include "../pcmconv.h"
+#include "../array.h"
+#include "../bitstream.h"
+#include <fdk-aac/aacenc_lib.h>
+#include <stdlib.h>
+#include <string.h>
+
+/********************************************************
+ Audio Tools, a module and set of tools for manipulating audio data
+ Copyright (C) 2007-2015  Brian Langenberger
+
+ This program is free software; you can redistribute it and/or modify
+ it under the terms of the GNU General Public License as published by
+ the Free Software Foundation; either version 2 of the License, or
+ (at your option) any later version.
+
+ This program is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU General Public License for more details.
+
+ You should have received a copy of the GNU General Public License
+ along with this program; if not, write to the Free Software
+ Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+*******************************************************/
+
+#define BLOCK_SIZE 1024
+
+#if PY_MAJOR_VERSION >= 3
+#ifndef PyInt_FromLong
+#define PyInt_FromLong PyLong_FromLong
+#endif
+#endif
+
+typedef enum {
+    ENCODE_OK,
+    ERR_ENCODER_INIT,
+    ERR_PCMREADER,
+    ERR_ENCODE_ERROR
+} result_t;
+
+/*encodes PCMReader to raw AAC-LC access units
+  written as the contents of an "mdat" atom to output,
+  placing their byte sizes in frame_sizes,
+  the encoder's AudioSpecificConfig in config
+  and its delay (in PCM frames) in encoder_delay*/
+static result_t
+encode_aac_mdat(BitstreamWriter *output,
+                pcmreader *pcmreader,
+                int vbr_mode,
+                a_unsigned *frame_sizes,
+                uint8_t config[64],
+                unsigned *config_size,
+                unsigned *encoder_delay);
+
+/*writes the encoder's output buffer to output
+  and logs its size if it contains an access unit*/
+static void
+write_access_unit(BitstreamWriter *output,
+                  const uint8_t *buffer,
+                  int size,
+                  a_unsigned *frame_sizes);
+
+PyObject*
+encoders_encode_aac(PyObject *dummy, PyObject *args, PyObject *keywds)
+{
+    static char *kwlist[] = {"file",
+                             "pcmreader",
+                             "vbr_mode",
+                             NULL};
+    PyObject *file_obj;
+    pcmreader* pcmreader = NULL;
+    int vbr_mode;
+    BitstreamWriter *output;
+    a_unsigned *frame_sizes;
+    uint8_t config[64];
+    unsigned config_size;
+    unsigned encoder_delay;
+    result_t result;
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "OO&i",
+                                     kwlist,
+                                     &file_obj,
+                                     pcmreader_converter,
+                                     &pcmreader,
+                                     &vbr_mode)) {
+        if (pcmreader != NULL)
+            pcmreader->del(pcmreader);
+        return NULL;
+    }
+
+    /*sanity check VBR mode*/
+    if ((vbr_mode < 1) || (vbr_mode > 5)) {
+        PyErr_SetString(PyExc_ValueError, "vbr_mode must be 1-5");
+        pcmreader->del(pcmreader);
+        return NULL;
+    }
+
+    /*sanity check PCMReader*/
+    if (pcmreader->bits_per_sample != 16) {
+        PyErr_SetString(PyExc_ValueError,
+                        "PCMReader bits_per_sample must be 16");
+        pcmreader->del(pcmreader);
+        return NULL;
+    } else if ((pcmreader->channels < 1) || (pcmreader->channels > 2)) {
+        PyErr_SetString(PyExc_ValueError,
+                        "PCMReader channels must be 1 or 2");
+        pcmreader->del(pcmreader);
+        return NULL;
+    }
+
+    /*convert file object to bitstream writer*/
+    output = bw_open_external(file_obj,
+                              BS_BIG_ENDIAN,
+                              4096,
+                              (ext_write_f)bw_write_python,
+                              (ext_setpos_f)bs_setpos_python,
+                              (ext_getpos_f)bs_getpos_python,
+                              (ext_free_pos_f)bs_free_pos_python,
+                              (ext_flush_f)bw_flush_python,
+                              (ext_close_f)bs_close_python,
+                              (ext_free_f)bs_free_python_nodecref);
+
+    frame_sizes = a_unsigned_new();
+
+    result = encode_aac_mdat(output,
+                             pcmreader,
+                             vbr_mode,
+                             frame_sizes,
+                             config,
+                             &config_size,
+                             &encoder_delay);
+
+    pcmreader->del(pcmreader);
+
+    switch (result) {
+    case ENCODE_OK:
+    default:
+        {
+            PyObject *frame_sizes_list;
+            PyObject *to_return;
+            unsigned i;
+
+            output->flush(output);
+            output->free(output);
+
+            /*convert list of byte sizes to Python list of integers*/
+            if ((frame_sizes_list = PyList_New(0)) == NULL) {
+                frame_sizes->del(frame_sizes);
+                return NULL;
+            }
+            for (i = 0; i < frame_sizes->len; i++) {
+                PyObject *frame_size = PyInt_FromLong(frame_sizes->_[i]);
+                if (PyList_Append(frame_sizes_list, frame_size) == -1) {
+                    Py_DECREF(frame_size);
+                    Py_DECREF(frame_sizes_list);
+                    frame_sizes->del(frame_sizes);
+                    return NULL;
+                } else {
+                    Py_DECREF(frame_size);
+                }
+            }
+            frame_sizes->del(frame_sizes);
+
+#if PY_MAJOR_VERSION >= 3
+            to_return = Py_BuildValue("(y#NI)",
+#else
+            to_return = Py_BuildValue("(s#NI)",
+#endif
+                                      (char*)config,
+                                      (int)config_size,
+                                      frame_sizes_list,
+                                      encoder_delay);
+            return to_return;
+        }
+    case ERR_ENCODER_INIT:
+        output->free(output);
+        frame_sizes->del(frame_sizes);
+        PyErr_SetString(PyExc_ValueError, "error initializing encoder");
+        return NULL;
+    case ERR_PCMREADER:
+        output->free(output);
+        frame_sizes->del(frame_sizes);
+        /*pass error through from PCMReader*/
+        return NULL;
+    case ERR_ENCODE_ERROR:
+        output->free(output);
+        frame_sizes->del(frame_sizes);
+        PyErr_SetString(PyExc_ValueError, "AAC encoding error");
+        return NULL;
+    }
+}
+
+static result_t
+encode_aac_mdat(BitstreamWriter *output,
+                pcmreader *pcmreader,
+                int vbr_mode,
+                a_unsigned *frame_sizes,
+                uint8_t config[64],
+                unsigned *config_size,
+                unsigned *encoder_delay)
+{
+    result_t result = ENCODE_OK;
+    HANDLE_AACENCODER encoder = NULL;
+    AACENC_InfoStruct info;
+    aa_int *samples = NULL;
+    INT_PCM *pcm_samples = NULL;
+    uint8_t *aac_frame = NULL;
+    bw_pos_t *mdat_header = NULL;
+    uint64_t mdat_size = 8;
+    unsigned unit;
+
+    AACENC_BufDesc in_buf = {0};
+    AACENC_BufDesc out_buf = {0};
+    AACENC_InArgs in_args = {0};
+    AACENC_OutArgs out_args = {0};
+    void *in_ptr;
+    void *out_ptr;
+    INT in_identifier = IN_AUDIO_DATA;
+    INT out_identifier = OUT_BITSTREAM_DATA;
+    INT in_size;
+    INT out_size;
+    INT in_element_size = sizeof(INT_PCM);
+    INT out_element_size = 1;
+
+    /*initialize AAC-LC encoder with VBR mode
+      that outputs raw access units, one per PCM block*/
+    if (aacEncOpen(&encoder, 0, pcmreader->channels) != AACENC_OK) {
+        return ERR_ENCODER_INIT;
+    }
+
+    if ((aacEncoder_SetParam(encoder,
+                             AACENC_AOT,
+                             AOT_AAC_LC) != AACENC_OK) ||
+        (aacEncoder_SetParam(encoder,
+                             AACENC_SAMPLERATE,
+                             pcmreader->sample_rate) != AACENC_OK) ||
+        (aacEncoder_SetParam(encoder,
+                             AACENC_CHANNELMODE,
+                             pcmreader->channels == 1 ?
+                             MODE_1 : MODE_2) != AACENC_OK) ||
+        (aacEncoder_SetParam(encoder,
+                             AACENC_CHANNELORDER,
+                             1) != AACENC_OK) ||
+        (aacEncoder_SetParam(encoder,
+                             AACENC_BITRATEMODE,
+                             vbr_mode) != AACENC_OK) ||
+        (aacEncoder_SetParam(encoder,
+                             AACENC_TRANSMUX,
+                             TT_MP4_RAW) != AACENC_OK) ||
+        (aacEncoder_SetParam(encoder,
+                             AACENC_AFTERBURNER,
+                             1) != AACENC_OK)) {
+        aacEncClose(&encoder);
+        return ERR_ENCODER_INIT;
+    }
+
+    /*calling encode with no buffers applies the parameters*/
+    if ((aacEncEncode(encoder, NULL, NULL, NULL, NULL) != AACENC_OK) ||
+        (aacEncInfo(encoder, &info) != AACENC_OK)) {
+        aacEncClose(&encoder);
+        return ERR_ENCODER_INIT;
+    }
+
+    memcpy(config, info.confBuf, info.confSize);
+    *config_size = info.confSize;
+#if AACENCODER_LIB_VL0 >= 4
+    *encoder_delay = info.nDelay;
+#else
+    *encoder_delay = info.encoderDelay;
+#endif
+
+    samples = aa_int_new();
+    pcm_samples = malloc(sizeof(INT_PCM) *
+                         pcmreader->channels *
+                         BLOCK_SIZE);
+    aac_frame = malloc(info.maxOutBufBytes);
+
+    in_buf.numBufs = 1;
+    in_buf.bufs = &in_ptr;
+    in_buf.bufferIdentifiers = &in_identifier;
+    in_buf.bufSizes = &in_size;
+    in_buf.bufElSizes = &in_element_size;
+
+    out_ptr = aac_frame;
+    out_size = info.maxOutBufBytes;
+    out_buf.numBufs = 1;
+    out_buf.bufs = &out_ptr;
+    out_buf.bufferIdentifiers = &out_identifier;
+    out_buf.bufSizes = &out_size;
+    out_buf.bufElSizes = &out_element_size;
+
+    /*write placeholder mdat header
+      preceded by an 8 byte "free" atom
+      which becomes room for a 64-bit size if the mdat needs one*/
+    mdat_header = output->getpos(output);
+    output->write(output, 32, 8);
+    output->write_bytes(output, (uint8_t*)"free", 4);
+    output->write(output, 32, 0);
+    output->write_bytes(output, (uint8_t*)"mdat", 4);
+
+    /*for each non-empty FrameList from PCMReader,
+      encode zero or more AAC access units*/
+    if (pcmreader->read(pcmreader, BLOCK_SIZE, samples)) {
+        result = ERR_PCMREADER;
+        goto cleanup;
+    }
+
+    while (samples->_[0]->len > 0) {
+        const unsigned pcm_frames = samples->_[0]->len;
+        unsigned c;
+        INT offset = 0;
+
+        /*place samples in interleaved buffer*/
+        pcm_samples = realloc(pcm_samples,
+                              sizeof(INT_PCM) * samples->len * pcm_frames);
+        for (c = 0; c < samples->len; c++) {
+            unsigned i;
+            a_int *channel = samples->_[c];
+
+            for (i = 0; i < pcm_frames; i++) {
+                pcm_samples[c + (i * samples->len)] =
+                    (INT_PCM)channel->_[i];
+            }
+        }
+
+        /*the encoder buffers input internally
+          and may not consume all of it in a single call*/
+        while (offset < (INT)(pcm_frames * samples->len)) {
+            in_ptr = pcm_samples + offset;
+            in_args.numInSamples = (pcm_frames * samples->len) - offset;
+            in_size = in_args.numInSamples * sizeof(INT_PCM);
+
+            if (aacEncEncode(encoder,
+                             &in_buf,
+                             &out_buf,
+                             &in_args,
+                             &out_args) != AACENC_OK) {
+                result = ERR_ENCODE_ERROR;
+                goto cleanup;
+            }
+
+            write_access_unit(output,
+                              aac_frame,
+                              out_args.numOutBytes,
+                              frame_sizes);
+
+            if ((out_args.numInSamples == 0) &&
+                (out_args.numOutBytes == 0)) {
+                /*encoder making no progress*/
+                result = ERR_ENCODE_ERROR;
+                goto cleanup;
+            }
+
+            offset += out_args.numInSamples;
+        }
+
+        if (pcmreader->read(pcmreader, BLOCK_SIZE, samples)) {
+            result = ERR_PCMREADER;
+            goto cleanup;
+        }
+    }
+
+    /*flush remaining access units from encoder*/
+    in_buf.numBufs = 0;
+    in_args.numInSamples = -1;
+    for (;;) {
+        const AACENC_ERROR error = aacEncEncode(encoder,
+                                                &in_buf,
+                                                &out_buf,
+                                                &in_args,
+                                                &out_args);
+        if (error == AACENC_ENCODE_EOF) {
+            break;
+        } else if (error != AACENC_OK) {
+            result = ERR_ENCODE_ERROR;
+            goto cleanup;
+        }
+
+        write_access_unit(output,
+                          aac_frame,
+                          out_args.numOutBytes,
+                          frame_sizes);
+    }
+
+    /*sum access unit sizes in 64 bits, since the total may exceed 4GiB*/
+    for (unit = 0; unit < frame_sizes->len; unit++) {
+        mdat_size += frame_sizes->_[unit];
+    }
+
+    /*return to header and rewrite it with the actual value*/
+    output->setpos(output, mdat_header);
+    if (mdat_size <= 0xFFFFFFFF) {
+        output->write(output, 32, 8);
+        output->write_bytes(output, (uint8_t*)"free", 4);
+        output->write(output, 32, (unsigned)mdat_size);
+        output->write_bytes(output, (uint8_t*)"mdat", 4);
+    } else {
+        /*a size of 1 indicates a 64-bit size follows the atom name
+          which includes the 8 additional header bytes*/
+        output->write(output, 32, 1);
+        output->write_bytes(output, (uint8_t*)"mdat", 4);
+        output->write_64(output, 64, mdat_size + 8);
+    }
+
+cleanup:
+    if (mdat_header != NULL)
+        mdat_header->del(mdat_header);
+    aacEncClose(&encoder);
+    samples->del(samples);
+    free(pcm_samples);
+    free(aac_frame);
+    return result;
+}
+
+static void
+write_access_unit(BitstreamWriter *output,
+                  const uint8_t *buffer,
+                  int size,
+                  a_unsigned *frame_sizes)
+{
+    if (size > 0) {
+        output->write_bytes(output, buffer, (unsigned)size);
+        frame_sizes->append(frame_sizes, (unsigned)size);
+    }
+}
@@ -285,6 +285,8 @@ flacenc_init_options(struct flac_encoding_options *options)
     options->use_constant = 1;
     options->use_fixed = 1;
 
+    options->initial_frame_number = 0;
+
     /*these are just placeholders*/
     options->qlp_coeff_precision = 12;
     options->max_rice_parameter = 14;
@@ -333,7 +335,7 @@ flacenc_encode_flac(struct PCMReader *pcmreader,
     uint8_t md5sum[16] = {0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0};
     int pcm_data[options->block_size * pcmreader->channels];
     unsigned pcm_frames_read;
-    unsigned frame_number = 0;
+    unsigned frame_number = options->initial_frame_number;
 
     audiotools__MD5Init(&md5_context);
 
@@ -496,6 +498,7 @@ encoders_encode_flac(PyObject *dummy, PyObject *args, PyObject *keywds)
                              "disable_fixed_subframes",
                              "disable_lpc_subframes",
                              "padding_size",
+                             "initial_frame_number",
                              NULL};
 
     char *filename = NULL;
@@ -509,6 +512,7 @@ encoders_encode_flac(PyObject *dummy, PyObject *args, PyObject *keywds)
     int min_residual_partition_order = 0;
     int max_residual_partition_order = 6;
     int padding_size = 4096;
+    int initial_frame_number = 0;
 
     int no_verbatim_subframes = 0;
     int no_constant_subframes = 0;
@@ -520,7 +524,7 @@ encoders_encode_flac(PyObject *dummy, PyObject *args, PyObject *keywds)
     if (!PyArg_ParseTupleAndKeywords(
             args,
             keywds,
-            "sO&|iiiiiiiiiiii",
+            "sO&|iiiiiiiiiiiii",
             kwlist,
             &filename,
             py_obj_to_pcmreader,
@@ -537,7 +541,8 @@ encoders_encode_flac(PyObject *dummy, PyObject *args, PyObject *keywds)
             &no_constant_subframes,
             &no_fixed_subframes,
             &no_lpc_subframes,
-            &padding_size)) {
+            &padding_size,
+            &initial_frame_number)) {
         return NULL;
     }
 
@@ -589,6 +594,13 @@ encoders_encode_flac(PyObject *dummy, PyObject *args, PyObject *keywds)
         PyErr_SetString(PyExc_ValueError, "padding must be <= 16777215");
         goto error;
     }
+    if (initial_frame_number < 0) {
+        PyErr_SetString(PyExc_ValueError,
+                        "initial_frame_number must be >= 0");
+        goto error;
+    } else {
+        options.initial_frame_number = initial_frame_number;
+    }
     options.use_verbatim = !no_verbatim_subframes;
     options.use_constant = !no_constant_subframes;
     options.use_fixed = !no_fixed_subframes;
@@ -36,6 +36,10 @@ struct flac_encoding_options {
     int use_constant;                       /*a boolean for debugging*/
     int use_fixed;                          /*a boolean for debugging*/
 
+    unsigned initial_frame_number;          /*typically 0, but may be set
+                                              when encoding the middle
+                                              of a stream separately*/
+
     unsigned qlp_coeff_precision;           /*derived from block size*/
     unsigned max_rice_parameter;            /*derived from bits-per-sample*/
     double *window;                         /*for windowing input samples*/
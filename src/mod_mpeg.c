@@ -0,0 +1,202 @@
+#include "mod_mpeg.h"
+#include "mod_defs.h"
+#include <string.h>
+
+/********************************************************
+ Audio Tools, a module and set of tools for manipulating audio data
+ Copyright (C) 2007-2015  Brian Langenberger
+
+ This program is free software; you can redistribute it and/or modify
+ it under the terms of the GNU General Public License as published by
+ the Free Software Foundation; either version 2 of the License, or
+ (at your option) any later version.
+
+ This program is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU General Public License for more details.
+
+ You should have received a copy of the GNU General Public License
+ along with this program; if not, write to the Free Software
+ Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+*******************************************************/
+
+static PyObject*
+mpeg_find_frame(PyObject *dummy, PyObject *args)
+{
+    PyObject *file;
+    long long limit = -1;
+    long long start;
+    /*the scan buffer holds one block
+      plus the bytes of any partial header from the previous block*/
+    uint8_t buffer[MPEG_SCAN_BLOCK_SIZE + 2];
+    Py_ssize_t buffer_size = 0;
+    /*the offset of buffer[0] from start*/
+    long long buffer_offset = 0;
+
+    if (!PyArg_ParseTuple(args, "O|L", &file, &limit))
+        return NULL;
+
+    if ((start = file_tell(file)) < 0)
+        return NULL;
+
+    for (;;) {
+        Py_ssize_t to_read = MPEG_SCAN_BLOCK_SIZE;
+        PyObject *block;
+        Py_ssize_t block_size;
+        const uint8_t *i;
+        const uint8_t *end;
+
+        /*don't read past the last header in range*/
+        if (limit >= 0) {
+            const long long remaining =
+                limit + 3 - (buffer_offset + buffer_size);
+            if (remaining <= 0) {
+                Py_INCREF(Py_None);
+                return Py_None;
+            } else if (remaining < to_read) {
+                to_read = (Py_ssize_t)remaining;
+            }
+        }
+
+        if ((block = file_read(file, to_read)) == NULL)
+            return NULL;
+        if ((block_size = PyBytes_GET_SIZE(block)) == 0) {
+            Py_DECREF(block);
+            Py_INCREF(Py_None);
+            return Py_None;
+        }
+        memcpy(buffer + buffer_size, PyBytes_AS_STRING(block), block_size);
+        buffer_size += block_size;
+        Py_DECREF(block);
+
+        /*search for 0xFF bytes followed by at least 2 more bytes*/
+        i = buffer;
+        end = buffer + buffer_size - 2;
+        while ((i < end) &&
+               ((i = memchr(i, 0xFF, end - i)) != NULL)) {
+            if (valid_frame_header(i[1], i[2])) {
+                const long long skipped = buffer_offset + (i - buffer);
+                if ((limit >= 0) && (skipped > limit)) {
+                    Py_INCREF(Py_None);
+                    return Py_None;
+                } else if (file_seek(file, start + skipped)) {
+                    return NULL;
+                } else {
+                    return Py_BuildValue("L", skipped);
+                }
+            } else {
+                i++;
+            }
+        }
+
+        /*keep any partial header for the next block*/
+        if (buffer_size > 2) {
+            memmove(buffer, buffer + buffer_size - 2, 2);
+            buffer_offset += buffer_size - 2;
+            buffer_size = 2;
+        }
+    }
+}
+
+static PyObject*
+mpeg_skip_id3v2(PyObject *dummy, PyObject *args)
+{
+    PyObject *file;
+    long long bytes_skipped = 0;
+
+    if (!PyArg_ParseTuple(args, "O", &file))
+        return NULL;
+
+    /*ID3v2 tags may be stacked, so keep skipping until none remain*/
+    for (;;) {
+        const long long start = file_tell(file);
+        PyObject *header_obj;
+        const uint8_t *header;
+        int valid;
+
+        if (start < 0)
+            return NULL;
+        if ((header_obj = file_read(file, ID3V2_HEADER_SIZE)) == NULL)
+            return NULL;
+        header = (const uint8_t*)PyBytes_AS_STRING(header_obj);
+
+        valid = ((PyBytes_GET_SIZE(header_obj) == ID3V2_HEADER_SIZE) &&
+                 (memcmp(header, "ID3", 3) == 0) &&
+                 (header[3] >= 2) && (header[3] <= 4) &&
+                 (((header[6] | header[7] | header[8] | header[9]) &
+                   0x80) == 0));
+
+        if (valid) {
+            /*the tag's size is sync-safe and excludes its header*/
+            const long long tag_size = ((header[6] << 21) |
+                                        (header[7] << 14) |
+                                        (header[8] << 7) |
+                                        header[9]);
+            Py_DECREF(header_obj);
+            bytes_skipped += ID3V2_HEADER_SIZE + tag_size;
+            if (file_seek(file, start + ID3V2_HEADER_SIZE + tag_size))
+                return NULL;
+        } else {
+            Py_DECREF(header_obj);
+            if (file_seek(file, start))
+                return NULL;
+            return Py_BuildValue("L", bytes_skipped);
+        }
+    }
+}
+
+static long long
+file_tell(PyObject *file)
+{
+    PyObject *position_obj;
+    long long position;
+
+    if ((position_obj = PyObject_CallMethod(file, "tell", NULL)) == NULL)
+        return -1;
+    position = PyLong_AsLongLong(position_obj);
+    Py_DECREF(position_obj);
+    if ((position == -1) && PyErr_Occurred())
+        return -1;
+    return position;
+}
+
+static int
+file_seek(PyObject *file, long long position)
+{
+    PyObject *result = PyObject_CallMethod(file, "seek", "Li", position, 0);
+    if (result != NULL) {
+        Py_DECREF(result);
+        return 0;
+    } else {
+        return -1;
+    }
+}
+
+static PyObject*
+file_read(PyObject *file, Py_ssize_t size)
+{
+    PyObject *data = PyObject_CallMethod(file, "read", "n", size);
+    if (data == NULL) {
+        return NULL;
+    } else if (!PyBytes_Check(data)) {
+        Py_DECREF(data);
+        PyErr_SetString(PyExc_TypeError, "read() must return bytes");
+        return NULL;
+    } else if (PyBytes_GET_SIZE(data) > size) {
+        Py_DECREF(data);
+        PyErr_SetString(PyExc_ValueError, "read() returned too many bytes");
+        return NULL;
+    } else {
+        return data;
+    }
+}
+
+MOD_INIT(_mpeg)
+{
+    PyObject* m;
+
+    MOD_DEF(m, "_mpeg", "an MPEG frame searching module", module_methods)
+
+    return MOD_SUCCESS_VAL(m);
+}
@@ -0,0 +1,80 @@
+#include <Python.h>
+#include <stdint.h>
+
+/********************************************************
+ Audio Tools, a module and set of tools for manipulating audio data
+ Copyright (C) 2007-2015  Brian Langenberger
+
+ This program is free software; you can redistribute it and/or modify
+ it under the terms of the GNU General Public License as published by
+ the Free Software Foundation; either version 2 of the License, or
+ (at your option) any later version.
+
+ This program is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU General Public License for more details.
+
+ You should have received a copy of the GNU General Public License
+ along with this program; if not, write to the Free Software
+ Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+*******************************************************/
+
+/*bytes read from the file object at a time when scanning for frames*/
+#define MPEG_SCAN_BLOCK_SIZE 65536
+
+/*the size of an ID3v2 tag's header*/
+#define ID3V2_HEADER_SIZE 10
+
+static PyObject*
+mpeg_find_frame(PyObject *dummy, PyObject *args);
+
+static PyObject*
+mpeg_skip_id3v2(PyObject *dummy, PyObject *args);
+
+PyMethodDef module_methods[] = {
+    {"find_frame", (PyCFunction)mpeg_find_frame,
+     METH_VARARGS,
+     "find_frame(file, limit=-1) -> bytes skipped or None\n"
+     "places the file at the start of the next valid MPEG frame header\n"
+     "no more than limit bytes from its current position\n"
+     "returns None, and leaves the file position undefined,\n"
+     "if no header is found"},
+    {"skip_id3v2", (PyCFunction)mpeg_skip_id3v2,
+     METH_VARARGS,
+     "skip_id3v2(file) -> bytes skipped\n"
+     "places the file past any ID3v2 tags at its current position"},
+    {NULL}
+};
+
+/*given the second and third bytes of a frame header
+  starting with 0xFF, returns 1 if the header is valid
+
+  that is, the header has a complete frame sync,
+  no reserved MPEG ID, layer, bit rate or sample rate
+  and isn't free format*/
+static inline int
+valid_frame_header(uint8_t byte1, uint8_t byte2)
+{
+    return (((byte1 & 0xE0) == 0xE0) &&        /*rest of frame sync*/
+            (((byte1 >> 3) & 3) != 1) &&       /*MPEG ID*/
+            (((byte1 >> 1) & 3) != 0) &&       /*layer*/
+            ((byte2 >> 4) != 0) &&             /*free format bit rate*/
+            ((byte2 >> 4) != 0xF) &&           /*bit rate*/
+            (((byte2 >> 2) & 3) != 3));        /*sample rate*/
+}
+
+/*returns file.tell() as a long long
+  or returns -1 with an exception set if an error occurs*/
+static long long
+file_tell(PyObject *file);
+
+/*calls file.seek(position, 0)
+  returns 0 on success, or -1 with an exception set*/
+static int
+file_seek(PyObject *file, long long position);
+
+/*calls file.read(size) and returns a new bytes object
+  or returns NULL with an exception set if an error occurs*/
+static PyObject*
+file_read(PyObject *file, Py_ssize_t size);
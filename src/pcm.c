@@ -40,6 +40,28 @@
 #endif
 #endif
 
+/*Python 2 only consults bf_getbuffer if this flag is set*/
+#ifndef Py_TPFLAGS_HAVE_NEWBUFFER
+#define Py_TPFLAGS_HAVE_NEWBUFFER 0
+#endif
+
+/*exports "samples" as a read-only, C-contiguous
+  frames x channels buffer view of the given item format
+
+  "shape", "strides" and "exports" are owned by the exporting object*/
+static int
+export_samples(PyObject *obj,
+               void *samples,
+               Py_ssize_t itemsize,
+               char *format,
+               unsigned frames,
+               unsigned channels,
+               Py_ssize_t *shape,
+               Py_ssize_t *strides,
+               Py_ssize_t *exports,
+               Py_buffer *view,
+               int flags);
+
 PyMethodDef module_methods[] = {
     {"empty_framelist", (PyCFunction)FrameList_empty,
      METH_VARARGS, "empty_framelist(channels, bits_per_sample) -> FrameList"},
@@ -74,6 +96,8 @@ PyGetSetDef FrameList_getseters[] = {
      0, "channel count", NULL},
     {"bits_per_sample", (getter)FrameList_bits_per_sample,
      0, "bits per sample", NULL},
+    {"__array_interface__", (getter)FrameList_array_interface,
+     0, "NumPy array interface", NULL},
     {NULL}  /* Sentinel */
 };
 
@@ -125,6 +149,17 @@ static PySequenceMethods pcm_FrameListType_as_sequence = {
     (ssizeargfunc)FrameList_inplace_repeat, /* sq_inplace_repeat */
 };
 
+static PyBufferProcs pcm_FrameListType_as_buffer = {
+#if PY_MAJOR_VERSION < 3
+    (readbufferproc)NULL,                       /* bf_getreadbuffer */
+    (writebufferproc)NULL,                      /* bf_getwritebuffer */
+    (segcountproc)NULL,                         /* bf_getsegcount */
+    (charbufferproc)NULL,                       /* bf_getcharbuffer */
+#endif
+    (getbufferproc)FrameList_getbuffer,         /* bf_getbuffer */
+    (releasebufferproc)FrameList_releasebuffer  /* bf_releasebuffer */
+};
+
 PyTypeObject pcm_FrameListType = {
     PyVarObject_HEAD_INIT(NULL, 0)
     "pcm.FrameList",           /*tp_name*/
@@ -144,8 +179,9 @@ PyTypeObject pcm_FrameListType = {
     0,                         /*tp_str*/
     0,                         /*tp_getattro*/
     0,                         /*tp_setattro*/
-    0,                         /*tp_as_buffer*/
-    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE, /*tp_flags*/
+    &pcm_FrameListType_as_buffer, /*tp_as_buffer*/
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE |
+    Py_TPFLAGS_HAVE_NEWBUFFER, /*tp_flags*/
     "FrameList(string, channels, bits_per_sample, is_big_endian, is_signed)",
     /* tp_doc */
     0,                         /* tp_traverse */
@@ -247,7 +283,10 @@ FrameList_init(pcm_FrameList *self, PyObject *args, PyObject *kwds)
 pcm_FrameList*
 FrameList_create(void)
 {
-    return (pcm_FrameList*)_PyObject_New(&pcm_FrameListType);
+    pcm_FrameList *framelist =
+        (pcm_FrameList*)_PyObject_New(&pcm_FrameListType);
+    framelist->buffer_exports = 0;
+    return framelist;
 }
 
 PyObject*
@@ -308,6 +347,56 @@ FrameList_bits_per_sample(pcm_FrameList *self, void* closure)
     return Py_BuildValue("i", self->bits_per_sample);
 }
 
+/*returns a NumPy array interface typestr such as "<i4"
+  for the host's native byte order*/
+static PyObject*
+native_typestr(char kind, size_t itemsize)
+{
+    const int test = 1;
+    const char byte_order = (*((const char*)&test) == 1) ? '<' : '>';
+
+#if PY_MAJOR_VERSION >= 3
+    return PyUnicode_FromFormat("%c%c%d", byte_order, kind, (int)itemsize);
+#else
+    return PyString_FromFormat("%c%c%d", byte_order, kind, (int)itemsize);
+#endif
+}
+
+PyObject*
+FrameList_array_interface(pcm_FrameList *self, void* closure)
+{
+    /*"data" is the FrameList itself, so that NumPy
+      shares its samples through the buffer protocol
+      and holds a buffer export for as long as the array lives*/
+    return Py_BuildValue("{s:i,s:(I,I),s:N,s:O}",
+                         "version", 3,
+                         "shape", self->frames, self->channels,
+                         "typestr", native_typestr('i', sizeof(int)),
+                         "data", self);
+}
+
+int
+FrameList_getbuffer(pcm_FrameList *self, Py_buffer *view, int flags)
+{
+    return export_samples((PyObject*)self,
+                          self->samples,
+                          sizeof(int),
+                          "i",
+                          self->frames,
+                          self->channels,
+                          self->buffer_shape,
+                          self->buffer_strides,
+                          &(self->buffer_exports),
+                          view,
+                          flags);
+}
+
+void
+FrameList_releasebuffer(pcm_FrameList *self, Py_buffer *view)
+{
+    self->buffer_exports--;
+}
+
 Py_ssize_t
 FrameList_len(pcm_FrameList *o)
 {
@@ -598,6 +687,12 @@ FrameList_inplace_concat(pcm_FrameList *a, PyObject *bb)
         return NULL;
     }
 
+    if (a->buffer_exports) {
+        PyErr_SetString(PyExc_BufferError,
+                        "cannot resize FrameList with exported buffers");
+        return NULL;
+    }
+
     a->frames += b->frames;
     a->samples_length += b->samples_length;
     a->samples = realloc(a->samples, a->samples_length * sizeof(int));
@@ -615,6 +710,12 @@ FrameList_inplace_repeat(pcm_FrameList *a, Py_ssize_t i)
     const unsigned int original_length = a->samples_length;
     Py_ssize_t j;
 
+    if (a->buffer_exports) {
+        PyErr_SetString(PyExc_BufferError,
+                        "cannot resize FrameList with exported buffers");
+        return NULL;
+    }
+
     a->frames = (unsigned int)(a->frames * i);
     a->samples_length = (unsigned int)(a->samples_length * i);
     a->samples = realloc(a->samples, a->samples_length * sizeof(int));
@@ -998,6 +1099,8 @@ FrameList_converter(PyObject* obj, void** framelist)
 PyGetSetDef FloatFrameList_getseters[] = {
     {"frames", (getter)FloatFrameList_frames, 0, "frame count", NULL},
     {"channels", (getter)FloatFrameList_channels, 0, "channel count", NULL},
+    {"__array_interface__", (getter)FloatFrameList_array_interface,
+     0, "NumPy array interface", NULL},
     {NULL}  /* Sentinel */
 };
 
@@ -1037,6 +1140,17 @@ static PySequenceMethods pcm_FloatFrameListType_as_sequence = {
     (ssizeargfunc)FloatFrameList_inplace_repeat, /* sq_inplace_repeat */
 };
 
+static PyBufferProcs pcm_FloatFrameListType_as_buffer = {
+#if PY_MAJOR_VERSION < 3
+    (readbufferproc)NULL,                            /* bf_getreadbuffer */
+    (writebufferproc)NULL,                           /* bf_getwritebuffer */
+    (segcountproc)NULL,                              /* bf_getsegcount */
+    (charbufferproc)NULL,                            /* bf_getcharbuffer */
+#endif
+    (getbufferproc)FloatFrameList_getbuffer,         /* bf_getbuffer */
+    (releasebufferproc)FloatFrameList_releasebuffer  /* bf_releasebuffer */
+};
+
 PyTypeObject pcm_FloatFrameListType = {
     PyVarObject_HEAD_INIT(NULL, 0)
     "pcm.FloatFrameList",      /*tp_name*/
@@ -1056,8 +1170,9 @@ PyTypeObject pcm_FloatFrameListType = {
     0,                         /*tp_str*/
     0,                         /*tp_getattro*/
     0,                         /*tp_setattro*/
-    0,                         /*tp_as_buffer*/
-    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE, /*tp_flags*/
+    &pcm_FloatFrameListType_as_buffer, /*tp_as_buffer*/
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE |
+    Py_TPFLAGS_HAVE_NEWBUFFER, /*tp_flags*/
     "FloatFrameList(float_list, channels)",  /* tp_doc */
     0,                         /* tp_traverse */
     0,                         /* tp_clear */
@@ -1144,7 +1259,10 @@ FloatFrameList_init(pcm_FloatFrameList *self, PyObject *args, PyObject *kwds)
 pcm_FloatFrameList*
 FloatFrameList_create(void)
 {
-    return (pcm_FloatFrameList*)_PyObject_New(&pcm_FloatFrameListType);
+    pcm_FloatFrameList *framelist =
+        (pcm_FloatFrameList*)_PyObject_New(&pcm_FloatFrameListType);
+    framelist->buffer_exports = 0;
+    return framelist;
 }
 
 PyObject*
@@ -1188,6 +1306,38 @@ FloatFrameList_channels(pcm_FloatFrameList *self, void* closure)
     return Py_BuildValue("i", self->channels);
 }
 
+PyObject*
+FloatFrameList_array_interface(pcm_FloatFrameList *self, void* closure)
+{
+    return Py_BuildValue("{s:i,s:(I,I),s:N,s:O}",
+                         "version", 3,
+                         "shape", self->frames, self->channels,
+                         "typestr", native_typestr('f', sizeof(double)),
+                         "data", self);
+}
+
+int
+FloatFrameList_getbuffer(pcm_FloatFrameList *self, Py_buffer *view, int flags)
+{
+    return export_samples((PyObject*)self,
+                          self->samples,
+                          sizeof(double),
+                          "d",
+                          self->frames,
+                          self->channels,
+                          self->buffer_shape,
+                          self->buffer_strides,
+                          &(self->buffer_exports),
+                          view,
+                          flags);
+}
+
+void
+FloatFrameList_releasebuffer(pcm_FloatFrameList *self, Py_buffer *view)
+{
+    self->buffer_exports--;
+}
+
 Py_ssize_t
 FloatFrameList_len(pcm_FloatFrameList *o)
 {
@@ -1470,6 +1620,12 @@ FloatFrameList_inplace_concat(pcm_FloatFrameList *a, PyObject *bb)
         return NULL;
     }
 
+    if (a->buffer_exports) {
+        PyErr_SetString(PyExc_BufferError,
+                        "cannot resize FloatFrameList with exported buffers");
+        return NULL;
+    }
+
     a->frames += b->frames;
     a->samples_length += b->samples_length;
     a->samples = realloc(a->samples, a->samples_length * sizeof(double));
@@ -1487,6 +1643,12 @@ FloatFrameList_inplace_repeat(pcm_FloatFrameList *a, Py_ssize_t i)
     const unsigned int original_length = a->samples_length;
     Py_ssize_t j;
 
+    if (a->buffer_exports) {
+        PyErr_SetString(PyExc_BufferError,
+                        "cannot resize FloatFrameList with exported buffers");
+        return NULL;
+    }
+
     a->frames = (unsigned int)(a->frames * i);
     a->samples_length = (unsigned int)(a->samples_length * i);
     a->samples = realloc(a->samples, a->samples_length * sizeof(double));
@@ -1742,6 +1904,68 @@ MOD_INIT(pcm)
     return MOD_SUCCESS_VAL(m);
 }
 
+static int
+export_samples(PyObject *obj,
+               void *samples,
+               Py_ssize_t itemsize,
+               char *format,
+               unsigned frames,
+               unsigned channels,
+               Py_ssize_t *shape,
+               Py_ssize_t *strides,
+               Py_ssize_t *exports,
+               Py_buffer *view,
+               int flags)
+{
+    static double empty_samples[1];
+
+    if (view == NULL) {
+        PyErr_SetString(PyExc_BufferError, "NULL view in getbuffer");
+        return -1;
+    }
+    if ((flags & PyBUF_WRITABLE) == PyBUF_WRITABLE) {
+        PyErr_SetString(PyExc_BufferError, "FrameLists are read-only");
+        return -1;
+    }
+    if (((flags & PyBUF_F_CONTIGUOUS) == PyBUF_F_CONTIGUOUS) &&
+        (frames > 1) && (channels > 1)) {
+        PyErr_SetString(PyExc_BufferError,
+                        "FrameLists are not Fortran contiguous");
+        return -1;
+    }
+
+    /*shape cannot change while views are outstanding
+      so these can be safely shared between all of them*/
+    shape[0] = frames;
+    shape[1] = channels;
+    strides[0] = itemsize * channels;
+    strides[1] = itemsize;
+
+    view->obj = obj;
+    Py_INCREF(obj);
+    view->buf = samples ? samples : (void*)empty_samples;
+    view->len = itemsize * frames * channels;
+    view->readonly = 1;
+    view->itemsize = itemsize;
+    view->format = (flags & PyBUF_FORMAT) ? format : NULL;
+    if ((flags & PyBUF_ND) == PyBUF_ND) {
+        view->ndim = 2;
+        view->shape = shape;
+    } else {
+        /*a simple request treats the samples as unsigned bytes*/
+        view->ndim = 1;
+        view->shape = NULL;
+    }
+    view->strides =
+        ((flags & PyBUF_STRIDES) == PyBUF_STRIDES) ? strides : NULL;
+    view->suboffsets = NULL;
+    view->internal = NULL;
+
+    *exports += 1;
+
+    return 0;
+}
+
 #endif
 
 void
@@ -43,6 +43,12 @@ typedef struct {
     unsigned samples_length; /*the total number of samples
                                which must be evenly distributable
                                between channels and bits-per-sample*/
+
+    Py_ssize_t buffer_exports;   /*the number of outstanding buffer views
+                                   which must be 0 before resizing "samples"*/
+    Py_ssize_t buffer_shape[2];  /*the frames x channels shape
+                                   of exported buffer views*/
+    Py_ssize_t buffer_strides[2];
 } pcm_FrameList;
 
 #ifdef PCM_MODULE
@@ -74,6 +80,15 @@ FrameList_channels(pcm_FrameList *self, void* closure);
 PyObject*
 FrameList_bits_per_sample(pcm_FrameList *self, void* closure);
 
+PyObject*
+FrameList_array_interface(pcm_FrameList *self, void* closure);
+
+int
+FrameList_getbuffer(pcm_FrameList *self, Py_buffer *view, int flags);
+
+void
+FrameList_releasebuffer(pcm_FrameList *self, Py_buffer *view);
+
 Py_ssize_t
 FrameList_len(pcm_FrameList *o);
 
@@ -147,6 +162,12 @@ typedef struct {
     unsigned samples_length;  /*the total number of samples
                                 which must be evenly distributable
                                 between channels*/
+
+    Py_ssize_t buffer_exports;   /*the number of outstanding buffer views
+                                   which must be 0 before resizing "samples"*/
+    Py_ssize_t buffer_shape[2];  /*the frames x channels shape
+                                   of exported buffer views*/
+    Py_ssize_t buffer_strides[2];
 } pcm_FloatFrameList;
 
 #ifdef PCM_MODULE
@@ -177,6 +198,15 @@ FloatFrameList_frames(pcm_FloatFrameList *self, void* closure);
 PyObject*
 FloatFrameList_channels(pcm_FloatFrameList *self, void* closure);
 
+PyObject*
+FloatFrameList_array_interface(pcm_FloatFrameList *self, void* closure);
+
+int
+FloatFrameList_getbuffer(pcm_FloatFrameList *self, Py_buffer *view, int flags);
+
+void
+FloatFrameList_releasebuffer(pcm_FloatFrameList *self, Py_buffer *view);
+
 Py_ssize_t
 FloatFrameList_len(pcm_FloatFrameList *o);
 
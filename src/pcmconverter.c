@@ -7,6 +7,8 @@
 #include "samplerate/samplerate.h"
 #include "pcmconverter.h"
 #include "dither.c"
+#include <math.h>
+#include <string.h>
 
 /********************************************************
  Audio Tools, a module and set of tools for manipulating audio data
@@ -27,6 +29,10 @@
  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
 *******************************************************/
 
+#ifndef M_PI
+#define M_PI 3.14159265358979323846
+#endif
+
 #ifndef MIN
 #define MIN(x, y) ((x) < (y) ? (x) : (y))
 #endif
@@ -316,6 +322,24 @@ Downmixer_close(pcmconverter_Downmixer *self, PyObject *args)
 /*the amount of PCM frames to resample at once*/
 #define RESAMPLER_BLOCK_SIZE 4096
 
+/*the most phases a polyphase filter may have,
+  enough for 44100 <-> 48000, 44100 <-> 96000, 88200 -> 44100
+  and 96000 -> 48000 conversions*/
+#define POLYPHASE_MAX_PHASES 320
+
+/*resampler qualities from slowest to fastest*/
+static const struct {
+    const char *name;
+    int converter;      /*libsamplerate converter type*/
+    unsigned taps;      /*polyphase taps per phase, or 0 if not used*/
+    double rolloff;     /*polyphase cutoff as a fraction of Nyquist*/
+} RESAMPLER_QUALITIES[] = {
+    {"best", SRC_SINC_BEST_QUALITY, 0, 0.0},
+    {"medium", SRC_SINC_MEDIUM_QUALITY, 128, 0.95},
+    {"fastest", SRC_SINC_FASTEST, 32, 0.90},
+    {"linear", SRC_LINEAR, 0, 0.0}
+};
+
 static PyObject*
 Resampler_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
 {
@@ -329,18 +353,23 @@ Resampler_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
 int
 Resampler_init(pcmconverter_Resampler *self, PyObject *args, PyObject *kwds)
 {
+    static char *kwlist[] = {"pcmreader", "sample_rate", "quality", NULL};
+    const char *quality_name = RESAMPLER_QUALITIES[0].name;
+    unsigned quality;
     int error;
 
     self->pcmreader = NULL;
     self->src_state = NULL;
     self->src_data.data_in = NULL;
     self->src_data.data_out = NULL;
+    self->polyphase = NULL;
     self->audiotools_pcm = NULL;
 
-    if (!PyArg_ParseTuple(args, "O&i",
-                          py_obj_to_pcmreader,
-                          &(self->pcmreader),
-                          &(self->sample_rate)))
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O&i|s", kwlist,
+                                     py_obj_to_pcmreader,
+                                     &(self->pcmreader),
+                                     &(self->sample_rate),
+                                     &quality_name))
         return -1;
 
     /*basic sanity checking*/
@@ -350,10 +379,41 @@ Resampler_init(pcmconverter_Resampler *self, PyObject *args, PyObject *kwds)
         return -1;
     }
 
-    /*allocate fresh resampler state*/
-    self->src_state = src_new(SRC_SINC_BEST_QUALITY,
+    for (quality = 0;
+         quality < (sizeof(RESAMPLER_QUALITIES) /
+                    sizeof(RESAMPLER_QUALITIES[0]));
+         quality++) {
+        if (!strcmp(quality_name, RESAMPLER_QUALITIES[quality].name))
+            break;
+    }
+    if (quality == (sizeof(RESAMPLER_QUALITIES) /
+                    sizeof(RESAMPLER_QUALITIES[0]))) {
+        PyErr_SetString(PyExc_ValueError, "unsupported resampler quality");
+        return -1;
+    }
+
+    if ((self->audiotools_pcm = open_audiotools_pcm()) == NULL)
+        return -1;
+
+    /*use a polyphase filter for small exact ratios, if possible*/
+    if (RESAMPLER_QUALITIES[quality].taps &&
+        ((self->polyphase =
+          polyphase_new(self->pcmreader->sample_rate,
+                        self->sample_rate,
+                        self->pcmreader->channels,
+                        RESAMPLER_QUALITIES[quality].taps,
+                        RESAMPLER_QUALITIES[quality].rolloff)) != NULL)) {
+        return 0;
+    }
+
+    /*otherwise, allocate fresh resampler state*/
+    self->src_state = src_new(RESAMPLER_QUALITIES[quality].converter,
                               self->pcmreader->channels,
                               &error);
+    if (self->src_state == NULL) {
+        PyErr_SetString(PyExc_ValueError, src_strerror(error));
+        return -1;
+    }
 
     /*allocate fresh resampler I/O state*/
     self->src_data.data_in =
@@ -371,9 +431,6 @@ Resampler_init(pcmconverter_Resampler *self, PyObject *args, PyObject *kwds)
 
     self->src_data.end_of_input = 0;
 
-    if ((self->audiotools_pcm = open_audiotools_pcm()) == NULL)
-        return -1;
-
     return 0;
 }
 
@@ -384,6 +441,8 @@ Resampler_dealloc(pcmconverter_Resampler *self)
         self->pcmreader->del(self->pcmreader);
     if (self->src_state)
         src_delete(self->src_state);
+    if (self->polyphase)
+        polyphase_free(self->polyphase);
     free(self->src_data.data_in);
     free(self->src_data.data_out);
     Py_XDECREF(self->audiotools_pcm);
@@ -397,17 +456,23 @@ Resampler_read(pcmconverter_Resampler *self, PyObject *args)
     const unsigned channels = self->pcmreader->channels;
     const unsigned bits_per_sample = self->pcmreader->bits_per_sample;
     int pcm_data[RESAMPLER_BLOCK_SIZE * channels];
-    const unsigned frames_read =
-        self->pcmreader->read(
-            self->pcmreader,
-            (unsigned)(RESAMPLER_BLOCK_SIZE - self->src_data.input_frames),
-            pcm_data);
+    unsigned frames_read;
     int_to_double_f i_to_f_conv = int_to_double_converter(bits_per_sample);
     double_to_int_f f_to_i_conv = double_to_int_converter(bits_per_sample);
     int i;
     int process_result;
     pcm_FrameList *framelist;
 
+    if (self->polyphase) {
+        return Resampler_read_polyphase(self);
+    }
+
+    frames_read =
+        self->pcmreader->read(
+            self->pcmreader,
+            (unsigned)(RESAMPLER_BLOCK_SIZE - self->src_data.input_frames),
+            pcm_data);
+
     if (!frames_read && (self->pcmreader->status != PCM_OK)) {
         return NULL;
     }
@@ -448,6 +513,235 @@ Resampler_read(pcmconverter_Resampler *self, PyObject *args)
     return (PyObject*)framelist;
 }
 
+static struct polyphase*
+polyphase_new(int input_rate,
+              int output_rate,
+              unsigned channels,
+              unsigned taps,
+              double rolloff)
+{
+    int a = input_rate;
+    int b = output_rate;
+    unsigned up;
+    unsigned down;
+    double ratio;
+    double cutoff;
+    double half_width;
+    struct polyphase *polyphase;
+    unsigned p;
+
+    /*reduce the ratio by the rates' greatest common divisor*/
+    while (b) {
+        const int t = a % b;
+        a = b;
+        b = t;
+    }
+    up = (unsigned)(output_rate / a);
+    down = (unsigned)(input_rate / a);
+
+    if (up > POLYPHASE_MAX_PHASES) {
+        return NULL;
+    }
+
+    /*when downsampling, widen the filter to keep its cutoff
+      below the output's Nyquist frequency with the same steepness*/
+    ratio = (double)up / (double)down;
+    if (ratio < 1.0) {
+        taps = (unsigned)ceil(taps / ratio);
+        taps += (taps % 2);
+        cutoff = 0.5 * rolloff * ratio;
+    } else {
+        cutoff = 0.5 * rolloff;
+    }
+    half_width = taps / 2;
+
+    polyphase = malloc(sizeof(struct polyphase));
+    polyphase->up = up;
+    polyphase->down = down;
+    polyphase->taps = taps;
+    polyphase->coefficients = malloc(sizeof(double) * up * taps);
+    polyphase->history_size = RESAMPLER_BLOCK_SIZE + taps;
+    polyphase->history =
+        malloc(sizeof(double) * polyphase->history_size * channels);
+    polyphase->history_frames = 0;
+    polyphase->history_start = 0;
+    polyphase->input_frames = 0;
+    polyphase->output_frames = 0;
+    polyphase->end_of_input = 0;
+
+    /*phase p's tap k is applied to the input PCM frame
+      (taps / 2 - 1 - k) + p / up frames before the output PCM frame
+
+      each phase is a Blackman-windowed sinc
+      normalized to unity gain at DC*/
+    for (p = 0; p < up; p++) {
+        double *phase = polyphase->coefficients + (p * taps);
+        double sum = 0.0;
+        unsigned k;
+
+        for (k = 0; k < taps; k++) {
+            const double t =
+                ((double)k - (half_width - 1.0)) - ((double)p / (double)up);
+            const double x = 2.0 * cutoff * t;
+            const double sinc = (x == 0.0) ? 1.0 : sin(M_PI * x) / (M_PI * x);
+            const double window = (fabs(t) >= half_width) ? 0.0 :
+                (0.42 +
+                 0.5 * cos(M_PI * t / half_width) +
+                 0.08 * cos(2.0 * M_PI * t / half_width));
+            phase[k] = 2.0 * cutoff * sinc * window;
+            sum += phase[k];
+        }
+        for (k = 0; k < taps; k++) {
+            phase[k] /= sum;
+        }
+    }
+
+    return polyphase;
+}
+
+static void
+polyphase_free(struct polyphase *polyphase)
+{
+    free(polyphase->coefficients);
+    free(polyphase->history);
+    free(polyphase);
+}
+
+static unsigned
+polyphase_ready(const struct polyphase *polyphase)
+{
+    const uint64_t up = polyphase->up;
+    const uint64_t down = polyphase->down;
+    const uint64_t half_width = polyphase->taps / 2;
+    uint64_t end;
+
+    if (polyphase->end_of_input) {
+        /*output frame n exists if (n + 1) * down <= input * up
+          which matches audiotools.resampled_frame_count()*/
+        end = (polyphase->input_frames * up) / down;
+    } else if (polyphase->input_frames > half_width) {
+        /*output frame n centered on input frame (n * down) / up
+          is ready once the input frames its last tap needs are read*/
+        end = (((polyphase->input_frames - half_width) * up) +
+               (down - 1)) / down;
+    } else {
+        end = 0;
+    }
+
+    if (end > polyphase->output_frames) {
+        return (unsigned)(end - polyphase->output_frames);
+    } else {
+        return 0;
+    }
+}
+
+static PyObject*
+Resampler_read_polyphase(pcmconverter_Resampler *self)
+{
+    struct polyphase *polyphase = self->polyphase;
+    const unsigned channels = self->pcmreader->channels;
+    const unsigned bits_per_sample = self->pcmreader->bits_per_sample;
+    const unsigned taps = polyphase->taps;
+    const int64_t half_width = taps / 2;
+    int pcm_data[RESAMPLER_BLOCK_SIZE * channels];
+    int_to_double_f i_to_f_conv = int_to_double_converter(bits_per_sample);
+    double_to_int_f f_to_i_conv = double_to_int_converter(bits_per_sample);
+    unsigned ready;
+    pcm_FrameList *framelist;
+    unsigned i;
+    int64_t first_needed;
+
+    /*read input until some output is ready or input is exhausted,
+      since an empty FrameList indicates the end of the stream*/
+    do {
+        const unsigned frames_read =
+            self->pcmreader->read(self->pcmreader,
+                                  RESAMPLER_BLOCK_SIZE,
+                                  pcm_data);
+        double *history;
+
+        if (!frames_read && (self->pcmreader->status != PCM_OK)) {
+            return NULL;
+        }
+
+        if (frames_read == 0) {
+            polyphase->end_of_input = 1;
+            continue;
+        }
+
+        /*append data to history as doubles, growing it if necessary*/
+        if ((polyphase->history_frames + frames_read) >
+            polyphase->history_size) {
+            polyphase->history_size =
+                polyphase->history_frames + frames_read;
+            polyphase->history =
+                realloc(polyphase->history,
+                        sizeof(double) * polyphase->history_size * channels);
+        }
+        history = polyphase->history + (polyphase->history_frames * channels);
+        for (i = 0; i < (frames_read * channels); i++) {
+            history[i] = i_to_f_conv(pcm_data[i]);
+        }
+        polyphase->history_frames += frames_read;
+        polyphase->input_frames += frames_read;
+    } while (((ready = polyphase_ready(polyphase)) == 0) &&
+             !polyphase->end_of_input);
+
+    /*build FrameList from filtered history*/
+    framelist = new_FrameList(self->audiotools_pcm,
+                              channels,
+                              bits_per_sample,
+                              ready);
+
+    for (i = 0; i < ready; i++) {
+        const uint64_t position = polyphase->output_frames * polyphase->down;
+        const int64_t center = (int64_t)(position / polyphase->up);
+        const double *phase = polyphase->coefficients +
+            ((position % polyphase->up) * taps);
+        /*the input frame the first tap applies to,
+          which may precede the start of the stream*/
+        const int64_t start = center - (half_width - 1);
+        unsigned c;
+
+        for (c = 0; c < channels; c++) {
+            double sum = 0.0;
+            unsigned k;
+            for (k = 0; k < taps; k++) {
+                const int64_t frame = start + k;
+                /*frames outside the stream are silence*/
+                if ((frame >= (int64_t)polyphase->history_start) &&
+                    (frame < (int64_t)polyphase->input_frames)) {
+                    sum += phase[k] *
+                        polyphase->history[
+                            (frame - polyphase->history_start) * channels + c];
+                }
+            }
+            framelist->samples[i * channels + c] =
+                f_to_i_conv(sum > 1.0 ? 1.0 : sum < -1.0 ? -1.0 : sum);
+        }
+
+        polyphase->output_frames++;
+    }
+
+    /*discard history no longer needed by the next output frame*/
+    first_needed =
+        (int64_t)((polyphase->output_frames * polyphase->down) /
+                  polyphase->up) - (half_width - 1);
+    if (first_needed > (int64_t)polyphase->history_start) {
+        const unsigned discard =
+            (unsigned)MIN(first_needed - (int64_t)polyphase->history_start,
+                          (int64_t)polyphase->history_frames);
+        memmove(polyphase->history,
+                polyphase->history + (discard * channels),
+                (polyphase->history_frames - discard) *
+                channels * sizeof(double));
+        polyphase->history_frames -= discard;
+        polyphase->history_start += discard;
+    }
+
+    return (PyObject*)framelist;
+}
+
 static PyObject*
 Resampler_close(pcmconverter_Resampler *self, PyObject *args)
 {
@@ -200,12 +200,32 @@ PyTypeObject pcmconverter_DownmixerType = {
     Downmixer_new,             /* tp_new */
 };
 
+/*a polyphase windowed-sinc filter for resampling by
+  an exact ratio of up / down, used in place of libsamplerate
+  for small ratios when full quality isn't required*/
+struct polyphase {
+    unsigned up;                     /*output frames per down input frames*/
+    unsigned down;                   /*input frames per up output frames*/
+    unsigned taps;                   /*filter taps per phase*/
+    double *coefficients;            /*up phases of taps coefficients*/
+
+    double *history;                 /*buffered input samples, interleaved*/
+    unsigned history_frames;         /*PCM frames in history*/
+    unsigned history_size;           /*PCM frames history may hold*/
+    uint64_t history_start;          /*index of history's first PCM frame*/
+
+    uint64_t input_frames;           /*total PCM frames read from input*/
+    uint64_t output_frames;          /*total PCM frames output*/
+    int end_of_input;
+};
+
 typedef struct {
     PyObject_HEAD
 
     struct PCMReader *pcmreader;
     SRC_STATE *src_state;            /*libsamplerate's internal state*/
     SRC_DATA src_data;               /*libsamplerate's processing state*/
+    struct polyphase *polyphase;     /*used instead of libsamplerate if set*/
     int sample_rate;                 /*the output sample rate*/
     PyObject* audiotools_pcm;
 } pcmconverter_Resampler;
@@ -237,6 +257,30 @@ Resampler_dealloc(pcmconverter_Resampler *self);
 int
 Resampler_init(pcmconverter_Resampler *self, PyObject *args, PyObject *kwds);
 
+/*returns a new polyphase filter for converting from
+  input_rate to output_rate with the given number of channels,
+  the given taps per phase at 1:1 and the given low-pass rolloff
+  or NULL if the reduced ratio has too many phases*/
+static struct polyphase*
+polyphase_new(int input_rate,
+              int output_rate,
+              unsigned channels,
+              unsigned taps,
+              double rolloff);
+
+static void
+polyphase_free(struct polyphase *polyphase);
+
+/*returns the number of PCM frames which may be output
+  given the input read so far*/
+static unsigned
+polyphase_ready(const struct polyphase *polyphase);
+
+/*resamples PCM frames through the polyphase filter
+  and returns a new FrameList or NULL with an exception set*/
+static PyObject*
+Resampler_read_polyphase(pcmconverter_Resampler *self);
+
 PyGetSetDef Resampler_getseters[] = {
     {"sample_rate", (getter)Resampler_sample_rate, NULL, "sample rate", NULL},
     {"bits_per_sample", (getter)Resampler_bits_per_sample, NULL, "bits per sample", NULL},
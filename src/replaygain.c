@@ -64,6 +64,10 @@ PyMethodDef ReplayGain_methods[] = {
      METH_NOARGS, "album_peak() -> album peak float"},
     {"next_title", (PyCFunction)ReplayGain_next_title,
      METH_NOARGS, "call after each title is completed"},
+    {"title_histogram", (PyCFunction)ReplayGain_title_histogram,
+     METH_NOARGS, "title_histogram() -> {bucket:count, ...}"},
+    {"add_title", (PyCFunction)ReplayGain_add_title,
+     METH_VARARGS, "add_title(histogram, title_peak) -> None"},
     {NULL}
 };
 
@@ -374,6 +378,82 @@ ReplayGain_album_peak(replaygain_ReplayGain *self)
     return Py_BuildValue("d", self->album_peak);
 }
 
+PyObject*
+ReplayGain_title_histogram(replaygain_ReplayGain *self)
+{
+    /*returns only non-empty buckets
+      since most of the histogram is typically empty*/
+    PyObject *histogram = PyDict_New();
+    int i;
+
+    if (histogram == NULL)
+        return NULL;
+
+    for (i = 0; i < (int)(sizeof(self->A)/sizeof(*(self->A))); i++) {
+        if (self->A[i]) {
+            PyObject *bucket = Py_BuildValue("i", i);
+            PyObject *count = PyLong_FromUnsignedLong(self->A[i]);
+            int result;
+            if ((bucket == NULL) || (count == NULL)) {
+                Py_XDECREF(bucket);
+                Py_XDECREF(count);
+                Py_DECREF(histogram);
+                return NULL;
+            }
+            result = PyDict_SetItem(histogram, bucket, count);
+            Py_DECREF(bucket);
+            Py_DECREF(count);
+            if (result == -1) {
+                Py_DECREF(histogram);
+                return NULL;
+            }
+        }
+    }
+
+    return histogram;
+}
+
+PyObject*
+ReplayGain_add_title(replaygain_ReplayGain *self, PyObject *args)
+{
+    PyObject *histogram;
+    double title_peak;
+    PyObject *bucket;
+    PyObject *count;
+    Py_ssize_t pos = 0;
+
+    if (!PyArg_ParseTuple(args, "O!d", &PyDict_Type, &histogram, &title_peak))
+        return NULL;
+
+    /*validate the whole histogram before adding any of it*/
+    while (PyDict_Next(histogram, &pos, &bucket, &count)) {
+        const long bucket_i = PyLong_AsLong(bucket);
+        const long count_i = PyLong_AsLong(count);
+        if (((bucket_i == -1) || (count_i == -1)) && PyErr_Occurred()) {
+            return NULL;
+        }
+        if ((bucket_i < 0) ||
+            (bucket_i >= (long)(sizeof(self->B)/sizeof(*(self->B))))) {
+            PyErr_SetString(PyExc_ValueError, "histogram bucket out of range");
+            return NULL;
+        }
+        if (count_i < 0) {
+            PyErr_SetString(PyExc_ValueError, "histogram count must be >= 0");
+            return NULL;
+        }
+    }
+
+    pos = 0;
+    while (PyDict_Next(histogram, &pos, &bucket, &count)) {
+        self->B[PyLong_AsLong(bucket)] += (uint32_t)PyLong_AsLong(count);
+    }
+
+    self->album_peak = MAX(self->album_peak, title_peak);
+
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
 PyGetSetDef ReplayGainReader_getseters[] = {
     {"sample_rate",
      (getter)ReplayGainReader_sample_rate, NULL, "sample rate", NULL},
@@ -108,6 +108,12 @@ ReplayGain_album_gain(replaygain_ReplayGain *self);
 PyObject*
 ReplayGain_album_peak(replaygain_ReplayGain *self);
 
+PyObject*
+ReplayGain_title_histogram(replaygain_ReplayGain *self);
+
+PyObject*
+ReplayGain_add_title(replaygain_ReplayGain *self, PyObject *args);
+
 gain_calc_status
 ReplayGain_analyze_samples(replaygain_ReplayGain* self,
                            const double* left_samples,
@@ -292,6 +292,80 @@ class BufferedPCMReader(unittest.TestCase):
                           4096)
 
 
+class ThreadedPCMReader(unittest.TestCase):
+    @LIB_PCM
+    def test_pcm(self):
+        from time import sleep
+
+        class Counting_Reader(audiotools.PCMReader):
+            def __init__(self, pcmreader):
+                audiotools.PCMReader.__init__(
+                    self,
+                    sample_rate=pcmreader.sample_rate,
+                    channels=pcmreader.channels,
+                    channel_mask=pcmreader.channel_mask,
+                    bits_per_sample=pcmreader.bits_per_sample)
+                self.pcmreader = pcmreader
+                self.frames_read = 0
+
+            def read(self, pcm_frames):
+                framelist = self.pcmreader.read(pcm_frames)
+                self.frames_read += framelist.frames
+                return framelist
+
+            def close(self):
+                self.pcmreader.close()
+
+        # ensure all frames pass through, bounded or not
+        for buffer_frames in [None, 100, 1000, 4096 * 4]:
+            reader = audiotools.ThreadedPCMReader(
+                EXACT_BLANK_PCM_Reader(44100 * 5), buffer_frames)
+            total_frames = 0
+            f = reader.read(4096)
+            while len(f) > 0:
+                total_frames += f.frames
+                f = reader.read(4096)
+            self.assertEqual(total_frames, 44100 * 5)
+
+            # reading an exhausted stream returns empty FrameLists
+            for i in range(10):
+                self.assertEqual(len(reader.read(4096)), 0)
+
+            reader.close()
+            self.assertRaises(ValueError, reader.read, 4096)
+
+        self.assertRaises(ValueError,
+                          audiotools.ThreadedPCMReader,
+                          EXACT_BLANK_PCM_Reader(44100),
+                          0)
+
+        # ensure a bounded reader doesn't decode everything in advance
+        counter = Counting_Reader(EXACT_BLANK_PCM_Reader(44100 * 60))
+        reader = audiotools.ThreadedPCMReader(counter, 4096 * 4)
+        sleep(0.25)
+        # queued blocks plus the one waiting to be queued
+        self.assertLessEqual(counter.frames_read, 4096 * 5)
+
+        # and that closing a reader with a full queue doesn't block
+        reader.close()
+        self.assertLess(counter.frames_read, 44100 * 60)
+
+        # even when the queue is small enough that
+        # the end of stream has nowhere to go
+        from threading import Thread
+
+        for buffer_frames in [1, 100, 4096, 4096 * 2]:
+            reader = audiotools.ThreadedPCMReader(
+                EXACT_BLANK_PCM_Reader(44100 * 60), buffer_frames)
+            reader.read(4096)
+            sleep(0.1)
+            closer = Thread(target=reader.close)
+            closer.daemon = True
+            closer.start()
+            closer.join(5)
+            self.assertFalse(closer.is_alive())
+
+
 class LimitedPCMReader(unittest.TestCase):
     @LIB_PCM
     def test_pcm(self):
@@ -426,6 +500,67 @@ class PCMReaderWindow(unittest.TestCase):
                 # closes the main PCMReader also
                 self.assertRaises(ValueError, main_reader.read, 2)
 
+    @LIB_PCM
+    def test_seek(self):
+        from audiotools.pcm import from_list
+
+        class BlockSeekReader(audiotools.PCMFileReader):
+            # seeks only to multiples of 4 PCM frames
+            def __init__(self, data):
+                audiotools.PCMFileReader.__init__(
+                    self,
+                    BytesIO(data),
+                    sample_rate=44100,
+                    channels=1,
+                    channel_mask=0x4,
+                    bits_per_sample=16,
+                    signed=True,
+                    big_endian=True)
+                self.frames_read = 0
+
+            def read(self, pcm_frames):
+                frame = audiotools.PCMFileReader.read(self, pcm_frames)
+                self.frames_read += frame.frames
+                return frame
+
+            def seek(self, pcm_frames):
+                position = min(pcm_frames, 100) // 4 * 4
+                self.file.seek(position * 2)
+                return position
+
+        data = from_list(list(range(1, 101)), 1, 16, True).to_bytes(True,
+                                                                      True)
+
+        for initial_offset in range(-5, 110):
+            for use_seek in [False, True]:
+                main_reader = BlockSeekReader(data)
+                reader = audiotools.PCMReaderWindow(main_reader,
+                                                    initial_offset,
+                                                    10,
+                                                    use_seek=use_seek)
+                samples = []
+                f = reader.read(3)
+                while len(f) > 0:
+                    samples.extend(list(f))
+                    f = reader.read(3)
+
+                target_samples = list(range(1, 101))
+                if initial_offset < 0:
+                    target_samples = (([0] * abs(initial_offset)) +
+                                      target_samples)
+                else:
+                    target_samples = target_samples[initial_offset:]
+                target_samples = (target_samples + [0] * 10)[0:10]
+
+                self.assertEqual(samples, target_samples)
+
+                if use_seek and (initial_offset > 0):
+                    # only the frames after the seek point are decoded
+                    self.assertLessEqual(
+                        main_reader.frames_read,
+                        (initial_offset % 4) + 10 + 3)
+                reader.close()
+
 
 class Sines(unittest.TestCase):
     @LIB_PCM
@@ -860,6 +995,62 @@ class PCMConverter(unittest.TestCase):
                 # when converter is closed
                 self.assertRaises(ValueError, main_reader.read, 4096)
 
+    @LIB_PCM
+    def test_resampler_quality(self):
+        from audiotools.replaygain import ReplayGain
+
+        def sine(sample_rate):
+            return test_streams.Sine16_Stereo(sample_rate * 2, sample_rate,
+                                              441.0, 0.50,
+                                              4410.0, 0.49, 1.0)
+
+        def replay_gain(reader):
+            gain = ReplayGain(reader.sample_rate)
+            audiotools.transfer_data(reader.read, gain.update)
+            reader.close()
+            return gain.title_gain()
+
+        self.assertRaises(ValueError,
+                          audiotools.PCMConverter,
+                          sine(44100), 48000, 2, 0x3, 16, "foo")
+
+        for (in_rate, out_rate) in [(44100, 48000),
+                                    (48000, 44100),
+                                    (96000, 48000),
+                                    (88200, 44100),
+                                    (44100, 32000),
+                                    (44100, 8000)]:
+            best_gain = replay_gain(
+                audiotools.PCMConverter(sine(in_rate),
+                                        out_rate, 2, 0x3, 16, "best"))
+
+            for quality in audiotools.RESAMPLER_QUALITIES:
+                reader = audiotools.PCMConverter(sine(in_rate),
+                                                 out_rate, 2, 0x3, 16,
+                                                 quality)
+                self.assertEqual(reader.sample_rate, out_rate)
+
+                # the polyphase filters output exactly as many
+                # PCM frames as expected
+                if quality in ("medium", "fastest"):
+                    frames = []
+                    audiotools.transfer_data(reader.read, frames.append)
+                    self.assertEqual(sum([f.frames for f in frames]),
+                                     audiotools.resampled_frame_count(
+                                         in_rate * 2, in_rate, out_rate))
+                    self.assertEqual(len(reader.read(4096)), 0)
+                    reader.close()
+                    self.assertRaises(ValueError, reader.read, 4096)
+
+            # ReplayGain's resampler quality stays within tolerance
+            self.assertLess(
+                abs(replay_gain(
+                    audiotools.PCMConverter(
+                        sine(in_rate), out_rate, 2, 0x3, 16,
+                        audiotools.REPLAY_GAIN_RESAMPLER_QUALITY)) -
+                    best_gain),
+                0.1)
+
 
 class Test_ReplayGain(unittest.TestCase):
     @LIB_CORE
@@ -915,6 +1106,185 @@ class Test_filename_to_type(unittest.TestCase):
             temp.close()
 
 
+class Test_file_type(unittest.TestCase):
+    @LIB_CORE
+    def test_register(self):
+        def probe(header, file):
+            return audiotools.WaveAudio if (header[6:8] == b"OK") else None
+
+        probes = dict((k, list(v)) for (k, v) in
+                      audiotools.__file_type_probes__.items())
+        keys = list(audiotools.__file_type_keys__)
+        header_size = audiotools.__file_type_header_size__
+        try:
+            audiotools.register_file_type(b"\x00\x00",
+                                          probe,
+                                          offset=2,
+                                          header_size=40)
+            audiotools.register_file_type(b"XYZZ", audiotools.AuAudio)
+
+            self.assertEqual(
+                audiotools.file_type(BytesIO(b"AB\x00\x00ABOK")),
+                None)
+            self.assertEqual(
+                audiotools.file_type(
+                    BytesIO(b"AB\x00\x00ABOK" + b"\x00" * 32)),
+                audiotools.WaveAudio)
+            self.assertEqual(
+                audiotools.file_type(
+                    BytesIO(b"AB\x00\x00ABNO" + b"\x00" * 32)),
+                None)
+            self.assertEqual(audiotools.file_type(BytesIO(b"XYZZ")),
+                             audiotools.AuAudio)
+
+            # only probes registered as ID3v2-wrappable
+            # are consulted after an ID3v2 tag
+            id3v2 = b"ID3\x03\x00\x00\x00\x00\x00\x10" + b"\x00" * 16
+            self.assertEqual(audiotools.file_type(BytesIO(id3v2 + b"XYZZ")),
+                             None)
+            self.assertEqual(audiotools.file_type(BytesIO(id3v2 + b"fLaC")),
+                             audiotools.FlacAudio)
+        finally:
+            audiotools.__file_type_probes__.clear()
+            audiotools.__file_type_probes__.update(probes)
+            del(audiotools.__file_type_keys__[:])
+            audiotools.__file_type_keys__.extend(keys)
+            audiotools.__file_type_header_size__ = header_size
+
+    @LIB_CORE
+    def test_invalid_id3v2(self):
+        # ID3v2 tags with invalid sync-safe sizes aren't skipped
+        # so the file is of unknown type
+        invalid = b"ID3\x03\x00\x00\xff\xff\xff\xff" + b"\x00" * 64
+        self.assertEqual(audiotools.file_type(BytesIO(invalid)), None)
+
+        # including when stacked after a valid tag
+        valid = b"ID3\x03\x00\x00\x00\x00\x00\x10" + b"\x00" * 16
+        self.assertEqual(audiotools.file_type(BytesIO(valid + invalid)),
+                         None)
+
+        with tempfile.NamedTemporaryFile() as temp:
+            temp.write(invalid)
+            temp.flush()
+            self.assertRaises(audiotools.UnsupportedFile,
+                              audiotools.open,
+                              temp.name)
+
+    @FORMAT_ALAC
+    def test_m4a_atoms(self):
+        class ReadCounter(BytesIO):
+            def __init__(self, data):
+                BytesIO.__init__(self, data)
+                self.bytes_read = 0
+
+            def read(self, *args):
+                data = BytesIO.read(self, *args)
+                self.bytes_read += len(data)
+                return data
+
+        with tempfile.NamedTemporaryFile(suffix=".m4a") as temp:
+            audiotools.ALACAudio.from_pcm(temp.name, BLANK_PCM_Reader(1))
+            with open(temp.name, "rb") as f:
+                data = f.read()
+
+        atoms = []
+        offset = 0
+        while offset < len(data):
+            (size, name) = struct.unpack(">I4s", data[offset:offset + 8])
+            atoms.append((name, data[offset:offset + size]))
+            offset += size
+        atoms = dict(atoms)
+
+        # a large "mdat" atom ahead of "moov" is stepped over
+        # rather than read
+        mdat = struct.pack(">I4s", 8 + 2 ** 20, b"mdat") + b"\x00" * 2 ** 20
+        for layout in [[b"ftyp", b"moov", b"free", b"mdat"],
+                       [b"ftyp", b"free", b"mdat", b"moov"]]:
+            f = ReadCounter(b"".join([atoms[name] if name != b"mdat"
+                                      else mdat for name in layout]))
+            self.assertEqual(audiotools.file_type(f),
+                             audiotools.ALACAudio)
+            self.assertLess(f.bytes_read, 1024)
+
+        # 64-bit atom sizes are supported
+        mdat64 = (struct.pack(">I4sQ", 1, b"mdat", 16 + 2 ** 20) +
+                  b"\x00" * 2 ** 20)
+        f = ReadCounter(atoms[b"ftyp"] + mdat64 + atoms[b"moov"])
+        self.assertEqual(audiotools.file_type(f), audiotools.ALACAudio)
+        self.assertLess(f.bytes_read, 1024)
+
+        # files without a "moov" atom are unknown
+        self.assertEqual(
+            audiotools.file_type(BytesIO(atoms[b"ftyp"] + mdat)),
+            None)
+
+        # as are those truncated before "stsd"
+        for i in range(64):
+            self.assertEqual(
+                audiotools.file_type(
+                    BytesIO(atoms[b"ftyp"] + atoms[b"moov"][0:i])),
+                None)
+
+    @LIB_CORE
+    def test_lazy_import(self):
+        import subprocess
+
+        if sys.version_info < (3, 7):
+            # older Pythons load every format up front
+            return
+
+        with tempfile.NamedTemporaryFile(suffix=".flac") as temp:
+            audiotools.FlacAudio.from_pcm(temp.name, BLANK_PCM_Reader(1))
+
+            # importing audiotools imports no format modules
+            # and identifying a file imports only that file's module
+            script = "; ".join(
+                ["import sys",
+                 "import audiotools",
+                 "before = [m for m in sys.modules " +
+                 "if m.startswith('audiotools.')]",
+                 "audiotools.open(sys.argv[1])",
+                 "after = [m for m in sys.modules " +
+                 "if m.startswith('audiotools.')]",
+                 "print(sorted(set(after) - set(before)))",
+                 "print('audiotools.flac' in before)"])
+            output = subprocess.check_output(
+                [sys.executable, "-c", script, temp.name],
+                env=dict(os.environ,
+                         PYTHONPATH=os.pathsep.join(sys.path))
+            ).decode("ascii").splitlines()
+
+        from ast import literal_eval
+
+        imported = literal_eval(output[0])
+        self.assertIn("audiotools.flac", imported)
+        for module in ["audiotools.mp3",
+                       "audiotools.m4a",
+                       "audiotools.vorbis",
+                       "audiotools.wavpack"]:
+            self.assertNotIn(module, imported)
+        self.assertEqual(output[1], "False")
+
+    @LIB_CORE
+    def test_lazy_attributes(self):
+        self.assertEqual(
+            set(audiotools.AVAILABLE_TYPES),
+            set(audiotools.__lazy__(class_name) for (type_name, class_name)
+                in audiotools.__LAZY_TYPES__))
+        for (type_name, class_name) in audiotools.__LAZY_TYPES__:
+            self.assertEqual(getattr(audiotools, class_name).NAME,
+                             type_name)
+        self.assertIn(audiotools.DEFAULT_TYPE, audiotools.TYPE_MAP)
+        self.assertRaises(AttributeError,
+                          getattr,
+                          audiotools,
+                          "NoSuchAudio")
+
+        # the same class is returned each time
+        from audiotools import FlacAudio
+        self.assertIs(audiotools.FlacAudio, FlacAudio)
+
+
 class Test_group_tracks(unittest.TestCase):
     @LIB_CORE
     def setUp(self):
@@ -1060,13 +1430,15 @@ class Test_open_directory(unittest.TestCase):
         track3_2 = self.make_track(subdir3, 2)
         track3_3 = self.make_track(subdir3, 3)
 
-        tracks = list(audiotools.open_directory(self.dir))
-        self.assertEqual([t.filename for t in tracks],
-                         [t.filename for t in
-                          [track0_1, track0_2, track0_3,
-                           track1_1, track1_2, track1_3,
-                           track3_1, track3_2, track3_3,
-                           track2_1, track2_2, track2_3]])
+        for workers in [1, 2, 4]:
+            tracks = list(audiotools.open_directory(self.dir,
+                                                    workers=workers))
+            self.assertEqual([t.filename for t in tracks],
+                             [t.filename for t in
+                              [track0_1, track0_2, track0_3,
+                               track1_1, track1_2, track1_3,
+                               track3_1, track3_2, track3_3,
+                               track2_1, track2_2, track2_3]])
 
 
 class Test_open_files(unittest.TestCase):
@@ -1105,6 +1477,270 @@ class Test_open_files(unittest.TestCase):
         self.assertEqual([t.filename for t in tracks],
                          [t.filename for t in [track1, track2, track3]])
 
+    @LIB_CORE
+    def test_workers(self):
+        tracks = [self.make_track(self.dir, i) for i in range(20, 0, -1)]
+        dummy1_name = os.path.join(self.dir, "dummy" + self.suffix)
+        with open(dummy1_name, "wb") as dummy1:
+            dummy1.write(b"Hello World")
+        filenames = [t.filename for t in tracks] + [dummy1_name]
+
+        for workers in [1, 2, 8, 32]:
+            for sorted in [True, False]:
+                opened = audiotools.open_files(filenames,
+                                               sorted=sorted,
+                                               workers=workers)
+                if sorted:
+                    self.assertEqual([t.filename for t in opened],
+                                     [t.filename for t in
+                                      audiotools.sorted_tracks(tracks)])
+                else:
+                    self.assertEqual([t.filename for t in opened],
+                                     [t.filename for t in tracks])
+
+        # unavailable formats are only reported once
+        class Unavailable(audiotools.FlacAudio):
+            NAME = "unavailable"
+            reported = []
+
+            @classmethod
+            def available(cls, system_binaries):
+                return False
+
+            @classmethod
+            def missing_components(cls, messenger):
+                cls.reported.append(cls.NAME)
+
+        file_type = audiotools.file_type
+        audiotools.file_type = lambda f: Unavailable
+        try:
+            unsupported = set()
+            for i in range(2):
+                self.assertEqual(
+                    audiotools.open_files(filenames,
+                                          messenger=audiotools.Messenger(
+                                              silent=True),
+                                          unsupported_formats=unsupported,
+                                          workers=8),
+                    [])
+        finally:
+            audiotools.file_type = file_type
+        self.assertEqual(Unavailable.reported, ["unavailable"])
+
+    @LIB_CORE
+    def test_cache(self):
+        from audiotools.filecache import AudioFileCache
+
+        track1 = self.make_track(self.dir, 1)
+        track2 = self.make_track(self.dir, 2)
+        track3 = self.make_track(self.dir, 3)
+        dummy1_name = os.path.join(self.dir, "4" + self.suffix)
+        with open(dummy1_name, "wb") as dummy1:
+            dummy1.write(b"Hello World")
+        filenames = [track1.filename, track2.filename,
+                     dummy1_name, track3.filename]
+        cache_name = os.path.join(self.dir, "cache.db")
+
+        with AudioFileCache(cache_name) as cache:
+            tracks = audiotools.open_files(filenames, cache=cache)
+            self.assertEqual([t.filename for t in tracks],
+                             [t.filename for t in [track1, track2, track3]])
+
+        def no_file_type(f):
+            raise AssertionError("file_type() called on cached file")
+
+        def no_get_metadata(self):
+            raise AssertionError("get_metadata() called on cached file")
+
+        # reopening unchanged files should read none of them
+        file_type = audiotools.file_type
+        get_metadata = self.output_type.get_metadata
+        audiotools.file_type = no_file_type
+        self.output_type.get_metadata = no_get_metadata
+        try:
+            with AudioFileCache(cache_name) as cache:
+                tracks = audiotools.open_files(filenames, cache=cache)
+        finally:
+            audiotools.file_type = file_type
+            self.output_type.get_metadata = get_metadata
+
+        self.assertEqual([t.filename for t in tracks],
+                         [t.filename for t in [track1, track2, track3]])
+        for (cached, track) in zip(tracks, [track1, track2, track3]):
+            self.assertIsInstance(cached, self.output_type)
+            self.assertEqual(cached.total_frames(), track.total_frames())
+            self.assertEqual(cached.get_metadata(), track.get_metadata())
+
+        # cached objects still pickle, for use by ExecProgressQueue
+        import pickle
+        self.assertEqual(
+            pickle.loads(pickle.dumps(tracks[0])).get_metadata(),
+            track1.get_metadata())
+
+        # retagging a cached file shouldn't return stale metadata
+        tracks[1].set_metadata(audiotools.MetaData(track_name=u"New Name",
+                                                   track_number=2))
+        self.assertEqual(tracks[1].get_metadata().track_name, u"New Name")
+        with AudioFileCache(cache_name) as cache:
+            tracks = audiotools.open_files(filenames, cache=cache)
+        self.assertEqual(tracks[1].get_metadata().track_name, u"New Name")
+
+        # least recently used entries are evicted past the maximum
+        with AudioFileCache(cache_name, max_entries=2) as cache:
+            audiotools.open_files(filenames, cache=cache)
+        file_type = audiotools.file_type
+        opened = []
+
+        def counting_file_type(f):
+            opened.append(f.name)
+            return file_type(f)
+
+        audiotools.file_type = counting_file_type
+        try:
+            with AudioFileCache(cache_name, max_entries=2) as cache:
+                audiotools.open_files(filenames, cache=cache)
+        finally:
+            audiotools.file_type = file_type
+        self.assertEqual(len(opened), 2)
+
+    @LIB_CORE
+    def test_cache_verified(self):
+        from audiotools.filecache import AudioFileCache
+
+        track1 = self.make_track(self.dir, 1)
+        track2 = self.make_track(self.dir, 2)
+        cache_name = os.path.join(self.dir, "cache.db")
+
+        with AudioFileCache(cache_name) as cache:
+            self.assertIsNone(cache.verified(track1.filename))
+            cache.set_verified(track1.filename)
+            # pending verification times are visible before flushing
+            self.assertIsNotNone(cache.verified(track1.filename))
+            self.assertIsNone(cache.verified(track2.filename))
+
+        with AudioFileCache(cache_name) as cache:
+            self.assertIsNotNone(cache.verified(track1.filename))
+            self.assertIsNone(cache.verified(track2.filename))
+
+            # evicting a file's entry doesn't forget its verification
+            cache.set_verified(track2.filename)
+            cache.flush()
+
+        with AudioFileCache(cache_name, max_entries=1) as cache:
+            audiotools.open_files([track1.filename, track2.filename],
+                                  cache=cache)
+        with AudioFileCache(cache_name) as cache:
+            self.assertIsNotNone(cache.verified(track1.filename))
+            self.assertIsNotNone(cache.verified(track2.filename))
+
+        # modifying a file invalidates its verification
+        track2.set_metadata(audiotools.MetaData(track_name=u"New Name"))
+        os.utime(track2.filename, (0, 0))
+        with AudioFileCache(cache_name) as cache:
+            self.assertIsNotNone(cache.verified(track1.filename))
+            self.assertIsNone(cache.verified(track2.filename))
+
+            cache.clear()
+            self.assertIsNone(cache.verified(track1.filename))
+
+        # missing files are never verified
+        with AudioFileCache(cache_name) as cache:
+            self.assertIsNone(
+                cache.verified(os.path.join(self.dir, "missing.flac")))
+
+        # AccurateRip matches are recorded apart from verification
+        results = [{"filename": u"track", "error": None}]
+        with AudioFileCache(cache_name) as cache:
+            self.assertIsNone(cache.accuraterip(track1.filename))
+            cache.set_accuraterip(track1.filename, results)
+            self.assertEqual(cache.accuraterip(track1.filename)[1], results)
+        with AudioFileCache(cache_name) as cache:
+            (matched, matched_results) = cache.accuraterip(track1.filename)
+            self.assertEqual(matched_results, results)
+            self.assertIsNone(cache.verified(track1.filename))
+            self.assertIsNone(cache.accuraterip(track2.filename))
+
+        os.utime(track1.filename, (0, 0))
+        with AudioFileCache(cache_name) as cache:
+            self.assertIsNone(cache.accuraterip(track1.filename))
+
+    @LIB_CORE
+    def test_cache_metadata(self):
+        import audiotools.filecache
+        from audiotools.filecache import AudioFileCache
+
+        track1 = self.make_track(self.dir, 1)
+        track2 = self.make_track(self.dir, 2)
+        filenames = [track1.filename, track2.filename]
+        metadata1 = track1.get_metadata()
+        metadata2 = track2.get_metadata()
+        cache_name = os.path.join(self.dir, "cache.db")
+
+        file_type = audiotools.file_type
+        get_metadata = self.output_type.get_metadata
+        opened = []
+        read = []
+
+        def counting_file_type(f):
+            opened.append(f.name)
+            return file_type(f)
+
+        def counting_get_metadata(self):
+            read.append(self.filename)
+            return get_metadata(self)
+
+        audiotools.file_type = counting_file_type
+        self.output_type.get_metadata = counting_get_metadata
+        try:
+            # caching a file doesn't read its metadata
+            with AudioFileCache(cache_name) as cache:
+                tracks = audiotools.open_files(filenames,
+                                               sorted=False,
+                                               cache=cache)
+                self.assertEqual(read, [])
+
+                # but reading it once caches it
+                self.assertEqual(tracks[0].get_metadata(), metadata1)
+                self.assertEqual(read, [track1.filename])
+
+            del(read[:])
+            with AudioFileCache(cache_name) as cache:
+                tracks = audiotools.open_files(filenames,
+                                               sorted=False,
+                                               cache=cache)
+                self.assertEqual(tracks[0].get_metadata(), metadata1)
+                self.assertEqual(tracks[1].get_metadata(), metadata2)
+            self.assertEqual(read, [track2.filename])
+            self.assertEqual(len(opened), 2)
+
+            # False opens files without any cache
+            del(opened[:])
+
+            def no_file_cache():
+                raise AssertionError("file_cache() called")
+
+            file_cache = audiotools.file_cache
+            audiotools.file_cache = no_file_cache
+            try:
+                tracks = audiotools.open_files(filenames, cache=False)
+                self.assertEqual(len(tracks), 2)
+                self.assertEqual(len(opened), 2)
+            finally:
+                audiotools.file_cache = file_cache
+
+            # entries from another cache format are discarded
+            del(opened[:])
+            audiotools.filecache.CACHE_FORMAT += 1
+            try:
+                with AudioFileCache(cache_name) as cache:
+                    audiotools.open_files(filenames, cache=cache)
+                self.assertEqual(len(opened), 2)
+            finally:
+                audiotools.filecache.CACHE_FORMAT -= 1
+        finally:
+            audiotools.file_type = file_type
+            self.output_type.get_metadata = get_metadata
+
 
 class Test_sorted_tracks(unittest.TestCase):
     @LIB_CORE
@@ -1836,6 +2472,40 @@ class TestFrameList(unittest.TestCase):
                           audiotools.pcm.FloatFrameList,
                           [0.0] * 4, -1)
 
+    @LIB_CORE
+    def test_buffer(self):
+        import audiotools.pcm
+        import struct
+
+        f = audiotools.pcm.from_list(list(range(-3, 3)), 2, 16, True)
+        view = memoryview(f)
+        self.assertEqual(view.format, "i")
+        self.assertEqual(view.itemsize, struct.calcsize("i"))
+        self.assertEqual(view.shape, (3, 2))
+        self.assertEqual(view.tolist(), [[-3, -2], [-1, 0], [1, 2]])
+        self.assertEqual(struct.unpack("6i", view.tobytes()),
+                         tuple(range(-3, 3)))
+        self.assertEqual(view.readonly, True)
+
+        # FrameLists can't be resized while views are outstanding
+        g = audiotools.pcm.from_list([4, 5], 2, 16, True)
+        self.assertRaises(BufferError, f.__iadd__, g)
+        view.release()
+        f += g
+        self.assertEqual(list(f), list(range(-3, 3)) + [4, 5])
+
+        # empty FrameLists export empty views
+        view = memoryview(audiotools.pcm.empty_framelist(2, 16))
+        self.assertEqual(view.shape, (0, 2))
+        self.assertEqual(view.tobytes(), b"")
+
+        interface = f.__array_interface__
+        self.assertEqual(interface["version"], 3)
+        self.assertEqual(interface["shape"], (f.frames, f.channels))
+        self.assertEqual(interface["typestr"][1:],
+                         "i%d" % (struct.calcsize("i")))
+        self.assertIs(interface["data"], f)
+
 
 class TestFloatFrameList(unittest.TestCase):
     @LIB_CORE
@@ -1969,6 +2639,24 @@ class TestFloatFrameList(unittest.TestCase):
                               audiotools.pcm.FrameList,
                               b"\x00" * 4, 2, bps, 1, 1)
 
+    @LIB_CORE
+    def test_buffer(self):
+        import audiotools.pcm
+
+        f = audiotools.pcm.FloatFrameList([0.5, -0.5, 1.0, 0.0], 2)
+        view = memoryview(f)
+        self.assertEqual(view.format, "d")
+        self.assertEqual(view.shape, (2, 2))
+        self.assertEqual(view.tolist(), [[0.5, -0.5], [1.0, 0.0]])
+        self.assertRaises(BufferError, f.__imul__, 2)
+        view.release()
+        f *= 2
+        self.assertEqual(f.frames, 4)
+
+        interface = f.__array_interface__
+        self.assertEqual(interface["shape"], (4, 2))
+        self.assertEqual(interface["typestr"][1:], "f8")
+
 
 class __SimpleChunkReader__:
     def __init__(self, chunks):
@@ -4542,6 +5230,95 @@ class TestReplayGain(unittest.TestCase):
             dummy1.close()
             dummy2.close()
 
+    @LIB_REPLAYGAIN
+    def test_histogram(self):
+        import audiotools.replaygain
+
+        def sines():
+            return [test_streams.Sine16_Stereo(44100, 44100,
+                                               441.0, 0.50,
+                                               4410.0, 0.49, 1.0),
+                    test_streams.Sine16_Stereo(88200, 44100,
+                                               8820.0, 0.70,
+                                               4410.0, 0.29, 1.0),
+                    test_streams.Sine16_Stereo(22050, 44100,
+                                               441.0, 0.10,
+                                               441.0, 0.10, 1.0)]
+
+        # album values accumulated one title at a time
+        gain = audiotools.replaygain.ReplayGain(44100)
+        for reader in sines():
+            audiotools.transfer_data(reader.read, gain.update)
+            gain.next_title()
+
+        # should match those merged from separate titles' histograms
+        merged = audiotools.replaygain.ReplayGain(44100)
+        for (reader, windows) in zip(sines(), [20, 40, 10]):
+            title = audiotools.replaygain.ReplayGain(44100)
+            audiotools.transfer_data(reader.read, title.update)
+            histogram = title.title_histogram()
+            # one entry per 50 millisecond window
+            self.assertEqual(sum(histogram.values()), windows)
+            merged.add_title(histogram, title.title_peak())
+
+        self.assertEqual(merged.album_gain(), gain.album_gain())
+        self.assertEqual(merged.album_peak(), gain.album_peak())
+
+        # as should those from ReplayGainCalculatorReaders
+        calculator = audiotools.ReplayGainCalculator(44100)
+        readers = [calculator.to_pcm(reader) for reader in sines()]
+        merged = audiotools.replaygain.ReplayGain(44100)
+        for reader in readers:
+            self.assertRaises(ValueError, reader.title_histogram)
+            audiotools.transfer_data(reader.read, lambda f: None)
+            reader.close()
+            merged.add_title(reader.title_histogram(), reader.title_peak())
+
+        self.assertEqual(merged.album_gain(), gain.album_gain())
+        self.assertEqual(merged.album_peak(), gain.album_peak())
+
+        # empty titles have empty histograms
+        self.assertEqual(
+            audiotools.replaygain.ReplayGain(44100).title_histogram(), {})
+
+        # invalid histograms are rejected
+        self.assertRaises(TypeError, merged.add_title, [], 0.0)
+        self.assertRaises(ValueError, merged.add_title, {-1: 1}, 0.0)
+        self.assertRaises(ValueError, merged.add_title, {12000: 1}, 0.0)
+        self.assertRaises(ValueError, merged.add_title, {0: -1}, 0.0)
+
+    @LIB_REPLAYGAIN
+    def test_calculate_workers(self):
+        temp_files = [tempfile.NamedTemporaryFile(suffix=".wav")
+                      for i in range(4)]
+        try:
+            tracks = [
+                audiotools.WaveAudio.from_pcm(
+                    temp.name,
+                    test_streams.Sine16_Stereo(44100 + (i * 11025),
+                                               44100,
+                                               441.0 * (i + 1), 0.50,
+                                               4410.0, 0.10 * (i + 1),
+                                               1.0))
+                for (i, temp) in enumerate(temp_files)]
+
+            serial = list(audiotools.calculate_replay_gain(tracks))
+
+            for workers in [2, 4, 8]:
+                progress_values = []
+                parallel = list(audiotools.calculate_replay_gain(
+                    tracks,
+                    lambda c, t: progress_values.append((c, t)),
+                    workers))
+                self.assertEqual(
+                    [(s[0].filename,) + s[1:] for s in serial],
+                    [(p[0].filename,) + p[1:] for p in parallel])
+                for (current, total) in progress_values:
+                    self.assertLessEqual(current, total)
+        finally:
+            for temp in temp_files:
+                temp.close()
+
 
 class testcuesheet(unittest.TestCase):
     def setUp(self):
@@ -4868,6 +5645,33 @@ class testcuesheet(unittest.TestCase):
             temp_sheet.close()
             self.assertEqual(re_read, sheet)
 
+    @LIB_CUESHEET
+    def test_repeated_parsing(self):
+        from audiotools import SheetException
+        from audiotools.text import ERR_CUE_SYNTAX_ERROR
+
+        # the lexer and parser are reused from one sheet to the next
+        # so no state from one parse should carry over to another
+        for sheet in self.__sheets__():
+            for i in range(3):
+                with tempfile.NamedTemporaryFile(
+                        suffix=self.suffix) as temp_sheet:
+                    temp_sheet.write(
+                        self.sheet_class.converted(sheet).build().encode(
+                            "UTF-8"))
+                    temp_sheet.flush()
+                    self.assertEqual(self.read_sheet(temp_sheet.name), sheet)
+
+                with tempfile.NamedTemporaryFile(
+                        suffix=self.suffix) as temp_sheet:
+                    temp_sheet.write(b"\n\nTRACK TRACK\n")
+                    temp_sheet.flush()
+                    try:
+                        self.read_sheet(temp_sheet.name)
+                        self.fail("SheetException not raised")
+                    except SheetException as err:
+                        self.assertEqual(str(err), ERR_CUE_SYNTAX_ERROR % (3))
+
     @LIB_CUESHEET
     def test_flags(self):
         from audiotools import Sheet, SheetTrack, SheetIndex
@@ -5069,6 +5873,11 @@ class test_flac_cuesheet(testcuesheet):
 
         self.assertTrue(True)
 
+    @LIB_CUESHEET
+    def test_repeated_parsing(self):
+        # FLAC cuesheets aren't parsed from text
+        self.assertTrue(True)
+
 
 #class test_oggflac_cuesheet(test_flac_cuesheet):
 #    def setUp(self):
@@ -6256,6 +7065,72 @@ class Test_Accuraterip(Test_FreeDB):
                               pcmreader.read,
                               too_many_samples.update)
 
+    @LIB_ACCURATERIP
+    def test_python_checksum(self):
+        from audiotools.accuraterip import Checksum, __Checksum__
+
+        track = audiotools.open("tone.flac")
+
+        # ensure Python checksums match reference values
+        for (is_first,
+             is_last,
+             checksums_v1,
+             checksum_v2) in [(False, False,
+                               [0xCA705E69, 0xF6E4AD26, 0x951FB12F],
+                               0x4781FC37),
+                              (True, False,
+                               [0x7CC66A55, 0xEE4DBEB4, 0x9A58C7EC],
+                               0x3ECA2C04),
+                              (False, True,
+                               [0x682F9316, 0xF819E862, 0x00DBAF4E],
+                               0x222E32FA),
+                              (True, True,
+                               [0x1A859F02, 0xEF82F9F0, 0x0614C60B],
+                               0x197662C7)]:
+            checksum = __Checksum__(total_pcm_frames=track.total_frames(),
+                                    sample_rate=track.sample_rate(),
+                                    is_first=is_first,
+                                    is_last=is_last,
+                                    pcm_frame_range=3,
+                                    accurateripv2_offset=1)
+            with audiotools.PCMReaderWindow(track.to_pcm(),
+                                            -1,
+                                            track.total_frames() + 2) as r:
+                audiotools.transfer_data(r.read, checksum.update)
+            self.assertEqual(checksum.checksums_v1(), checksums_v1)
+            self.assertEqual(checksum.checksum_v2(), checksum_v2)
+
+        # ensure Python and C checksums agree over wide offset ranges
+        # regardless of how the stream is split into FrameLists
+        for (total_pcm_frames,
+             pcm_frame_range,
+             is_first,
+             is_last) in [(1, 1, False, False),
+                          (1, 1, True, True),
+                          (20000, 301, True, False),
+                          (20000, 301, False, True),
+                          (7000, 5881, True, True)]:
+            samples = [random.randint(-0x8000, 0x7FFF) for i in
+                       range((total_pcm_frames + pcm_frame_range - 1) * 2)]
+            checksums = [c(total_pcm_frames=total_pcm_frames,
+                           is_first=is_first,
+                           is_last=is_last,
+                           pcm_frame_range=pcm_frame_range,
+                           accurateripv2_offset=pcm_frame_range // 2)
+                         for c in [Checksum, __Checksum__]]
+            i = 0
+            while i < len(samples):
+                size = random.randint(1, 4096) * 2
+                framelist = audiotools.pcm.from_list(samples[i:i + size],
+                                                     2, 16, True)
+                for checksum in checksums:
+                    checksum.update(framelist)
+                i += size
+            self.assertEqual(checksums[0].checksums_v1(),
+                             checksums[1].checksums_v1())
+            self.assertEqual(checksums[0].checksum_v2(),
+                             checksums[1].checksum_v2())
+
     @LIB_ACCURATERIP
     def test_perform_lookup(self):
         from audiotools.freedb import DiscID as FDiscID
@@ -6590,6 +7465,107 @@ class Test_Lookup(unittest.TestCase):
         time.sleep(1)
 
 
+class Test_transfer_data(unittest.TestCase):
+    @LIB_CORE
+    def test_files(self):
+        from audiotools.ape import limited_transfer_data
+
+        data = os.urandom(audiotools.BUFFER_SIZE * 3 + 17)
+
+        with tempfile.NamedTemporaryFile() as input_file:
+            input_file.write(data)
+            input_file.flush()
+
+            # regular files are copied from their current positions
+            # and left positioned just past the copied data
+            for (input_offset, output_prefix) in [(0, b""),
+                                                  (5, b"prefix"),
+                                                  (len(data), b"prefix"),
+                                                  (len(data) - 3, b"")]:
+                with tempfile.NamedTemporaryFile() as output_file:
+                    with open(input_file.name, "rb") as r:
+                        r.seek(input_offset, 0)
+                        output_file.write(output_prefix)
+                        audiotools.transfer_data(r.read, output_file.write)
+                        self.assertEqual(r.tell(), len(data))
+                        self.assertEqual(r.read(), b"")
+                    output_file.write(b"suffix")
+                    output_file.flush()
+                    with open(output_file.name, "rb") as r:
+                        self.assertEqual(r.read(),
+                                         output_prefix +
+                                         data[input_offset:] +
+                                         b"suffix")
+
+            for (input_offset, max_bytes) in [(0, 0),
+                                              (0, 1),
+                                              (3, audiotools.BUFFER_SIZE),
+                                              (7, len(data)),
+                                              (9, len(data) * 2)]:
+                with tempfile.NamedTemporaryFile() as output_file:
+                    with open(input_file.name, "rb") as r:
+                        r.seek(input_offset, 0)
+                        limited_transfer_data(r.read,
+                                              output_file.write,
+                                              max_bytes)
+                        copied = data[input_offset:input_offset + max_bytes]
+                        self.assertEqual(output_file.tell(), len(copied))
+                    output_file.flush()
+                    with open(output_file.name, "rb") as r:
+                        self.assertEqual(r.read(), copied)
+
+            # temporary file rewrites are also regular files
+            with tempfile.NamedTemporaryFile() as output_file:
+                rewrite = audiotools.TemporaryFile(output_file.name)
+                rewrite.write(b"header")
+                with open(input_file.name, "rb") as r:
+                    audiotools.transfer_data(r.read, rewrite.write)
+                rewrite.close()
+                with open(output_file.name, "rb") as r:
+                    self.assertEqual(r.read(), b"header" + data)
+
+        # non-file streams are copied as strings
+        output = BytesIO()
+        audiotools.transfer_data(BytesIO(data).read, output.write)
+        self.assertEqual(output.getvalue(), data)
+
+        # as are compressed files, despite having regular file descriptors
+        import gzip
+        import bz2
+
+        for compressed_open in [gzip.open, bz2.BZ2File]:
+            with tempfile.NamedTemporaryFile() as compressed_file:
+                with compressed_open(compressed_file.name, "wb") as w:
+                    w.write(data)
+                with tempfile.NamedTemporaryFile() as output_file:
+                    with compressed_open(compressed_file.name, "rb") as r:
+                        audiotools.transfer_data(r.read, output_file.write)
+                    output_file.flush()
+                    with open(output_file.name, "rb") as r:
+                        self.assertEqual(r.read(), data)
+                with tempfile.NamedTemporaryFile() as input_file:
+                    input_file.write(data)
+                    input_file.flush()
+                    with compressed_open(compressed_file.name, "wb") as w:
+                        with open(input_file.name, "rb") as r:
+                            audiotools.transfer_data(r.read, w.write)
+                    with compressed_open(compressed_file.name, "rb") as r:
+                        self.assertEqual(r.read(), data)
+
+        with tempfile.TemporaryFile() as output_file:
+            audiotools.transfer_data(BytesIO(data).read, output_file.write)
+            output_file.seek(0, 0)
+            self.assertEqual(output_file.read(), data)
+
+        with tempfile.NamedTemporaryFile() as input_file:
+            input_file.write(data)
+            input_file.flush()
+            output = BytesIO()
+            with open(input_file.name, "rb") as r:
+                audiotools.transfer_data(r.read, output.write)
+            self.assertEqual(output.getvalue(), data)
+
+
 class Test_Ogg(unittest.TestCase):
     @LIB_OGG
     def test_roundtrip(self):
@@ -6615,6 +7591,86 @@ class Test_Ogg(unittest.TestCase):
             ogg_writer.close()
             ogg_reader.close()
 
+    @LIB_OGG
+    def test_last_page(self):
+        import audiotools.ogg
+
+        def stream(serial_number, granules, page_size):
+            data = BytesIO()
+            writer = audiotools.ogg.PageWriter(data)
+            for (i, granule) in enumerate(granules):
+                page = audiotools.ogg.Page(
+                    packet_continuation=False,
+                    stream_beginning=(i == 0),
+                    stream_end=(i == (len(granules) - 1)),
+                    granule_position=granule,
+                    bitstream_serial_number=serial_number,
+                    sequence_number=i,
+                    segments=[])
+                for segment in range(page_size):
+                    page.append(os.urandom(255))
+                writer.write(page)
+            writer.flush()
+            return data.getvalue()
+
+        granules = [0, 1000, 2000, -1, 3000, 4567]
+
+        for page_size in [0, 1, 255]:
+            data = stream(1234, granules, page_size)
+
+            # a plain stream has its length in its final page
+            with tempfile.NamedTemporaryFile() as f:
+                f.write(data)
+                f.flush()
+                with open(f.name, "rb") as r:
+                    (offset, page) = audiotools.ogg.last_page(r, 1234)
+                self.assertEqual(page.granule_position, 4567)
+                self.assertEqual(page.stream_end, True)
+                self.assertEqual(offset,
+                                 len(data) - len(stream(1234, [4567],
+                                                        page_size)))
+                self.assertEqual(
+                    audiotools.ogg.total_granule_position(f.name, 1234),
+                    4567)
+
+            # trailing junk is skipped, however long
+            for junk_size in [10, 100000]:
+                with tempfile.NamedTemporaryFile() as f:
+                    f.write(data + b"OggS" * (junk_size // 4))
+                    f.flush()
+                    self.assertEqual(
+                        audiotools.ogg.total_granule_position(f.name, 1234),
+                        4567)
+
+            # chained streams fall back to reading
+            # to the end of the first stream
+            with tempfile.NamedTemporaryFile() as f:
+                f.write(data + stream(5678, [0, 9999], page_size))
+                f.flush()
+                with open(f.name, "rb") as r:
+                    self.assertIsNone(audiotools.ogg.last_page(r, 1234))
+                self.assertEqual(
+                    audiotools.ogg.total_granule_position(f.name, 1234),
+                    4567)
+
+            # truncated streams fall back to reading every page
+            with tempfile.NamedTemporaryFile() as f:
+                f.write(data[0:-1])
+                f.flush()
+                with open(f.name, "rb") as r:
+                    self.assertIsNone(audiotools.ogg.last_page(r, 1234))
+                self.assertEqual(
+                    audiotools.ogg.total_granule_position(f.name, 1234),
+                    0)
+
+            # as do streams whose final page has no granule position
+            with tempfile.NamedTemporaryFile() as f:
+                f.write(stream(1234, [0, 1000, -1], page_size))
+                f.flush()
+                self.assertEqual(
+                    audiotools.ogg.total_granule_position(f.name, 1234),
+                    1000)
+
 
 class Test_Image(unittest.TestCase):
     @LIB_IMAGE
@@ -6670,19 +7726,43 @@ class Test_Image(unittest.TestCase):
             self.assertEqual(tiff.mime_type, "image/tiff")
 
 
+def __exec_range_sum__(start, end, progress):
+    import time
+
+    sum_ = 0
+    for i in range(start, end):
+        progress(start, end)
+        sum_ += i
+        time.sleep(0.1)
+    return sum_
+
+
+def __exec_job_pid__(value, progress):
+    progress(value, 1000)
+    return (value, os.getpid())
+
+
+def __exec_failing_job__(value, progress):
+    if value == 5:
+        raise ValueError(value)
+    else:
+        return value
+
+
+def __exec_exiting_job__(value, progress):
+    if value == 5:
+        os._exit(1)
+    else:
+        return value
+
+
+def __exec_filename_job__(filename, progress):
+    return filename
+
+
 class Test_ExecProgressQueue(unittest.TestCase):
     @LIB_CORE
     def test_queue(self):
-        def range_sum(start, end, progress):
-            import time
-
-            sum_ = 0
-            for i in range(start, end):
-                progress(start, end)
-                sum_ += i
-                time.sleep(0.1)
-            return sum_
-
         def range_sum_output(total):
             return u"%d" % (total)
 
@@ -6691,7 +7771,7 @@ class Test_ExecProgressQueue(unittest.TestCase):
 
             for i in range(100):
                 queue.execute(
-                    function=range_sum,
+                    function=__exec_range_sum__,
                     progress_text=u"Sum %d" % (i + 1),
                     completion_output=((u"Sum %d Finished" % (i + 1))
                                        if (i % 2) else range_sum_output),
@@ -6703,6 +7783,104 @@ class Test_ExecProgressQueue(unittest.TestCase):
             for i in range(max_processes):
                 self.assertEqual(results[i], sum(range(i, i + 10)))
 
+    @LIB_CORE
+    def test_worker_pool(self):
+        for max_processes in [2, 3, 8]:
+            queue = audiotools.ExecProgressQueue(audiotools.SilentMessenger())
+
+            for i in range(1000):
+                queue.execute(function=__exec_job_pid__,
+                              progress_text=u"Job %d" % (i + 1),
+                              completion_output=u"Job %d Finished" % (i + 1),
+                              value=i)
+
+            results = queue.run(max_processes)
+
+            # results are returned in the order jobs were queued
+            self.assertEqual([value for (value, pid) in results],
+                             list(range(1000)))
+
+            # jobs are run by a fixed pool of worker processes
+            pids = set([pid for (value, pid) in results])
+            self.assertLessEqual(len(pids), max_processes)
+            self.assertNotIn(os.getpid(), pids)
+
+            # and the queue is empty for reuse
+            self.assertEqual(queue.run(max_processes), [])
+
+    @LIB_CORE
+    def test_cost(self):
+        queue = audiotools.ExecProgressQueue(audiotools.SilentMessenger())
+        costs = [None, 10, 300, 20, None, 200]
+        for (i, cost) in enumerate(costs):
+            queue.execute(__exec_job_pid__,
+                          u"Job %d" % (i + 1),
+                          None,
+                          i,
+                          job_cost=cost)
+
+        # the most costly jobs are dispatched first
+        # and jobs without a cost are dispatched last in the order queued
+        self.assertEqual([job[0] for job in queue.__dispatch_order__()],
+                         [2, 5, 3, 1, 0, 4])
+
+        results = queue.run(2)
+
+        # results are still returned in the order jobs were queued
+        # and job_cost is not passed to the function
+        self.assertEqual([value for (value, pid) in results],
+                         list(range(len(costs))))
+
+        # positional arguments after completion_output
+        # are passed to the function
+        queue.execute(__exec_job_pid__, u"Job 7", u"Job 7 Finished", 7)
+        self.assertEqual(queue.run(1), [(7, os.getpid())])
+
+    @LIB_CORE
+    def test_exception(self):
+        for max_processes in [1, 4]:
+            queue = audiotools.ExecProgressQueue(audiotools.SilentMessenger())
+
+            for i in range(20):
+                queue.execute(function=__exec_failing_job__,
+                              progress_text=u"Job %d" % (i + 1),
+                              value=i)
+
+            self.assertRaises(ValueError, queue.run, max_processes)
+
+    @LIB_CORE
+    def test_worker_exit(self):
+        # a worker exiting in the middle of a job
+        # raises an error rather than losing its result
+        for max_processes in [2, 4]:
+            queue = audiotools.ExecProgressQueue(audiotools.SilentMessenger())
+
+            for i in range(20):
+                queue.execute(function=__exec_exiting_job__,
+                              progress_text=u"Job %d" % (i + 1),
+                              value=i)
+
+            self.assertRaises(RuntimeError, queue.run, max_processes)
+
+    @LIB_CORE
+    def test_filename_job(self):
+        # Filename arguments survive being sent to worker processes
+        with tempfile.NamedTemporaryFile() as temp:
+            filenames = [audiotools.Filename(temp.name),
+                         audiotools.Filename("/nonexistent/file.flac")]
+
+            queue = audiotools.ExecProgressQueue(audiotools.SilentMessenger())
+            for filename in filenames:
+                queue.execute(function=__exec_filename_job__,
+                              progress_text=filename.__unicode__(),
+                              filename=filename)
+
+            results = queue.run(2)
+            for (result, filename) in zip(results, filenames):
+                self.assertIsInstance(result, audiotools.Filename)
+                self.assertEqual(result, filename)
+                self.assertEqual(str(result), str(filename))
+
 
 class Test_Output_Text(unittest.TestCase):
     @LIB_CORE
@@ -990,21 +990,24 @@ class AudioFileTest(unittest.TestCase):
                                           randrange(0, total_pcm_frames))
             else:
                 # ensure PCMReader has no .seek() method
-                # or that method always returns to the start of the file
+                # or that method either returns to the start of the file
+                # or lands exactly on the offset, however slowly
                 with temp_track.to_pcm() as pcmreader:
                     if (hasattr(pcmreader, "seek") and
                         callable(pcmreader.seek)):
                         # try a bunch of random seeks
-                        # and ensure the offset is always 0
+                        # and ensure the offset is always 0 or exact
                         for i in range(10):
                             position = randrange(0, total_pcm_frames)
-                            self.assertEqual(pcmreader.seek(position), 0)
+                            self.assertIn(pcmreader.seek(position),
+                                          [0, position])
 
                         # seeking to some huge value should work
                         # even if its position doesn't get
                         # to the end of the file
                         for value in [2 ** 31, 2 ** 34, 2 ** 38]:
-                            self.assertEqual(pcmreader.seek(value), 0)
+                            self.assertIn(pcmreader.seek(value),
+                                          [0, total_pcm_frames])
 
                         # a PCMReader that's closed should raise ValueError
                         # whenever seek is called
@@ -1360,6 +1363,52 @@ class LosslessFileTest(AudioFileTest):
 
 
 class LossyFileTest(AudioFileTest):
+    def check_seek(self):
+        """ensures the format's decoder seeks to exact PCM frame offsets
+
+        lossy decoders may not reproduce their output exactly
+        after seeking, so decoded samples are compared approximately"""
+
+        with tempfile.NamedTemporaryFile(suffix=self.suffix) as temp:
+            track = self.audio_class.from_pcm(
+                temp.name, EXACT_RANDOM_PCM_Reader(44100 * 2))
+            self.assertEqual(track.seekable(), True)
+
+            def read_all(pcmreader):
+                samples = []
+                frame = pcmreader.read(4096)
+                while len(frame) > 0:
+                    samples.extend(frame)
+                    frame = pcmreader.read(4096)
+                return samples
+
+            with track.to_pcm() as pcmreader:
+                channels = pcmreader.channels
+                samples = read_all(pcmreader)
+                total_frames = len(samples) // channels
+                self.assertGreater(total_frames, 0)
+
+                # seeks forward and backward land on the offset
+                for offset in [0, 1, 1151, 1152, 20000, 3000,
+                               random.randrange(0, total_frames),
+                               total_frames]:
+                    self.assertEqual(pcmreader.seek(offset), offset)
+                    remaining = read_all(pcmreader)
+                    expected = samples[offset * channels:]
+                    self.assertEqual(len(remaining), len(expected))
+
+                    # decoding noise from the wrong offset
+                    # differs as much as the noise itself
+                    self.assertLessEqual(
+                        sum(abs(r - e) for (r, e) in
+                            zip(remaining, expected)),
+                        sum(abs(e) for e in expected) // 10)
+
+                # seeking past the end stops at the end
+                self.assertEqual(pcmreader.seek(total_frames * 2),
+                                 total_frames)
+                self.assertEqual(pcmreader.read(4096).frames, 0)
+
     @FORMAT_LOSSY
     def test_bits_per_sample(self):
         if self.audio_class is audiotools.AudioFile:
@@ -3704,6 +3753,53 @@ class FlacFileTest(TestForeignAiffChunks,
                               audiotools.WaveAudio)
             self.assertEqual(os.path.isfile("dummy.wav"), False)
 
+    @FORMAT_FLAC
+    def test_md5sum(self):
+        from test_core import bytes_to_ints, ints_to_bytes
+
+        flac = audiotools.open("flac-allframes.flac")
+        self.assertEqual(flac.md5sum(),
+                         b'\xf5\x3f\x86\x87\x6d\xcd\x77\x83' +
+                         b'\x22\x5c\x93\xba\x8a\x93\x8c\x7d')
+
+        # the stored sum is that of the decoded PCM data
+        checksum = md5()
+        with flac.to_pcm() as pcmreader:
+            audiotools.transfer_framelist_data(pcmreader, checksum.update)
+        self.assertEqual(flac.md5sum(), checksum.digest())
+
+        with open("flac-allframes.flac", "rb") as f:
+            flac_data = bytes_to_ints(f.read())
+
+        with tempfile.NamedTemporaryFile(suffix=".flac") as temp:
+            # an altered stored sum fails verification
+            # though the stream itself is intact
+            for i in range(0x1A, 0x2A):
+                new_data = list(flac_data)
+                new_data[i] ^= 1
+                temp.seek(0, 0)
+                temp.write(ints_to_bytes(new_data))
+                temp.flush()
+                flac = audiotools.open(temp.name)
+                self.assertNotEqual(flac.md5sum(), checksum.digest())
+                self.assertRaises(audiotools.InvalidFile, flac.verify)
+
+            # an empty stored sum isn't a sum at all
+            new_data = list(flac_data)
+            new_data[0x1A:0x2A] = [0] * 16
+            temp.seek(0, 0)
+            temp.write(ints_to_bytes(new_data))
+            temp.flush()
+            flac = audiotools.open(temp.name)
+            self.assertIsNone(flac.md5sum())
+            self.assertEqual(flac.verify(), True)
+
+        # formats which store no sum return None
+        with tempfile.NamedTemporaryFile(suffix=".wav") as temp:
+            wav = audiotools.WaveAudio.from_pcm(temp.name,
+                                                BLANK_PCM_Reader(1))
+            self.assertIsNone(wav.md5sum())
+
     def __stream_variations__(self):
         for stream in [
             test_streams.Silence8_Mono(200000, 44100),
@@ -4339,6 +4435,42 @@ class FlacFileTest(TestForeignAiffChunks,
         # verifies without errors
         self.assertEqual(flac.verify(), True)
 
+    @FORMAT_FLAC
+    def test_parallel_encoding(self):
+        from functools import partial
+        from audiotools.flac import encode_flac_parallel
+
+        # files encoded in parallel should be identical
+        # to those encoded by a single process
+        for compression in ["0", "5", "8"]:
+            for pcm_frames in [1000, 44100 * 3 + 17]:
+                serial_file = tempfile.NamedTemporaryFile(suffix=".flac")
+                parallel_file = tempfile.NamedTemporaryFile(suffix=".flac")
+                try:
+                    audiotools.FlacAudio.from_pcm(
+                        serial_file.name,
+                        test_streams.Sine16_Stereo(pcm_frames, 44100,
+                                                   441.0, 0.50,
+                                                   4410.0, 0.49, 1.0),
+                        compression,
+                        total_pcm_frames=pcm_frames)
+                    flac = audiotools.FlacAudio.from_pcm(
+                        parallel_file.name,
+                        test_streams.Sine16_Stereo(pcm_frames, 44100,
+                                                   441.0, 0.50,
+                                                   4410.0, 0.49, 1.0),
+                        compression,
+                        total_pcm_frames=pcm_frames,
+                        encoding_function=partial(encode_flac_parallel,
+                                                  processes=2,
+                                                  blocks_per_job=3))
+                    self.assertEqual(open(serial_file.name, "rb").read(),
+                                     open(parallel_file.name, "rb").read())
+                    self.assertEqual(flac.verify(), True)
+                finally:
+                    serial_file.close()
+                    parallel_file.close()
+
     @FORMAT_FLAC
     def test_python_codec(self):
         # Python decoder and encoder are far too slow
@@ -4556,7 +4688,8 @@ class M4AFileTest(LossyFileTest):
                     temp.name, BLANK_PCM_Reader(1,
                                                 channels=channels,
                                                 channel_mask=0))
-            if self.audio_class is audiotools.m4a.M4AAudio_faac:
+            if self.audio_class in (audiotools.m4a.M4AAudio_faac,
+                                    audiotools.m4a.M4AAudio_native):
                 self.assertEqual(track.channels(), 2)
                 track = audiotools.open(temp.name)
                 self.assertEqual(track.channels(), 2)
@@ -4579,12 +4712,167 @@ class M4AFileTest(LossyFileTest):
             self.assertEqual(metadata.track_name, u"Foo")
             self.assertEqual(u"%s" % (metadata[b'ilst'][b'\xa9too'],), encoder)
 
+    @FORMAT_M4A
+    def test_esds(self):
+        from audiotools.m4a_atoms import M4A_ESDS_Atom
+        from audiotools.bitstream import BitstreamReader, BitstreamRecorder
+
+        # round-trip AudioSpecificConfigs of various sizes
+        for config in [b"\x12\x10", b"\x13\x08\x56\xe5\x9d\x48\x80",
+                       b"\x11\x90" * 100]:
+            esds = M4A_ESDS_Atom(version=0,
+                                 flags=0,
+                                 es_id=0,
+                                 object_type=0x40,
+                                 stream_type=0x05,
+                                 buffer_size=768,
+                                 max_bitrate=256000,
+                                 average_bitrate=128000,
+                                 decoder_specific_info=config)
+            data = BitstreamRecorder(False)
+            esds.build(data)
+            self.assertEqual(data.bytes(), esds.size())
+            esds2 = M4A_ESDS_Atom.parse(
+                b"esds",
+                esds.size(),
+                BitstreamReader(BytesIO(data.data()), False),
+                {})
+            self.assertEqual(repr(esds2), repr(esds))
+
+        # descriptors with 4 byte sizes and an ES_ID are also parsed
+        esds = M4A_ESDS_Atom.parse(
+            b"esds",
+            47,
+            BitstreamReader(BytesIO(
+                b"\x00\x00\x00\x00" +
+                b"\x03\x80\x80\x80\x22\x00\x01\x00" +
+                b"\x04\x80\x80\x80\x14\x40\x15\x00\x00\x00" +
+                b"\x00\x01\xf4\x00\x00\x01\xf4\x00" +
+                b"\x05\x80\x80\x80\x02\x12\x10" +
+                b"\x06\x80\x80\x80\x01\x02"), False),
+            {})
+        self.assertEqual(esds.es_id, 1)
+        self.assertEqual(esds.object_type, 0x40)
+        self.assertEqual(esds.stream_type, 0x05)
+        self.assertEqual(esds.max_bitrate, 128000)
+        self.assertEqual(esds.average_bitrate, 128000)
+        self.assertEqual(esds.decoder_specific_info, b"\x12\x10")
+
+    @FORMAT_M4A
+    def test_faac_qualities(self):
+        from audiotools.m4a import M4AAudio_faac, M4AAudio_native
+
+        # faac's qualities are accepted and encoded at a VBR mode
+        # with faac's default at the native default
+        for quality in M4AAudio_faac.COMPRESSION_MODES:
+            self.assertIn(quality, M4AAudio_native.COMPRESSION_MODES)
+            self.assertIn(M4AAudio_native.FAAC_COMPRESSION_MODES[quality],
+                          ("1", "2", "3", "4", "5"))
+            self.assertIn(quality, M4AAudio_native.COMPRESSION_DESCRIPTIONS)
+        self.assertEqual(
+            M4AAudio_native.FAAC_COMPRESSION_MODES[
+                M4AAudio_faac.DEFAULT_COMPRESSION],
+            M4AAudio_native.DEFAULT_COMPRESSION)
+
+        # and qualities rise with faac's
+        modes = [M4AAudio_native.FAAC_COMPRESSION_MODES[quality]
+                 for quality in M4AAudio_faac.COMPRESSION_MODES]
+        self.assertEqual(modes, sorted(modes))
+
+    @FORMAT_M4A
+    def test_native_atoms(self):
+        from audiotools.m4a import M4AAudio_native
+
+        # build a file laid out like M4AAudio_native.from_pcm's
+        # around access units of random data
+        # which needs no AAC library
+        frame_byte_sizes = [random.randint(1, 400) for i in range(47)]
+        frames = [os.urandom(size) for size in frame_byte_sizes]
+        reader = audiotools.PCMReader(sample_rate=44100,
+                                      channels=2,
+                                      channel_mask=0x3,
+                                      bits_per_sample=16)
+
+        # the 16 bytes of "mdat" header are either
+        # "free" and "mdat" atom headers or an "mdat" with a 64-bit size
+        for mdat_header in [("32u 4b 32u 4b",
+                             (8, b"free", sum(frame_byte_sizes) + 8, b"mdat")),
+                            ("32u 4b 64U",
+                             (1, b"mdat", sum(frame_byte_sizes) + 16))]:
+            self.__test_native_atoms__(mdat_header, frames, reader)
+
+        # chunk offsets beyond 4GiB are stored in a "co64" atom
+        atom = M4AAudio_native.__chunk_offset_atom__(
+            100, [2 ** 30] * (M4AAudio_native.FRAMES_PER_CHUNK * 5))
+        self.assertEqual(atom.name, b"co64")
+        self.assertEqual(atom.offsets,
+                         [116 + (i * M4AAudio_native.FRAMES_PER_CHUNK *
+                                 2 ** 30) for i in range(5)])
+        atom = M4AAudio_native.__chunk_offset_atom__(100, frame_byte_sizes)
+        self.assertEqual(atom.name, b"stco")
+
+    def __test_native_atoms__(self, mdat_header, frames, reader):
+        from audiotools.m4a import (M4AAudio_native,
+                                    ALACAudio,
+                                    get_m4a_sample_offsets)
+        from audiotools.bitstream import BitstreamWriter
+
+        frame_byte_sizes = [len(frame) for frame in frames]
+
+        with tempfile.NamedTemporaryFile(suffix=self.suffix) as temp:
+            writer = BitstreamWriter(open(temp.name, "wb"), False)
+            ftyp = ALACAudio.__ftyp_atom__()
+            writer.build("32u 4b", (ftyp.size() + 8, ftyp.name))
+            ftyp.build(writer)
+            writer.build(*mdat_header)
+            for frame in frames:
+                writer.write_bytes(frame)
+            moov = M4AAudio_native.__moov_atom__(reader,
+                                                 0,
+                                                 ftyp.size() + 8,
+                                                 46000,
+                                                 2048,
+                                                 b"\x12\x10",
+                                                 frame_byte_sizes)
+            writer.build("32u 4b", (moov.size() + 8, moov.name))
+            moov.build(writer)
+            writer.close()
+
+            track = M4AAudio_native(temp.name)
+            self.assertEqual(track.channels(), 2)
+            self.assertEqual(track.bits_per_sample(), 16)
+            self.assertEqual(track.sample_rate(), 44100)
+            self.assertEqual(track.total_frames(), 46000)
+
+            def track_frames(track):
+                stbl = track.__moov__()[b"trak"][b"mdia"][b"minf"][b"stbl"]
+                self.assertEqual(
+                    stbl[b"stsd"].descriptions[0].esds().decoder_specific_info,
+                    b"\x12\x10")
+                with open(track.filename, "rb") as f:
+                    data = f.read()
+                return [data[offset:offset + size] for (offset, size) in
+                        get_m4a_sample_offsets(stbl)]
+
+            self.assertEqual(track_frames(track), frames)
+
+            # access units are still found after "moov" is enlarged
+            track.set_metadata(audiotools.MetaData(track_name=u"Foo" * 2000))
+            track = M4AAudio_native(temp.name)
+            self.assertEqual(track.get_metadata().track_name, u"Foo" * 2000)
+            self.assertEqual(track.total_frames(), 46000)
+            self.assertEqual(track_frames(track), frames)
+
 
 class MP3FileTest(LossyFileTest):
     def setUp(self):
         self.audio_class = audiotools.MP3Audio
         self.suffix = "." + self.audio_class.SUFFIX
 
+    @FORMAT_MP3
+    def test_seek(self):
+        self.check_seek()
+
     @FORMAT_MP3
     def test_length(self):
         with tempfile.NamedTemporaryFile(suffix=self.suffix) as temp:
@@ -4593,6 +4881,161 @@ class MP3FileTest(LossyFileTest):
                                                   BLANK_PCM_Reader(seconds))
                 self.assertEqual(int(round(track.seconds_length())), seconds)
 
+    @FORMAT_MP3
+    def test_frame_index(self):
+        from audiotools.mp3 import MPEGFrameIndex, SCAN_BLOCK_SIZE
+        from audiotools.id3 import ID3v23Comment
+        from struct import pack
+
+        # MPEG-1 layer III, 128kbps, 44100Hz, joint stereo
+        # is 417 bytes per frame, or 418 when padded
+        def frame(pad):
+            return (b"\xFF\xFB" + (b"\x92" if pad else b"\x90") + b"\x40" +
+                    b"\x00" * (413 + (1 if pad else 0)))
+
+        frames = [frame(i % 3 == 0) for i in range(400)]
+        # enough data to span several scanning blocks
+        self.assertGreater(len(b"".join(frames)), SCAN_BLOCK_SIZE * 2)
+
+        # a CBR file with no VBR header and garbage before the first frame
+        # has all its frames scanned
+        with tempfile.NamedTemporaryFile(suffix=self.suffix) as temp:
+            temp.write(b"\x00\xFF\x00" + b"".join(frames) + b"TAG" +
+                       b"\x00" * 125)
+            temp.flush()
+            track = audiotools.MP3Audio(temp.name)
+            self.assertEqual(track.total_frames(), 400 * 1152)
+            self.assertEqual(track.sample_rate(), 44100)
+            self.assertEqual(track.channels(), 2)
+
+            with open(temp.name, "rb") as f:
+                index = MPEGFrameIndex(f)
+                self.assertEqual(index.first_frame, 3)
+                self.assertEqual(index.audio_start, 3)
+                self.assertIsNone(index.vbr_header)
+                self.assertEqual(index.mpeg_frames, 400)
+
+        # a truncated final frame still counts
+        with tempfile.NamedTemporaryFile(suffix=self.suffix) as temp:
+            temp.write(b"".join(frames)[0:-100])
+            temp.flush()
+            self.assertEqual(audiotools.MP3Audio(temp.name).total_frames(),
+                             400 * 1152)
+
+        # a file with a Xing header and LAME extension is not scanned,
+        # its header frame isn't counted as audio
+        # and its encoder delay and padding aren't counted either
+        xing = bytearray(frame(False))
+        xing[36:40] = b"Xing"
+        xing[40:48] = pack(">II", 0xF, 1000)
+        xing[156:160] = b"LAME"
+        # 576 samples of delay and 1234 of padding
+        xing[177:180] = bytearray([0x24, 0x04, 0xD2])
+        with tempfile.NamedTemporaryFile(suffix=self.suffix) as temp:
+            ID3v23Comment.converted(
+                audiotools.MetaData(track_name=u"Name")).build(
+                audiotools.bitstream.BitstreamWriter(temp, False))
+            temp.write(bytes(xing) + b"".join(frames))
+            temp.flush()
+            track = audiotools.MP3Audio(temp.name)
+            self.assertEqual(track.total_frames(), 1000 * 1152 - 576 - 1234)
+            with open(temp.name, "rb") as f:
+                index = MPEGFrameIndex(f)
+                self.assertEqual(index.vbr_header, u"Xing")
+                self.assertEqual(index.encoder_delay, 576)
+                self.assertEqual(index.encoder_padding, 1234)
+                self.assertEqual(index.mpeg_frames, 1000)
+                self.assertEqual(index.audio_start,
+                                 index.first_frame + len(xing))
+
+        # as is a file with an "Info" header lacking a frame count
+        info = bytearray(frame(False))
+        info[36:40] = b"Info"
+        info[40:44] = pack(">I", 0)
+        with tempfile.NamedTemporaryFile(suffix=self.suffix) as temp:
+            temp.write(bytes(info) + b"".join(frames))
+            temp.flush()
+            self.assertEqual(audiotools.MP3Audio(temp.name).total_frames(),
+                             400 * 1152)
+
+        # a file with a VBRI header
+        vbri = bytearray(frame(False))
+        vbri[36:54] = b"VBRI" + pack(">HHHII", 1, 1105, 75, 0, 500)
+        with tempfile.NamedTemporaryFile(suffix=self.suffix) as temp:
+            temp.write(bytes(vbri) + b"".join(frames))
+            temp.flush()
+            self.assertEqual(audiotools.MP3Audio(temp.name).total_frames(),
+                             500 * 1152)
+            with open(temp.name, "rb") as f:
+                index = MPEGFrameIndex(f)
+                self.assertEqual(index.vbr_header, u"VBRI")
+                self.assertEqual(index.mpeg_frames, 500)
+                self.assertEqual(index.encoder_delay, 0)
+
+        # files without any frames are invalid
+        with tempfile.NamedTemporaryFile(suffix=self.suffix) as temp:
+            temp.write(b"\x00\xFF" * 100000)
+            temp.flush()
+            self.assertRaises(audiotools.mp3.InvalidMP3,
+                              audiotools.MP3Audio,
+                              temp.name)
+
+    @FORMAT_MP3
+    def test_frame_search(self):
+        from io import BytesIO
+        from audiotools._mpeg import find_frame, skip_id3v2
+        from audiotools.mp3 import find_mpeg_frame, SCAN_BLOCK_SIZE
+
+        frame = b"\xFF\xFB\x90\x40" + b"\x00" * 413
+
+        def id3v2(size):
+            return (b"ID3\x03\x00\x00" +
+                    bytes(bytearray([(size >> 21) & 0x7F,
+                                     (size >> 14) & 0x7F,
+                                     (size >> 7) & 0x7F,
+                                     size & 0x7F])) +
+                    b"\x00" * size)
+
+        # stacked ID3v2 tags are skipped together
+        tags = id3v2(100) + id3v2(SCAN_BLOCK_SIZE * 3)
+        f = BytesIO(tags + frame)
+        self.assertEqual(skip_id3v2(f), len(tags))
+        self.assertEqual(f.tell(), len(tags))
+        f = BytesIO(frame)
+        self.assertEqual(skip_id3v2(f), 0)
+        self.assertEqual(f.tell(), 0)
+
+        # a tag with an invalid size isn't skipped
+        f = BytesIO(b"ID3\x03\x00\x00\x80\x00\x00\x00" + frame)
+        self.assertEqual(skip_id3v2(f), 0)
+        self.assertEqual(f.tell(), 0)
+
+        # invalid headers and a header split across
+        # scanning blocks are handled
+        junk = (b"\xFF\xFF\xFF\x00\xFF\xE0" +
+                b"\x00" * (SCAN_BLOCK_SIZE - 7) + b"\xFF\x01")
+        f = BytesIO(junk + frame)
+        self.assertEqual(find_frame(f), len(junk))
+        self.assertEqual(f.tell(), len(junk))
+        self.assertEqual(f.read(4), frame[0:4])
+        f = BytesIO(b"\x00\xFF" + frame)
+        self.assertEqual(find_frame(f, 2), 2)
+        f = BytesIO(b"\x00\xFF" + frame)
+        self.assertIsNone(find_frame(f, 1))
+        self.assertIsNone(find_frame(BytesIO(junk)))
+        self.assertIsNone(find_frame(BytesIO(b"")))
+
+        # both are combined when finding the start of MP3 data
+        f = BytesIO(b"\x00" * 10 + tags + junk + frame)
+        f.seek(10, 0)
+        self.assertEqual(find_mpeg_frame(f), len(tags) + len(junk))
+        self.assertEqual(f.tell(), 10 + len(tags) + len(junk))
+        self.assertRaises(IOError, find_mpeg_frame, BytesIO(tags + junk))
+
+        # and file_type() sees past stacked tags
+        self.assertIs(audiotools.file_type(BytesIO(tags + frame)),
+                      audiotools.MP3Audio)
+
     @FORMAT_MP3
     def test_verify(self):
         # test invalid file sent to to_pcm()
@@ -5000,6 +5443,54 @@ class ShortenFileTest(TestForeignWaveChunks,
                 track2 = audiotools.open(temp.name)
                 self.assertEqual(track2.bits_per_sample(), bps)
 
+    @FORMAT_SHORTEN
+    def test_seek(self):
+        from random import randrange
+
+        with tempfile.NamedTemporaryFile(suffix=self.suffix) as temp:
+            track = self.audio_class.from_pcm(
+                temp.name,
+                EXACT_RANDOM_PCM_Reader(44100 * 5),
+                block_size=256)
+
+            with track.to_pcm() as pcmreader:
+                samples = []
+                frame = pcmreader.read(4096)
+                while len(frame) > 0:
+                    samples.extend(frame)
+                    frame = pcmreader.read(4096)
+
+                # seeks forward and backward land exactly on the offset
+                for offset in [0, 1, 255, 256, 257, 10000, 3000,
+                               randrange(0, 44100 * 5), 44100 * 5]:
+                    self.assertEqual(pcmreader.seek(offset), offset)
+                    remaining = []
+                    frame = pcmreader.read(4096)
+                    while len(frame) > 0:
+                        remaining.extend(frame)
+                        frame = pcmreader.read(4096)
+                    self.assertEqual(remaining, samples[offset * 2:])
+
+                # seeking past the end stops at the end
+                self.assertEqual(pcmreader.seek(44100 * 10), 44100 * 5)
+                self.assertEqual(pcmreader.read(4096).frames, 0)
+
+            # seeking decodes forward from the start of the stream,
+            # so the track isn't seekable enough to split in parallel
+            self.assertEqual(track.seekable(), False)
+
+            # but windows may still seek to their starting offset
+            with audiotools.PCMReaderWindow(track.to_pcm(),
+                                            10000,
+                                            5000,
+                                            use_seek=True) as window:
+                remaining = []
+                frame = window.read(4096)
+                while len(frame) > 0:
+                    remaining.extend(frame)
+                    frame = window.read(4096)
+                self.assertEqual(remaining, samples[10000 * 2:15000 * 2])
+
     @FORMAT_SHORTEN
     def test_verify(self):
         # test changing the file underfoot
@@ -5520,6 +6011,10 @@ class VorbisFileTest(OggVerify, LossyFileTest):
         self.audio_class = audiotools.VorbisAudio
         self.suffix = "." + self.audio_class.SUFFIX
 
+    @FORMAT_VORBIS
+    def test_seek(self):
+        self.check_seek()
+
     @FORMAT_VORBIS
     def test_channels(self):
         with tempfile.NamedTemporaryFile(suffix=self.suffix) as temp:
@@ -5564,6 +6059,10 @@ class OpusFileTest(OggVerify, LossyFileTest):
         self.audio_class = audiotools.OpusAudio
         self.suffix = "." + self.audio_class.SUFFIX
 
+    @FORMAT_OPUS
+    def test_seek(self):
+        self.check_seek()
+
     @FORMAT_OPUS
     def test_channels(self):
         # FIXME - test Opus channel assignment
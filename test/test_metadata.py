@@ -22,7 +22,7 @@ import audiotools
 import tempfile
 
 from test import (parser, BLANK_PCM_Reader, EXACT_SILENCE_PCM_Reader,
-                  Combinations,
+                  EXACT_RANDOM_PCM_Reader, Combinations,
                   TEST_COVER1, TEST_COVER2, TEST_COVER3, TEST_COVER4,
                   HUGE_BMP)
 
@@ -3736,6 +3736,19 @@ class ID3CommentPairMetaData(MetaDataTest):
     def test_field_mapping(self):
         pass
 
+    @METADATA_ID3V2
+    def test_pickle(self):
+        import pickle
+
+        # pairs are sent to worker processes by ExecProgressQueue
+        metadata = self.metadata_class.converted(
+            audiotools.MetaData(track_name=u"Name", track_number=2))
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            unpickled = pickle.loads(pickle.dumps(metadata, protocol))
+            self.assertEqual(unpickled, metadata)
+            self.assertEqual(unpickled.track_name, u"Name")
+            self.assertEqual(unpickled.track_number, 2)
+
 
 class FlacMetaData(MetaDataTest):
     def setUp(self):
@@ -5699,6 +5712,164 @@ class M4AMetaDataTest(MetaDataTest):
             finally:
                 temp_file.close()
 
+    @METADATA_M4A
+    def test_moov_update(self):
+        import os.path
+        from io import BytesIO
+        from audiotools.bitstream import BitstreamReader, BitstreamRecorder
+        from audiotools.m4a import (get_m4a_top_level_atoms,
+                                    MOOV_PADDING)
+        from audiotools.m4a_atoms import (M4A_Tree_Atom,
+                                          M4A_STCO_Atom,
+                                          M4A_CO64_Atom)
+
+        parsers = {b"trak": M4A_Tree_Atom,
+                   b"mdia": M4A_Tree_Atom,
+                   b"minf": M4A_Tree_Atom,
+                   b"stbl": M4A_Tree_Atom,
+                   b"stco": M4A_STCO_Atom,
+                   b"co64": M4A_CO64_Atom}
+
+        def layout(filename):
+            with open(filename, "rb") as f:
+                return [(name, size) for (name, offset, size, header)
+                        in get_m4a_top_level_atoms(f)]
+
+        def read_atoms(filename):
+            # returns a {name: (offset, data)} dict of top-level atoms
+            # and the parsed "moov" atom
+            with open(filename, "rb") as f:
+                atoms = {}
+                for (name, offset, size, header) in \
+                        get_m4a_top_level_atoms(f):
+                    f.seek(offset, 0)
+                    atoms[name] = (offset, f.read(size))
+            moov_data = atoms[b"moov"][1][8:]
+            moov = M4A_Tree_Atom.parse(
+                b"moov", len(moov_data),
+                BitstreamReader(BytesIO(moov_data), False), parsers)
+            return (atoms, moov)
+
+        def chunk_offsets(moov):
+            stbl = moov[b"trak"][b"mdia"][b"minf"][b"stbl"]
+            for atom in stbl:
+                if atom.name in (b"stco", b"co64"):
+                    return atom
+
+        def build_atom(atom):
+            recorder = BitstreamRecorder(False)
+            recorder.build("32u 4b", (8 + atom.size(), atom.name))
+            atom.build(recorder)
+            return recorder.data()
+
+        def check_chunks(filename, chunks):
+            # each chunk offset should still point to the same data
+            (atoms, moov) = read_atoms(filename)
+            offsets = chunk_offsets(moov).offsets
+            with open(filename, "rb") as f:
+                for (offset, chunk) in zip(offsets, chunks):
+                    f.seek(offset, 0)
+                    self.assertEqual(f.read(len(chunk)), chunk)
+
+        def metadata(comment_size):
+            return audiotools.MetaData(track_name=u"Name",
+                                       comment=u"x" * comment_size)
+
+        with tempfile.NamedTemporaryFile(suffix=".m4a") as temp:
+            track = audiotools.ALACAudio.from_pcm(
+                temp.name, EXACT_RANDOM_PCM_Reader(44100 * 3))
+            self.assertEqual([name for (name, size) in layout(temp.name)],
+                             [b"ftyp", b"moov", b"free", b"mdat"])
+            (atoms, moov) = read_atoms(temp.name)
+            offsets = chunk_offsets(moov).offsets
+            self.assertGreater(len(offsets), 1)
+            mdat_data = atoms[b"mdat"][1]
+            mdat_offset = atoms[b"mdat"][0]
+            chunks = [mdat_data[offset - mdat_offset:
+                                offset - mdat_offset + 16]
+                      for offset in offsets]
+            file_size = os.path.getsize(temp.name)
+
+            # metadata too large for "meta" but small enough
+            # for the "free" atom after "moov" leaves all else in place
+            track.set_metadata(metadata(2000))
+            self.assertEqual(track.get_metadata().comment, u"x" * 2000)
+            self.assertEqual(os.path.getsize(temp.name), file_size)
+            self.assertEqual([name for (name, size) in layout(temp.name)],
+                             [b"ftyp", b"moov", b"free", b"mdat"])
+            self.assertEqual(read_atoms(temp.name)[0][b"mdat"],
+                             atoms[b"mdat"])
+            check_chunks(temp.name, chunks)
+
+            # metadata too large for either rewrites the file
+            # with new padding and shifted chunk offsets
+            track.set_metadata(metadata(10000))
+            self.assertEqual(track.get_metadata().comment, u"x" * 10000)
+            new_layout = layout(temp.name)
+            self.assertEqual([name for (name, size) in new_layout],
+                             [b"ftyp", b"moov", b"free", b"mdat"])
+            self.assertEqual(new_layout[2][1], MOOV_PADDING)
+            self.assertEqual(read_atoms(temp.name)[0][b"mdat"][1],
+                             mdat_data)
+            check_chunks(temp.name, chunks)
+
+            # which then leaves room for smaller metadata in place
+            file_size = os.path.getsize(temp.name)
+            track.set_metadata(metadata(8000))
+            self.assertEqual(track.get_metadata().comment, u"x" * 8000)
+            self.assertEqual(os.path.getsize(temp.name), file_size)
+            check_chunks(temp.name, chunks)
+
+            # a file with "moov" at the end is never rewritten,
+            # nor are its chunk offsets changed
+            (atoms, moov) = read_atoms(temp.name)
+            stco = chunk_offsets(moov)
+            shift = len(atoms[b"moov"][1]) + len(atoms[b"free"][1])
+            stco.offsets = [offset - shift for offset in stco.offsets]
+            with open(temp.name, "wb") as f:
+                f.write(atoms[b"ftyp"][1])
+                f.write(atoms[b"mdat"][1])
+                f.write(build_atom(moov))
+            mdat_end = len(atoms[b"ftyp"][1]) + len(atoms[b"mdat"][1])
+            check_chunks(temp.name, chunks)
+            track = audiotools.open(temp.name)
+            for comment_size in [20000, 10]:
+                track.set_metadata(metadata(comment_size))
+                self.assertEqual(track.get_metadata().comment,
+                                 u"x" * comment_size)
+                self.assertEqual([name for (name, size)
+                                  in layout(temp.name)],
+                                 [b"ftyp", b"mdat", b"moov"])
+                self.assertEqual(
+                    chunk_offsets(read_atoms(temp.name)[1]).offsets,
+                    stco.offsets)
+                self.assertEqual(os.path.getsize(temp.name),
+                                 mdat_end + layout(temp.name)[2][1])
+                check_chunks(temp.name, chunks)
+
+            # 64-bit chunk offsets are also shifted
+            (atoms, moov) = read_atoms(temp.name)
+            stbl = moov[b"trak"][b"mdia"][b"minf"][b"stbl"]
+            stco = chunk_offsets(moov)
+            co64 = M4A_CO64_Atom(stco.version, stco.flags, stco.offsets)
+            stbl.leaf_atoms = [co64 if (atom is stco) else atom
+                               for atom in stbl]
+            moov_size = len(build_atom(moov))
+            co64.offsets = [offset + moov_size for offset in stco.offsets]
+            with open(temp.name, "wb") as f:
+                f.write(atoms[b"ftyp"][1])
+                f.write(build_atom(moov))
+                f.write(atoms[b"mdat"][1])
+            check_chunks(temp.name, chunks)
+            track = audiotools.open(temp.name)
+            track.set_metadata(metadata(30000))
+            self.assertEqual(track.get_metadata().comment, u"x" * 30000)
+            self.assertEqual([name for (name, size) in layout(temp.name)],
+                             [b"ftyp", b"moov", b"free", b"mdat"])
+            self.assertEqual(chunk_offsets(read_atoms(temp.name)[1]).name,
+                             b"co64")
+            check_chunks(temp.name, chunks)
+
     @METADATA_M4A
     def test_foreign_field(self):
         from audiotools.m4a_atoms import M4A_META_Atom
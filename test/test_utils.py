@@ -377,6 +377,57 @@ class cd2track(UtilTest):
             if os.path.isdir(output_directory):
                 rmtree(output_directory)
 
+    @UTIL_CD2TRACK
+    def test_joint(self):
+        from audiotools.text import (ERR_INVALID_JOINT,
+                                     LAB_CD2TRACK_PROGRESS)
+
+        self.assertEqual(
+            self.__run_app__(["cd2track", "-c", self.cue_file,
+                              "-j", "0"]), 1)
+        self.__check_error__(ERR_INVALID_JOINT)
+
+        for processes in [1, 2, 4]:
+            self.clean_output_dirs()
+            self.assertEqual(
+                self.__run_app__(["cd2track", "-V", "normal",
+                                  "-c", self.cue_file,
+                                  "-j", str(processes)] +
+                                 self.populate_options(["-t", "-q", "-d",
+                                                        "--format"])), 0)
+
+            # tracks are reported in order regardless of
+            # the order their encoders finish in
+            for i in range(3):
+                self.__check_info__(
+                    audiotools.output_progress(
+                        LAB_CD2TRACK_PROGRESS %
+                        {"track_number": i + 1,
+                         "filename":
+                         audiotools.Filename(
+                             os.path.join(self.output_dir,
+                                          self.format %
+                                          {"track_number": i + 1,
+                                           "suffix": self.type.SUFFIX}))},
+                        i + 1, 3))
+
+            # and no track data has been lost
+            output_tracks = [
+                audiotools.open(
+                    os.path.join(self.output_dir,
+                                 self.format %
+                                 {"track_number": i + 1,
+                                  "suffix": self.type.SUFFIX}))
+                for i in range(3)]
+            self.stream.reset()
+            self.assertTrue(
+                audiotools.pcm_cmp(
+                    audiotools.PCMCat([t.to_pcm() for t in output_tracks]),
+                    self.stream))
+
+            for (i, track) in enumerate(output_tracks):
+                self.assertEqual(track.get_metadata().track_number, i + 1)
+
     def populate_bad_options(self, options):
         populated = ["--no-musicbrainz", "--no-freedb"]
 
@@ -5520,3 +5571,53 @@ class trackverify(UtilTest):
         else:
             self.__check_info__(
                 u"Python Audio Tools %s" % (audiotools.VERSION))
+
+    @UTIL_TRACKVERIFY
+    def test_incremental(self):
+        from audiotools.text import LAB_TRACKVERIFY_SKIPPED
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            ledger = os.path.join(temp_dir, "ledger.db")
+            track_dir = os.path.join(temp_dir, "tracks")
+            os.mkdir(track_dir)
+            tracks = [audiotools.FlacAudio.from_pcm(
+                os.path.join(track_dir, "%2.2d.flac" % (i)),
+                BLANK_PCM_Reader(1)) for i in range(1, 4)]
+
+            def run(*options):
+                # returns the exit status and number of skipped tracks
+                returnval = self.__run_app__(["trackverify", "-j", "1",
+                                              "--ledger", ledger] +
+                                             list(options) + [track_dir])
+                lines = self.stdout.getvalue().splitlines()
+                for skipped in range(1, len(tracks) + 1):
+                    if (LAB_TRACKVERIFY_SKIPPED % (skipped)) in lines:
+                        return (returnval, skipped)
+                else:
+                    return (returnval, 0)
+
+            # a full run records each track
+            self.assertEqual(run(), (0, 0))
+
+            # so an incremental run skips all of them
+            self.assertEqual(run("-I"), (0, 3))
+
+            # except for those changed since
+            tracks[1].set_metadata(audiotools.MetaData(track_name=u"Name"))
+            os.utime(tracks[1].filename, (0, 0))
+            self.assertEqual(run("-I"), (0, 2))
+            self.assertEqual(run("-I"), (0, 3))
+
+            # and those verified too long ago
+            self.assertEqual(run("--max-age", "0"), (0, 0))
+            self.assertEqual(run("--max-age", "1"), (0, 3))
+
+            # failed tracks aren't recorded
+            with open(tracks[2].filename, "r+b") as f:
+                f.seek(-10, 2)
+                f.write(b"\xFF" * 10)
+            self.assertEqual(run("-I"), (1, 2))
+            self.assertEqual(run("-I"), (1, 2))
+        finally:
+            shutil.rmtree(temp_dir)